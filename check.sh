@@ -3,3 +3,4 @@ ruff check --fix .
 ruff format .
 mypy --strict .
 pytest -vv .
+python -m monodeal.workers
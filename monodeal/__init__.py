@@ -1,21 +1,44 @@
+import random
+from collections.abc import Sequence
 from dataclasses import dataclass
 from enum import Flag, auto
-from typing import Mapping, MutableSequence, Protocol, Sequence
+from typing import TYPE_CHECKING, Protocol
 
 from .deck import (
     Card,
+    Hand,
     HotelCard,
     HouseCard,
     PropertyCard,
     PropertyColour,
     WildPropertyCard,
 )
-from .propertyset import PropertySet
+
+if TYPE_CHECKING:
+    # only annotate the protocols, so importing the package does not load them
+    from .payment import PaymentSchedule
+    from .propertyset import PropertySet, PropertySets
+    from .unseen import UnseenCards
 
 
 class Variations(Flag):
+    # rules the official instructions leave open, see the README's Edge Cases
     FORCE_UNPLACED_PROPERTY_AS_CASH = auto()
     ALLOW_QUAD_RENT = auto()
+    # house/hotel can move between complete sets before any action, for free
+    MOVABLE_BUILDINGS = auto()
+    # with MOVABLE_BUILDINGS, each move uses one of the player's three actions
+    BUILDING_MOVE_COSTS_ACTION = auto()
+    # a house/hotel left on a set made incomplete by a payment is discarded
+    FORFEIT_BUILDINGS = auto()
+    # as FORFEIT_BUILDINGS, but the forfeited cards go to the owner's bank
+    FORFEIT_BUILDINGS_TO_BANK = auto()
+    # no reshuffle: when the draw pile runs out the game ends, and the player with
+    # the most complete sets (then rent, then assets) wins
+    DECK_OUT_ENDS_GAME = auto()
+    # a set taken by DealBreaker is kept as a second set of its colour, rather
+    # than merged into the set already held
+    SEPARATE_PROPERTY_SETS = auto()
 
 
 class PlayerProto(Protocol):
@@ -24,8 +47,8 @@ class PlayerProto(Protocol):
     def deal_card(self, card: Card) -> None: ...
     def get_action(self, game: "GameProto", actions_left: int) -> "Action": ...
     def has_won(self) -> bool: ...
-    def get_hand(self) -> MutableSequence[Card]: ...
-    def get_property_sets(self) -> Mapping[PropertyColour, PropertySet]: ...
+    def get_hand(self) -> Hand: ...
+    def get_property_sets(self) -> "PropertySets": ...
     def get_money(self) -> int: ...
     def get_property_as_cash(self) -> int: ...
     def add_property(
@@ -36,6 +59,8 @@ class PlayerProto(Protocol):
     def add_money(self, card: Card) -> None: ...
     def add_unallocated_building(self, card: HouseCard | HotelCard) -> None: ...
     def choose_how_to_pay(self, amount: int) -> Sequence[Card]: ...
+    def payment_schedule(self) -> "PaymentSchedule": ...
+    def wildcard_moves(self) -> list[tuple[WildPropertyCard, PropertyColour]]: ...
     def pick_colour_for_recieved_wildcard(
         self, card: WildPropertyCard
     ) -> PropertyColour: ...
@@ -43,22 +68,41 @@ class PlayerProto(Protocol):
         self, card: HouseCard | HotelCard
     ) -> PropertyColour | None: ...
     def remove(self, card: Card) -> None: ...
-    def add_property_set(self, propertyset: PropertySet) -> None: ...
-    def remove_property_set(self, propertyset: PropertySet) -> None: ...
+    def set_of(self, card: Card) -> "PropertySet | None": ...
+    def add_property_set(
+        self, propertyset: "PropertySet", merge: bool = True
+    ) -> None: ...
+    def keep_property_set(self, propertyset: "PropertySet") -> None: ...
+    def remove_property_set(self, propertyset: "PropertySet") -> None: ...
     def should_stop_action(self, action: "Action") -> bool: ...
+    def should_counter_stop(self, action: "Action") -> bool: ...
 
 
 class GameProto(Protocol):
     variations: Variations
+    # random stream for player decisions, separate from the shuffles
+    decisions: random.Random
 
     def play(self) -> PlayerProto: ...
     def get_opposition(self, player: PlayerProto) -> Sequence[PlayerProto]: ...
     def player_owes_money(
         self, from_player: PlayerProto, to_player: PlayerProto, amount: int
     ) -> None: ...
+    def settle_debts(
+        self, to_player: PlayerProto, debts: Sequence[tuple[PlayerProto, int]]
+    ) -> None: ...
     def discard(self, card: Card) -> None: ...
     def deal_to(self, p: PlayerProto) -> None: ...
     def check_stop_action(self, p: PlayerProto, a: "Action") -> bool: ...
+    def is_opponent(self, player: PlayerProto, target: PlayerProto) -> bool: ...
+    def unseen_cards(self, player: PlayerProto) -> "UnseenCards": ...
+    def rank_targets(
+        self, player: PlayerProto, amount: int
+    ) -> list[tuple[PlayerProto, int]]: ...
+
+
+class IllegalAction(ValueError):
+    pass
 
 
 @dataclass
@@ -70,3 +114,13 @@ class Action:
 
     def action_count(self) -> int:
         return 1
+
+    def debts(self, g: GameProto) -> Sequence[tuple[PlayerProto, int]]:
+        # (payer, amount) pairs this action will collect when applied
+        return []
+
+    def validate(self, g: GameProto) -> None:
+        # raise IllegalAction if this action can not be applied to the game as it
+        # stands, before anything is changed. Turn order and the action budget
+        # are checked by the game.
+        pass
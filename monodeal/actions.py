@@ -1,13 +1,17 @@
+import copy
+from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import Sequence, TypeVar
+from typing import Any, TypeVar
 
 from . import (
     Action,
     GameProto,
+    IllegalAction,
     PlayerProto,
     Variations,
 )
 from .deck import (
+    ALLOWED_BUILDINGS,
     BirthdayCard,
     Card,
     DealBreakerCard,
@@ -26,7 +30,29 @@ from .deck import (
     SlyDealCard,
     WildPropertyCard,
 )
-from .propertyset import PropertySet
+from .propertyset import PropertySet, PropertySets
+
+
+def require(ok: bool, reason: str) -> None:
+    if not ok:
+        raise IllegalAction(reason)
+
+
+def require_opponent(g: GameProto, player: PlayerProto, target: PlayerProto) -> None:
+    require(g.is_opponent(player, target), f"{target} is not an opponent")
+
+
+def single_colour(colour: PropertyColour) -> bool:
+    return len(colour) == 1
+
+
+def strands_buildings(ps: PropertySet, card: Card) -> bool:
+    # taking the card would leave a house or hotel on an incomplete set
+    if ps.house is None or not ps.is_complete():
+        return False
+    rest = copy.copy(ps)
+    rest.remove(card)
+    return not rest.is_complete()
 
 
 @dataclass
@@ -50,6 +76,9 @@ class DiscardAction(Action):
         self.player.get_hand().remove(self.card)
         g.discard(self.card)
 
+    def validate(self, g: GameProto) -> None:
+        require(self.card in self.player.get_hand(), f"{self.card} not in hand")
+
 
 @dataclass
 class PlayPropertyAction(Action):
@@ -64,6 +93,101 @@ class PlayPropertyAction(Action):
     def action_count(self) -> int:
         return 1
 
+    def validate(self, g: GameProto) -> None:
+        card, colour = self.card, self.colour
+        require(card in self.player.get_hand(), f"{card} not in hand")
+        require(single_colour(colour), f"{colour} is not a single colour")
+        if isinstance(card, PropertyCard):
+            require(card.colour == colour, f"{card} can not be played as {colour}")
+        elif isinstance(card, WildPropertyCard):
+            require(colour in card.colours, f"{card} can not be played as {colour}")
+        elif isinstance(card, (HouseCard, HotelCard)):
+            ps = self.player.get_property_sets().target(colour, card)
+            buildable = ps is not None and (
+                ps.can_build_house()
+                if isinstance(card, HouseCard)
+                else ps.can_build_hotel()
+            )
+            require(buildable, f"no {colour} set to build {card} on")
+        else:
+            raise IllegalAction(f"{card} is not property")
+
+
+@dataclass
+class MovePropertyAction(Action):
+    # re-colour a wildcard already in our property, does not use up an action
+    card: WildPropertyCard
+    colour: PropertyColour
+
+    def apply(self, g: GameProto) -> None:
+        self.player.remove(self.card)
+        self.player.add_property(self.colour, self.card)
+
+    def action_count(self) -> int:
+        return 0
+
+    def validate(self, g: GameProto) -> None:
+        ps = self.player.set_of(self.card)
+        if ps is None:
+            raise IllegalAction(f"{self.card} is not in our property")
+        if not isinstance(self.card, WildPropertyCard):
+            raise IllegalAction(f"{self.card} is not a wildcard")
+        require(
+            not strands_buildings(ps, self.card),
+            f"moving {self.card} leaves buildings on an incomplete set",
+        )
+        require(
+            single_colour(self.colour) and self.colour in self.card.colours,
+            f"{self.card} can not be played as {self.colour}",
+        )
+        require(self.colour != ps.colour, f"{self.card} is already {self.colour}")
+        # only moves towards the best layout, as offered, so moves can not cycle
+        require(
+            (self.card, self.colour) in self.player.wildcard_moves(),
+            f"moving {self.card} to {self.colour} does not improve our sets",
+        )
+
+
+@dataclass
+class MoveBuildingAction(Action):
+    # VARIATION: move the house and any hotel from one complete set to another.
+    # Free, or one action with BUILDING_MOVE_COSTS_ACTION
+    source: PropertySet
+    colour: PropertyColour
+    cost: int = 0
+
+    def apply(self, g: GameProto) -> None:
+        # the house goes first, as a hotel can only be added on top of one
+        for building in (self.source.house, self.source.hotel):
+            if building is not None:
+                self.player.remove(building)
+                self.player.add_property(self.colour, building)
+
+    def action_count(self) -> int:
+        return self.cost
+
+    def validate(self, g: GameProto) -> None:
+        require(Variations.MOVABLE_BUILDINGS in g.variations, "buildings can not move")
+        costs = Variations.BUILDING_MOVE_COSTS_ACTION in g.variations
+        require(self.cost == (1 if costs else 0), f"a move costs {int(costs)}")
+        sets = self.player.get_property_sets()
+        source = self.source
+        if not sets.holds(source) or source.house is None:
+            raise IllegalAction(f"no buildings on {source}")
+        dest = sets.target(self.colour, source.house)
+        require(
+            dest is not None and dest is not source and dest.can_build_house(),
+            f"no {self.colour} set to move buildings to",
+        )
+        # only onto a set with a higher rent, as offered, so moves can not cycle
+        require(
+            any(
+                ps is source and colour == self.colour
+                for ps, colour in building_moves(sets)
+            ),
+            f"moving buildings to {self.colour} does not raise the rent",
+        )
+
 
 @dataclass
 class RentAction(DiscardAction):
@@ -79,16 +203,29 @@ class RentAction(DiscardAction):
             + (0 if self.quad_rent is None else 1)
         )
 
-    def apply(self, g: GameProto) -> None:
+    def rent(self) -> int:
+        # charged to each target
         rent = self.propertyset.rent_value()
         rent *= 1 if self.double_rent is None else 2
         rent *= 1 if self.quad_rent is None else 2
+        return rent
+
+    def debts(self, g: GameProto) -> Sequence[tuple[PlayerProto, int]]:
+        rent = self.rent()
         rent_target = (
             [self.target] if self.target is not None else g.get_opposition(self.player)
         )
+        return [(p, rent) for p in rent_target]
 
-        for p in rent_target:
-            g.player_owes_money(p, self.player, rent)
+    def apply(self, g: GameProto) -> None:
+        g.settle_debts(
+            self.player,
+            [
+                (p, rent)
+                for p, rent in self.debts(g)
+                if not g.check_stop_action(p, self)
+            ],
+        )
 
         # discard multiple cards
         for card in [self.card, self.double_rent, self.quad_rent]:
@@ -97,6 +234,40 @@ class RentAction(DiscardAction):
             self.player.get_hand().remove(card)
             g.discard(card)
 
+    def validate(self, g: GameProto) -> None:
+        hand = self.player.get_hand()
+        card = self.card
+        require(card in hand, f"{card} not in hand")
+        if not isinstance(card, (RentCard, RainbowRentCard)):
+            raise IllegalAction(f"{card} is not rent")
+        require(
+            self.player.get_property_sets().holds(self.propertyset),
+            f"{self.propertyset} is not ours",
+        )
+        require(
+            self.propertyset.colour in card.colours,
+            f"{card} can not charge {self.propertyset.colour}",
+        )
+        for d in (self.double_rent, self.quad_rent):
+            if d is None:
+                continue
+            # so never the rent card itself
+            if not isinstance(d, DoubleTheRentCard):
+                raise IllegalAction(f"{d} is not DoubleTheRent")
+            require(d in hand, f"{d} not in hand")
+        if self.quad_rent is not None:
+            require(Variations.ALLOW_QUAD_RENT in g.variations, "quad rent not allowed")
+            require(
+                self.double_rent is not None and self.double_rent is not self.quad_rent,
+                "quad rent needs two DoubleTheRent cards",
+            )
+        if isinstance(card, RentCard):
+            require(self.target is None, f"{card} charges every opponent")
+        elif self.target is None:
+            raise IllegalAction(f"{card} needs a target")
+        else:
+            require_opponent(g, self.player, self.target)
+
 
 class DepositAction(DiscardAction):
     def apply(self, g: GameProto) -> None:
@@ -104,13 +275,29 @@ class DepositAction(DiscardAction):
         self.player.get_hand().remove(self.card)
         self.player.add_money(self.card)
 
+    def validate(self, g: GameProto) -> None:
+        super().validate(g)
+        require(
+            not isinstance(self.card, (PropertyCard, WildPropertyCard)),
+            f"{self.card} can not be banked",
+        )
+
 
 class BirthdayAction(DiscardAction):
     # all other players must send us 2M
+    def validate(self, g: GameProto) -> None:
+        super().validate(g)
+        require(isinstance(self.card, BirthdayCard), f"{self.card} is not Birthday")
+
+    def debts(self, g: GameProto) -> Sequence[tuple[PlayerProto, int]]:
+        return [(p, 2) for p in g.get_opposition(self.player)]
+
     def apply(self, g: GameProto) -> None:
         super().apply(g)
-        for p in g.get_opposition(self.player):
-            g.player_owes_money(p, self.player, 2)
+        g.settle_debts(
+            self.player,
+            [(p, n) for p, n in self.debts(g) if not g.check_stop_action(p, self)],
+        )
 
 
 @dataclass
@@ -118,9 +305,23 @@ class DebtCollectorAction(DiscardAction):
     # nominated player must send us 5M
     target: PlayerProto
 
+    def debts(self, g: GameProto) -> Sequence[tuple[PlayerProto, int]]:
+        return [(self.target, 5)]
+
+    def validate(self, g: GameProto) -> None:
+        super().validate(g)
+        require(
+            isinstance(self.card, DebtCollectorCard),
+            f"{self.card} is not DebtCollector",
+        )
+        require_opponent(g, self.player, self.target)
+
     def apply(self, g: GameProto) -> None:
         super().apply(g)
-        g.player_owes_money(self.target, self.player, 5)
+        g.settle_debts(
+            self.player,
+            [(p, n) for p, n in self.debts(g) if not g.check_stop_action(p, self)],
+        )
 
 
 @dataclass
@@ -130,6 +331,10 @@ class PassGoAction(DiscardAction):
         g.deal_to(self.player)
         g.deal_to(self.player)
 
+    def validate(self, g: GameProto) -> None:
+        super().validate(g)
+        require(isinstance(self.card, PassGoCard), f"{self.card} is not PassGo")
+
 
 @dataclass
 class DealBreakerAction(DiscardAction):
@@ -142,12 +347,60 @@ class DealBreakerAction(DiscardAction):
             return
         # move cards one by one?
         self.target.remove_property_set(self.propertyset)
-        self.player.add_property_set(self.propertyset)
+        self.player.add_property_set(
+            self.propertyset,
+            merge=Variations.SEPARATE_PROPERTY_SETS not in g.variations,
+        )
+
+    def validate(self, g: GameProto) -> None:
+        super().validate(g)
+        require(
+            isinstance(self.card, DealBreakerCard), f"{self.card} is not DealBreaker"
+        )
+        require_opponent(g, self.player, self.target)
+        require(
+            self.propertyset in self.target.get_property_sets().complete,
+            f"{self.propertyset} is not a complete set of {self.target}",
+        )
 
 
 X = TypeVar("X")
 
 
+# (action type, card kind, colour, target seat offset, double-the-rent cards):
+# what an action does, the same for interchangeable cards and seen from the
+# acting player's seat
+ActionKey = tuple[str, str, PropertyColour | None, int, int]
+
+
+def seated_action_key(players: Sequence[PlayerProto], action: Action) -> ActionKey:
+    seat = {id(p): i for i, p in enumerate(players)}
+
+    def offset(target: Any) -> int:
+        if target is None:
+            return 0
+        return (seat[id(target)] - seat[id(action.player)]) % len(players)
+
+    if isinstance(action, (PlayPropertyAction, MovePropertyAction)):
+        return (type(action).__name__, action.card.kind, action.colour, 0, 0)
+    if isinstance(action, RentAction):
+        doubles = (action.double_rent is not None) + (action.quad_rent is not None)
+        colour = action.propertyset.colour
+        return ("RentAction", action.card.kind, colour, offset(action.target), doubles)
+    if isinstance(action, DealBreakerAction):
+        colour = action.propertyset.colour
+        return ("DealBreakerAction", action.card.kind, colour, offset(action.target), 0)
+    if isinstance(action, DebtCollectorAction):
+        return ("DebtCollectorAction", action.card.kind, None, offset(action.target), 0)
+    if isinstance(action, (DepositAction, BirthdayAction, PassGoAction)):
+        return (type(action).__name__, action.card.kind, None, 0, 0)
+    if isinstance(action, MoveBuildingAction):
+        return ("MoveBuildingAction", "", action.colour, 0, 0)
+    if isinstance(action, SkipAction):
+        return ("SkipAction", "", None, 0, 0)
+    raise ValueError(action)
+
+
 def maybe_index(items: Sequence[X], idx: int, default: X | None = None) -> X | None:
     try:
         return items[idx]
@@ -155,23 +408,74 @@ def maybe_index(items: Sequence[X], idx: int, default: X | None = None) -> X | N
         return default
 
 
+def building_moves(
+    propertysets: PropertySets,
+) -> list[tuple[PropertySet, PropertyColour]]:
+    # moves of buildings onto a complete set with a higher base rent, so each move
+    # raises the best rent we can charge and moves can never cycle. Only onto the
+    # set of a colour that buildings moved there would join.
+    sets = [
+        ps
+        for ps in propertysets.all()
+        if ps.colour in ALLOWED_BUILDINGS and ps.is_complete()
+    ]
+    return [
+        (ps, other.colour)
+        for ps in sets
+        if ps.house is not None
+        for other in sets
+        if other.house is None
+        and other.rents[-1] > ps.rents[-1]
+        and other is propertysets.target(other.colour, ps.house)
+    ]
+
+
 def generate_actions(
     game: GameProto, player: PlayerProto, actions_left: int
 ) -> list[Action]:
     actions: list[Action] = []
     # opposition = game.get_opposition(player)
 
+    # offer free wildcard moves first, so they happen before charging any rent.
+    # Only moves towards a strictly better layout are offered, and none that
+    # would leave buildings stranded on the way there.
+    for wild, colour in player.wildcard_moves():
+        ps = player.set_of(wild)
+        if ps is None or not strands_buildings(ps, wild):
+            actions.append(MovePropertyAction(player=player, card=wild, colour=colour))
+
+    if Variations.MOVABLE_BUILDINGS in game.variations:
+        cost = 1 if Variations.BUILDING_MOVE_COSTS_ACTION in game.variations else 0
+        for source, colour in building_moves(player.get_property_sets()):
+            actions.append(
+                MoveBuildingAction(
+                    player=player, source=source, colour=colour, cost=cost
+                )
+            )
+
     # check whole hand for actions that act on multiple cards
     double_rent_cards = [
         card for card in player.get_hand() if isinstance(card, DoubleTheRentCard)
     ]
-    double_rent = maybe_index(double_rent_cards, 0)
+    # each DoubleTheRent card played with a rent card uses another action
+    double_rent = maybe_index(double_rent_cards, 0) if actions_left >= 2 else None
     quad_rent = (
         maybe_index(double_rent_cards, 1)
-        if Variations.ALLOW_QUAD_RENT in game.variations
+        if Variations.ALLOW_QUAD_RENT in game.variations and actions_left >= 3
         else None
     )
 
+    propertysets = player.get_property_sets()
+
+    def rent_sets(colours: PropertyColour) -> list[PropertySet]:
+        # every set a rent card can charge on, including repeated colours
+        return [
+            ps
+            for col in colours
+            for ps in propertysets.sets(col)
+            if ps.rent_value() > 0
+        ]
+
     for c in player.get_hand():
         if isinstance(c, PropertyCard):
             actions.append(PlayPropertyAction(player=player, colour=c.colour, card=c))
@@ -200,10 +504,7 @@ def generate_actions(
             elif isinstance(c, JustSayNoCard):
                 pass
             elif isinstance(c, RentCard):
-                for col in c.colours:
-                    ps = player.get_property_sets().get(col)
-                    if ps is None or ps.rent_value() == 0:
-                        continue
+                for ps in rent_sets(c.colours):
                     actions.append(
                         RentAction(
                             player=player,
@@ -216,10 +517,7 @@ def generate_actions(
                     )
 
             elif isinstance(c, RainbowRentCard):
-                for col in c.colours:
-                    ps = player.get_property_sets().get(col)
-                    if ps is None or ps.rent_value() == 0:
-                        continue
+                for ps in rent_sets(c.colours):
                     for t in game.get_opposition(player):
                         actions.append(
                             RentAction(
@@ -241,16 +539,15 @@ def generate_actions(
                 actions.append(PassGoAction(player=player, card=c))
             elif isinstance(c, DealBreakerCard):
                 for t in game.get_opposition(player):
-                    for ps in t.get_property_sets().values():
-                        if ps.is_complete():
-                            actions.append(
-                                DealBreakerAction(
-                                    player=player, card=c, target=t, propertyset=ps
-                                )
+                    for ps in t.get_property_sets().complete:
+                        actions.append(
+                            DealBreakerAction(
+                                player=player, card=c, target=t, propertyset=ps
                             )
+                        )
 
             elif isinstance(c, HouseCard):
-                for ps in player.get_property_sets().values():
+                for ps in propertysets.complete:
                     if ps.can_build_house():
                         actions.append(
                             PlayPropertyAction(
@@ -258,7 +555,7 @@ def generate_actions(
                             )
                         )
             elif isinstance(c, HotelCard):
-                for ps in player.get_property_sets().values():
+                for ps in propertysets.complete:
                     if ps.can_build_hotel():
                         actions.append(
                             PlayPropertyAction(
@@ -0,0 +1,99 @@
+import asyncio
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+from . import Action
+from .actions import SkipAction, generate_actions
+from .game import Game, Player
+from .host import AsyncPlayer, run_tables
+
+
+@dataclass
+class Decision:
+    game: Game
+    player: Player
+    actions_left: int
+    actions: list[Action]
+
+
+# scores a batch of pending decisions in one call, returning an action index each
+Evaluator = Callable[[Sequence[Decision]], Sequence[int]]
+
+
+class BatchScheduler:
+    # Gathers the decisions of many suspended games and hands them to the
+    # evaluator together. A batch is flushed once max_batch decisions are pending,
+    # or max_wait seconds after the first one arrived, whichever is sooner.
+    def __init__(
+        self, evaluator: Evaluator, max_batch: int = 64, max_wait: float = 0.001
+    ) -> None:
+        assert max_batch > 0
+        self.evaluator = evaluator
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.pending: list[tuple[Decision, asyncio.Future[int]]] = []
+        self.timer: asyncio.TimerHandle | None = None
+        self.batches = 0
+        self.decisions = 0
+
+    async def evaluate(self, decision: Decision) -> int:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[int] = loop.create_future()
+        self.pending.append((decision, future))
+        if len(self.pending) >= self.max_batch:
+            self.flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.max_wait, self.flush)
+        return await future
+
+    def flush(self) -> None:
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        # a player that timed out has cancelled its future, so is not scored
+        batch = [(d, f) for d, f in self.pending if not f.done()]
+        self.pending = []
+        if not batch:
+            return
+        self.batches += 1
+        self.decisions += len(batch)
+        try:
+            results = self.evaluator([d for d, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(
+                    f"evaluator scored {len(results)} of {len(batch)} decisions"
+                )
+        # any failure of the model goes to every game waiting on it
+        except Exception as e:  # noqa: BLE001
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), choice in zip(batch, results):
+            if not future.done():
+                future.set_result(choice)
+
+
+class BatchedPlayer(AsyncPlayer):
+    # Player whose turn decisions are scored by a shared BatchScheduler
+    def __init__(
+        self, name: str, scheduler: BatchScheduler, timeout: float | None = None
+    ) -> None:
+        super().__init__(name, timeout)
+        self.scheduler = scheduler
+
+    async def decide_action(self, game: Game, actions_left: int) -> Action:
+        actions = generate_actions(game, self, actions_left)
+        actions.append(SkipAction(self))
+        choice = await self.scheduler.evaluate(
+            Decision(game, self, actions_left, actions)
+        )
+        if not 0 <= choice < len(actions):
+            print(f"{self} evaluator chose invalid action {choice}")
+            return self.get_action(game, actions_left)
+        return actions[choice]
+
+
+def run_batched(games: Sequence[Game]) -> list[Player]:
+    # play every game to completion on one event loop, batching as they go
+    return asyncio.run(run_tables(games))
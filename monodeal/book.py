@@ -0,0 +1,322 @@
+import copy
+import mmap
+import random
+import struct
+import zlib
+from collections.abc import Hashable, Iterable, Mapping, Sequence
+
+from . import Action, GameProto, Variations
+from .actions import (
+    ActionKey,
+    SkipAction,
+    generate_actions,
+    seated_action_key,
+)
+from .compare import deck_order
+from .deck import CARD_KINDS, DECK, KIND_INDEX, Card, PropertyColour
+from .endgame import position_key
+from .game import Game, Player, quiet
+
+# An opening book: the best first turn for each opening hand, found offline by
+# simulation and looked up in play from a memory-mapped file.
+#
+# An opening is a turn with all three actions to play, seven cards in hand and
+# nothing on any table, which is the first seat's first turn. It is keyed by the
+# hand's card kinds, sorted. The file is an open addressing hash table:
+#
+#   header   magic, players, variations, slot count
+#   slot     7 kind indices (0xFF when empty), then 3 actions of 5 bytes each:
+#            type, kind, colour, target seat offset, doubles (0xFF when unused)
+#
+# Lookups read a handful of bytes from the mapping, so worker processes share
+# the pages through the OS cache rather than each loading the table.
+
+MAGIC = b"MDOB"
+HEADER = struct.Struct("<4sBxxxII")
+HAND = 7
+PLAN = 3
+ACTION_BYTES = 5
+SLOT = HAND + PLAN * ACTION_BYTES
+EMPTY = 0xFF
+
+ACTION_TYPES = [
+    "SkipAction",
+    "PlayPropertyAction",
+    "MovePropertyAction",
+    "MoveBuildingAction",
+    "DepositAction",
+    "RentAction",
+    "BirthdayAction",
+    "PassGoAction",
+    "DebtCollectorAction",
+    "DealBreakerAction",
+]
+COLOURS: list[PropertyColour] = list(PropertyColour.ALL)
+
+Plan = tuple[ActionKey, ...]
+
+
+def hand_key(cards: Iterable[Card]) -> bytes:
+    return bytes(sorted(KIND_INDEX[c.kind] for c in cards))
+
+
+def is_opening(game: Game, actions_left: int) -> bool:
+    return (
+        actions_left == 3
+        and len(game.current_player().hand) == HAND
+        and not any(
+            p.cash or p.cards_to_ps or p.unallocated_buildings for p in game.players
+        )
+    )
+
+
+def _pack_action(key: ActionKey) -> bytes:
+    kind, colour = key[1], key[2]
+    return bytes(
+        [
+            ACTION_TYPES.index(key[0]),
+            KIND_INDEX[kind] if kind else EMPTY,
+            COLOURS.index(colour) if colour is not None else EMPTY,
+            key[3],
+            key[4],
+        ]
+    )
+
+
+def _unpack_action(b: bytes) -> ActionKey:
+    kind = CARD_KINDS[b[1]] if b[1] != EMPTY else ""
+    colour = COLOURS[b[2]] if b[2] != EMPTY else None
+    return (ACTION_TYPES[b[0]], kind, colour, b[3], b[4])
+
+
+def _slot(key: bytes, slots: int) -> int:
+    # crc32 rather than hash(), which is salted per process
+    return zlib.crc32(key) & (slots - 1)
+
+
+def write_book(
+    path: str, players: int, variations: Variations, plans: Mapping[bytes, Plan]
+) -> None:
+    slots = 1
+    while slots < 2 * len(plans):
+        slots *= 2
+    table = bytearray([EMPTY]) * (slots * SLOT)
+    for key, plan in plans.items():
+        assert len(key) == HAND and 0 < len(plan) <= PLAN
+        i = _slot(key, slots)
+        while table[i * SLOT] != EMPTY:
+            i = (i + 1) % slots
+        record = key + b"".join(map(_pack_action, plan))
+        table[i * SLOT : i * SLOT + len(record)] = record
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, players, variations.value, slots))
+        f.write(table)
+
+
+class OpeningBook:
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.players, variations, self.slots = HEADER.unpack_from(self.data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an opening book")
+        self.variations = Variations(variations)
+
+    def applies_to(self, game: Game) -> bool:
+        return self.players == len(game.players) and self.variations == game.variations
+
+    def __len__(self) -> int:
+        return sum(
+            self.data[HEADER.size + i * SLOT] != EMPTY for i in range(self.slots)
+        )
+
+    def lookup(self, key: bytes) -> Plan | None:
+        i = _slot(key, self.slots)
+        while True:
+            at = HEADER.size + i * SLOT
+            found = self.data[at : at + HAND]
+            if found[0] == EMPTY:
+                return None
+            if found == key:
+                actions = self.data[at + HAND : at + SLOT]
+                return tuple(
+                    _unpack_action(actions[j : j + ACTION_BYTES])
+                    for j in range(0, len(actions), ACTION_BYTES)
+                    if actions[j] != EMPTY
+                )
+            i = (i + 1) % self.slots
+
+
+# books opened by this process, by path
+_open_books: dict[str, OpeningBook] = {}
+
+
+def open_book(path: str) -> OpeningBook:
+    book = _open_books.get(path)
+    if book is None:
+        book = _open_books[path] = OpeningBook(path)
+    return book
+
+
+class OpeningBookMixin(Player):
+    # Plays the book's first turn when it has the hand, e.g.
+    #
+    #   class BookPlayer(OpeningBookMixin, EndgamePlayer):
+    #       book_path = "opening.book"
+    #
+    # The book is opened once per process on first use. Planned actions that
+    # are no longer legal, e.g. after a Pass Go, hand back to the next class.
+    book_path: str | None = None
+    # (turn, actions still to play) once an opening was looked up
+    _plan: tuple[int, list[ActionKey]] | None = None
+
+    def get_action(self, game: GameProto, actions_left: int) -> Action:
+        action = self._book_action(game, actions_left)
+        if action is not None:
+            return action
+        return super().get_action(game, actions_left)
+
+    def _book_action(self, game: GameProto, actions_left: int) -> Action | None:
+        if self.book_path is None or not isinstance(game, Game):
+            return None
+        if is_opening(game, actions_left):
+            book = open_book(self.book_path)
+            found = book.lookup(hand_key(self.hand)) if book.applies_to(game) else None
+            self._plan = (game.turns, list(found or ()))
+        if self._plan is None or self._plan[0] != game.turns or not self._plan[1]:
+            return None
+        plan = self._plan[1]
+        key = plan.pop(0)
+        for a in [*generate_actions(game, self, actions_left), SkipAction(self)]:
+            if seated_action_key(game.players, a) == key:
+                return a
+        plan.clear()
+        return None
+
+
+def opening(
+    hand: Sequence[Card], players: int, variations: Variations, seed: int
+) -> Game:
+    # the hand on the first turn of a game with the rest of the deck shuffled
+    held = set(map(id, hand))
+    rest = [c for c in DECK if id(c) not in held]
+    random.Random(seed).shuffle(rest)
+    seats = [Player(f"P{i}") for i in range(players)]
+    g = Game(seats, variations=variations, seed=seed)
+    seats[0].hand = hand
+    for p in seats[1:]:
+        for _ in range(5):
+            p.hand.append(rest.pop())
+    g.draw.extend(rest)
+    g.actions_left = 3
+    g.recount_unseen()
+    return g
+
+
+def _legal(g: Game) -> list[Action]:
+    p = g.current_player()
+    return [*generate_actions(g, p, g.actions_left), SkipAction(p)]
+
+
+def candidate_plans(g: Game) -> list[Plan]:
+    # every distinct first turn, as action keys, played until the turn passes.
+    # Orders of the same actions that leave the same position are kept once
+    plans: list[Plan] = []
+    seen: set[Hashable] = set()
+
+    def walk(g: Game, plan: Plan) -> None:
+        tried: set[ActionKey] = set()
+        for i, a in enumerate(_legal(g)):
+            key = seated_action_key(g.players, a)
+            if key in tried:
+                continue
+            tried.add(key)
+            child = copy.deepcopy(g)
+            action = _legal(child)[i]
+            winner = child.step(action)
+            if winner is not None or child.current != 0 or len(plan) + 1 == PLAN:
+                at = position_key(child)
+                if at not in seen:
+                    seen.add(at)
+                    plans.append((*plan, key))
+            else:
+                walk(child, (*plan, key))
+
+    with quiet():
+        walk(g, ())
+    return plans
+
+
+def rollout(g: Game, plan: Plan, max_steps: int = 2000) -> float:
+    # 1 if the first seat wins after playing the plan and then the heuristic on
+    # both sides, 0 if it loses, 0.5 if the game runs on too long
+    with quiet():
+        for key in plan:
+            action = next(
+                a for a in _legal(g) if seated_action_key(g.players, a) == key
+            )
+            winner = g.step(action)
+            if winner is not None:
+                return float(winner is g.players[0])
+        for _ in range(max_steps):
+            p = g.current_player()
+            winner = g.step(p.get_action(g, g.actions_left))
+            if winner is not None:
+                return float(winner is g.players[0])
+    return 0.5
+
+
+def best_plan(
+    hand: Sequence[Card], players: int, variations: Variations, rollouts: int
+) -> Plan:
+    # the candidate with the highest mean result, each played on the same
+    # rollout deals
+    plans = candidate_plans(opening(hand, players, variations, 0))
+    scores = [
+        sum(
+            rollout(opening(hand, players, variations, r), plan)
+            for r in range(rollouts)
+        )
+        for plan in plans
+    ]
+    return plans[scores.index(max(scores))]
+
+
+def build_book(
+    path: str,
+    seeds: Iterable[int],
+    players: int = 2,
+    rollouts: int = 32,
+    variations: Variations = Variations.FORCE_UNPLACED_PROPERTY_AS_CASH,
+) -> int:
+    # Books the opening hands of the first seat in the deals deck_order(seed), as
+    # compare, sweep and league play them. Returns the number of hands booked.
+    plans: dict[bytes, Plan] = {}
+    for seed in seeds:
+        deck = deck_order(seed)
+        hand = deck[0 : 5 * players : players] + deck[5 * players : 5 * players + 2]
+        key = hand_key(hand)
+        if key not in plans:
+            plans[key] = best_plan(hand, players, variations, rollouts)
+    write_book(path, players, variations, plans)
+    return len(plans)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m monodeal.book",
+        description="build an opening book for the deals of the given seeds",
+    )
+    parser.add_argument("out")
+    parser.add_argument("--seeds", type=int, default=100)
+    parser.add_argument("--players", type=int, default=2, choices=range(2, 6))
+    parser.add_argument("--rollouts", type=int, default=32)
+    args = parser.parse_args(argv)
+    n = build_book(args.out, range(args.seeds), args.players, args.rollouts)
+    print(f"{args.out}: {n} openings")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import json
+import queue
+import subprocess
+import threading
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any, Self
+
+from . import Action, GameProto
+from .actions import SkipAction, generate_actions
+from .deck import Card
+from .game import Game, Player
+from .protocol import (
+    JSON,
+    action_request,
+    decode_action_choice,
+    decode_payment_choice,
+    payment_request,
+)
+
+
+class BotProcess:
+    # A bot subprocess speaking the monodeal.protocol messages on stdin/stdout.
+    # The process is kept running and reused across games. Replies are read by a
+    # thread, so asking can give up after timeout seconds; a bot that misses the
+    # deadline is killed, and restart() replaces it.
+    def __init__(self, command: Sequence[str], timeout: float | None = 10.0) -> None:
+        self.command = list(command)
+        self.timeout = timeout
+        self.seq = 0
+        self.games = 0
+        self.restarts = 0
+        self._start()
+
+    def _start(self) -> None:
+        self.proc = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+        assert self.proc.stdout is not None
+        # lines from the bot, then "" once it closes its stdout
+        self.lines: queue.Queue[str] = queue.Queue()
+        self.reader = threading.Thread(
+            target=self._read, args=(self.proc.stdout, self.lines), daemon=True
+        )
+        self.reader.start()
+
+    @staticmethod
+    def _read(stdout: Iterable[str], lines: queue.Queue[str]) -> None:
+        for line in stdout:
+            lines.put(line)
+        lines.put("")
+
+    def restart(self) -> None:
+        self.proc.kill()
+        self.close()
+        self.restarts += 1
+        self._start()
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def send(self, msg: JSON) -> None:
+        assert self.proc.stdin is not None
+        self.seq += 1
+        msg["seq"] = self.seq
+        self.proc.stdin.write(json.dumps(msg) + "\n")
+        self.proc.stdin.flush()
+
+    def notify(self, msg: JSON) -> None:
+        # messages without a reply; a bot that has gone away is replaced on release
+        try:
+            self.send(msg)
+        except OSError:
+            pass
+
+    def ask(self, msg: JSON) -> Any:
+        self.send(msg)
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            wait = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                line = self.lines.get(timeout=wait)
+            except queue.Empty:
+                self.proc.kill()
+                raise TimeoutError(
+                    f"bot {self.command} did not reply in {self.timeout}s"
+                ) from None
+            if not line:
+                # left for any later ask, which fails the same way
+                self.lines.put(line)
+                raise ConnectionError(f"bot {self.command} exited")
+            reply = json.loads(line)
+            # a malformed reply, like bad JSON, is a ValueError the seat recovers from
+            if not isinstance(reply, dict):
+                raise ValueError(f"bot replied {reply!r}, not an object")  # noqa: TRY004
+            if reply.get("seq") == self.seq:
+                if "choice" not in reply:
+                    raise ValueError(f"bot reply {reply!r} has no choice")
+                return reply["choice"]
+
+    def close(self) -> None:
+        if self.proc.stdin is not None:
+            try:
+                self.proc.stdin.close()
+            except OSError:
+                pass
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        # the reader stops at the end of the output of the exited process
+        self.reader.join(timeout=5)
+        if self.proc.stdout is not None:
+            self.proc.stdout.close()
+
+
+class BotPlayer(Player):
+    # Seat driven by a BotProcess. Turn and payment decisions go to the bot, the
+    # other choices use the built-in heuristics. A bot that crashes or replies
+    # with an invalid choice is overruled by the heuristics for that decision.
+    # A bot that misses its reply deadline is restarted and forfeits the rest of
+    # the turn, or has the heuristics pay for it.
+    def __init__(self, name: str, bot: BotProcess) -> None:
+        super().__init__(name)
+        self.bot = bot
+        self.forfeits = 0
+        # the turn being forfeited, by game.turns
+        self.forfeited: int | None = None
+
+    def _ask(self, msg: JSON) -> Any:
+        # TimeoutError once the bot has been restarted, None if it failed
+        try:
+            return self.bot.ask(msg)
+        except TimeoutError as e:
+            print(f"{self} bot timed out: {e}")
+            self.forfeits += 1
+            self.bot.restart()
+            self.bot.notify({"type": "new_game", "player": self.name})
+            raise
+        except (OSError, ValueError) as e:
+            print(f"{self} bot failed: {e}")
+            return None
+
+    def get_action(self, game: GameProto, actions_left: int) -> Action:
+        assert isinstance(game, Game)
+        if self.forfeited == game.turns:
+            return SkipAction(self)
+        actions = generate_actions(game, self, actions_left)
+        actions.append(SkipAction(self))
+        try:
+            choice = self._ask(action_request(game, self, actions_left, actions))
+        except TimeoutError:
+            self.forfeited = game.turns
+            return SkipAction(self)
+        action = decode_action_choice(choice, actions)
+        if action is None:
+            print(f"{self} sent invalid action choice {choice!r}")
+            return super().get_action(game, actions_left)
+        return action
+
+    def choose_how_to_pay(self, amount: int) -> Sequence[Card]:
+        cards = self.payable_cards()
+        try:
+            choice = self._ask(payment_request(self, amount, cards))
+        except TimeoutError:
+            return super().choose_how_to_pay(amount)
+        chosen = decode_payment_choice(choice, amount, cards)
+        if chosen is None:
+            print(f"{self} sent invalid payment {choice!r} for {amount}")
+            return super().choose_how_to_pay(amount)
+        return chosen
+
+
+class BotPool:
+    # Keeps bot subprocesses warm between games, so a tournament pays the process
+    # startup cost once per pool slot rather than once per game.
+    def __init__(self, command: Sequence[str], timeout: float | None = 10.0) -> None:
+        self.command = list(command)
+        self.timeout = timeout
+        self.idle: list[BotProcess] = []
+        self.spawned = 0
+
+    def acquire(self) -> BotProcess:
+        while self.idle:
+            bot = self.idle.pop()
+            if bot.alive():
+                return bot
+            bot.close()
+        self.spawned += 1
+        return BotProcess(self.command, self.timeout)
+
+    def release(self, bot: BotProcess) -> None:
+        if bot.alive():
+            self.idle.append(bot)
+        else:
+            bot.close()
+
+    @contextmanager
+    def players(self, names: Sequence[str]) -> Iterator[list[BotPlayer]]:
+        players = [BotPlayer(name, self.acquire()) for name in names]
+        try:
+            for p in players:
+                p.bot.games += 1
+                p.bot.notify({"type": "new_game", "player": p.name})
+            yield players
+        finally:
+            for p in players:
+                p.bot.notify({"type": "game_over", "won": p.has_won()})
+                self.release(p.bot)
+
+    def close(self) -> None:
+        for bot in self.idle:
+            bot.close()
+        self.idle.clear()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
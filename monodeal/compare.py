@@ -0,0 +1,268 @@
+import math
+import random
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+from . import Variations
+from .deck import DECK, Card
+from .game import Game, Player, quiet
+
+Strategy = Callable[[str], Player]
+
+
+def deck_order(seed: int) -> list[Card]:
+    deck = list(DECK)
+    random.Random(seed).shuffle(deck)
+    return deck
+
+
+def mirrored_deck(deck: Sequence[Card]) -> list[Card]:
+    # the same two player deal with the opening hands exchanged. Cards are dealt
+    # alternately, so swapping each adjacent pair of the first ten swaps the hands
+    out = list(deck)
+    for i in range(0, 10, 2):
+        out[i], out[i + 1] = out[i + 1], out[i]
+    return out
+
+
+def hand_advantage(deck: Sequence[Card]) -> int:
+    # cash value of the first seat's opening hand over the second seat's
+    return sum(c.cash for c in deck[0:10:2]) - sum(c.cash for c in deck[1:10:2])
+
+
+def play_deal(
+    a: Strategy,
+    b: Strategy,
+    deck: Sequence[Card],
+    seed: int,
+    variations: Variations,
+    swapped: bool = False,
+) -> int:
+    # one game on a preset deal, returns 1 if strategy A won
+    mine, theirs = a("A"), b("B")
+    g = Game(
+        players=[theirs, mine] if swapped else [mine, theirs],
+        random=random.Random(seed),
+        variations=variations,
+        deck=deck,
+    )
+    with quiet():
+        winner = g.play()
+    return int(winner is mine)
+
+
+def play_pair(
+    a: Strategy, b: Strategy, seed: int, variations: Variations
+) -> tuple[int, int]:
+    # the same deal played twice with the seats swapped, returns A's wins
+    deck = deck_order(seed)
+    return (
+        play_deal(a, b, deck, seed, variations),
+        play_deal(a, b, deck, seed, variations, swapped=True),
+    )
+
+
+@dataclass
+class Comparison:
+    games: int
+    wins: int  # games won by strategy A
+    # log-likelihood ratios of A, and of B, winning 0.5 + delta over 0.5
+    llr: float
+    llr_b: float
+    # "A" or "B" once one is shown better, "tie" once neither is by delta, None
+    # if max_games ran out first
+    decision: str | None
+    low: float
+    high: float
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.5
+
+
+def sprt_bounds(alpha: float, beta: float) -> tuple[float, float]:
+    # Wald's log-likelihood ratio thresholds: (accept H0, accept H1)
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+
+def pair_llr(scores: Sequence[float], s0: float, s1: float) -> float:
+    # Log-likelihood ratio of mean pair score s1 over s0, in the normal
+    # approximation used for pair outcomes of 0, 1/2 or 1: the two games of a
+    # pair share a deal, so their results are correlated and the variance is
+    # that of the pair scores seen, not of independent games. One lost and one
+    # won pair are added to the variance so that a run of equal pairs does not
+    # make it zero.
+    n = len(scores)
+    if n == 0:
+        return 0.0
+    prior = [*scores, 0.0, 1.0]
+    mean = sum(prior) / len(prior)
+    var = sum((s - mean) ** 2 for s in prior) / len(prior)
+    return (s1 - s0) * (2 * sum(scores) - n * (s0 + s1)) / (2 * var)
+
+
+def pair_interval(scores: list[float], confidence: float) -> tuple[float, float]:
+    # normal interval on A's win rate from per-pair scores, which keeps the
+    # correlation between the two games of a pair
+    n = len(scores)
+    mean = sum(scores) / n
+    if n < 2:
+        return 0.0, 1.0
+    var = sum((s - mean) ** 2 for s in scores) / (n - 1)
+    from statistics import NormalDist
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    half = z * math.sqrt(var / n)
+    return max(0.0, mean - half), min(1.0, mean + half)
+
+
+def compare(
+    a: Strategy,
+    b: Strategy,
+    delta: float = 0.05,
+    alpha: float = 0.05,
+    beta: float = 0.05,
+    max_games: int = 2000,
+    confidence: float = 0.95,
+    seed: int = 0,
+    variations: Variations = Variations.FORCE_UNPLACED_PROPERTY_AS_CASH,
+) -> Comparison:
+    # Sequential test of A against B in two player games, as two sequential
+    # probability ratio tests of H0: A scores p = 0.5 against H1: p = 0.5 + delta
+    # for A and p = 0.5 - delta for B. Games are played in seat-swapped pairs on
+    # the same deal and the tests are checked after each pair, on the pair
+    # scores. It stops with "A" or "B" once either H1 is accepted, or with "tie"
+    # once both H0s are, so equal strategies are not declared one better than
+    # the other. alpha is the rate of wrongly picking a side, beta of missing one
+    # that is delta better. The reported interval on A's win rate is at the
+    # given confidence.
+    lower, upper = sprt_bounds(alpha, beta)
+
+    llr_a = llr_b = 0.0
+    wins = 0
+    games = 0
+    scores: list[float] = []
+    decision: str | None = None
+    pair = 0
+    while games + 2 <= max_games:
+        w1, w2 = play_pair(a, b, seed + pair, variations)
+        pair += 1
+        games += 2
+        wins += w1 + w2
+        scores.append((w1 + w2) / 2)
+        llr_a = pair_llr(scores, 0.5, 0.5 + delta)
+        llr_b = pair_llr(scores, 0.5, 0.5 - delta)
+        if llr_a >= upper:
+            decision = "A"
+            break
+        if llr_b >= upper:
+            decision = "B"
+            break
+        if llr_a <= lower and llr_b <= lower:
+            decision = "tie"
+            break
+
+    low, high = pair_interval(scores, confidence) if scores else (0.0, 1.0)
+    return Comparison(games, wins, llr_a, llr_b, decision, low, high)
+
+
+@dataclass
+class Estimate:
+    games: int
+    win_rate: float  # of strategy A
+    variance: float  # of the win rate estimate
+    # variance the same number of independently dealt games would have
+    baseline_variance: float
+
+    @property
+    def variance_reduction(self) -> float:
+        # how many times fewer games this design needs than independent games
+        if self.variance == 0:
+            return math.inf
+        return self.baseline_variance / self.variance
+
+    def interval(self, confidence: float = 0.95) -> tuple[float, float]:
+        from statistics import NormalDist
+
+        half = NormalDist().inv_cdf(0.5 + confidence / 2) * math.sqrt(self.variance)
+        return max(0.0, self.win_rate - half), min(1.0, self.win_rate + half)
+
+
+def _group_estimate(scores: list[float], games: int) -> Estimate:
+    n = len(scores)
+    mean = sum(scores) / n
+    var = sum((s - mean) ** 2 for s in scores) / (n - 1) / n if n > 1 else 0.0
+    return Estimate(games, mean, var, mean * (1 - mean) / games)
+
+
+def estimate(
+    a: Strategy,
+    b: Strategy,
+    groups: int,
+    design: str = "paired",
+    strata: int = 4,
+    seed: int = 0,
+    variations: Variations = Variations.FORCE_UNPLACED_PROPERTY_AS_CASH,
+) -> Estimate:
+    # Win rate of A over B in two player games, using common random deals to
+    # cancel out the luck of the deal:
+    #
+    #   paired      each deal is played twice with the seats swapped
+    #   antithetic  each pair is also played on the mirrored deal, with the
+    #               opening hands exchanged, for four games per group
+    #   stratified  pairs are drawn evenly from `strata` bands of opening hand
+    #               advantage, with band edges from a pilot of cheap shuffles
+    #
+    # The reported variance is of the estimate itself, and baseline_variance is
+    # p(1-p)/games, what the same number of independent games would give.
+    if design in ("paired", "antithetic"):
+        scores: list[float] = []
+        for g in range(groups):
+            deck = deck_order(seed + g)
+            decks = [deck, mirrored_deck(deck)] if design == "antithetic" else [deck]
+            wins = [
+                play_deal(a, b, d, seed + g, variations, swapped)
+                for d in decks
+                for swapped in (False, True)
+            ]
+            scores.append(sum(wins) / len(wins))
+        return _group_estimate(scores, groups * (4 if design == "antithetic" else 2))
+
+    if design != "stratified":
+        raise ValueError(design)
+
+    # band edges at the quantiles of the opening hand advantage, and the weight of
+    # each band from the same pilot, as ties make the bands uneven
+    pilot = sorted(hand_advantage(deck_order(10**9 + i)) for i in range(2000))
+    # band k holds edges[k-1] < advantage <= edges[k], so none are left empty
+    edges = sorted(
+        {pilot[len(pilot) * k // strata] for k in range(1, strata)} - {pilot[-1]}
+    )
+    strata = len(edges) + 1
+
+    def band(advantage: int) -> int:
+        return sum(advantage > e for e in edges)
+
+    weights = [0.0] * strata
+    for adv in pilot:
+        weights[band(adv)] += 1 / len(pilot)
+
+    per_band = max(2, groups // strata)
+    band_scores: list[list[float]] = [[] for _ in range(strata)]
+    s = seed
+    while any(len(bs) < per_band for bs in band_scores):
+        deck = deck_order(s)
+        bs = band_scores[band(hand_advantage(deck))]
+        if len(bs) < per_band:
+            w1 = play_deal(a, b, deck, s, variations)
+            w2 = play_deal(a, b, deck, s, variations, swapped=True)
+            bs.append((w1 + w2) / 2)
+        s += 1
+
+    mean = sum(w * sum(bs) / len(bs) for w, bs in zip(weights, band_scores))
+    var = 0.0
+    for w, bs in zip(weights, band_scores):
+        m = sum(bs) / len(bs)
+        var += w**2 * sum((x - m) ** 2 for x in bs) / (len(bs) - 1) / len(bs)
+    games = 2 * per_band * strata
+    return Estimate(games, mean, var, mean * (1 - mean) / games)
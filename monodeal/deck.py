@@ -1,5 +1,8 @@
+import random
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
 from enum import Flag, auto
-from typing import Sequence
+from typing import Any, Self, SupportsIndex
 
 
 class PropertyColour(Flag):
@@ -31,6 +34,8 @@ class Card:
     def __init__(self, cash: int, name: str):
         self.cash = cash
         self.name = name
+        # cards of the same kind are interchangeable in play
+        self.kind = name
 
     def __repr__(self) -> str:
         return self.name
@@ -41,6 +46,7 @@ class PropertyCard(Card):
         self.colour = colour
         self.property_name = name
         super().__init__(cash, f"PropertyCard[{colour.name},{name!r}]")
+        self.kind = f"PropertyCard[{colour.name}]"
 
 
 class WildPropertyCard(Card):
@@ -223,6 +229,121 @@ ACTION_CARDS = [
 
 DECK = MONEY_DECK + PROPERTY_DECK + PROPERTY_WILDCARDS + RENT_CARDS + ACTION_CARDS
 
+# one representative card for each distinct kind, in deck order
+KIND_CARDS: dict[str, Card] = {}
+for card in DECK:
+    KIND_CARDS.setdefault(card.kind, card)
+CARD_KINDS: list[str] = list(KIND_CARDS)
+KIND_INDEX: dict[str, int] = {k: i for i, k in enumerate(CARD_KINDS)}
+
+
+class DrawPile:
+    # The draw pile as a permutation of slots into a fixed list of cards, dealt
+    # by moving a cursor. Refilling (e.g. from the discard pile) writes a new
+    # permutation of slots rather than moving cards between containers.
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+        self.cards: list[Card] = []
+        self.slots: dict[Card, int] = {}
+        self.order: list[int] = []
+        self.cursor = 0
+        self.extend(cards)
+
+    def _slot(self, card: Card) -> int:
+        slot = self.slots.get(card)
+        if slot is None:
+            slot = self.slots[card] = len(self.cards)
+            self.cards.append(card)
+        return slot
+
+    def __len__(self) -> int:
+        return len(self.order) - self.cursor
+
+    def __iter__(self) -> Iterator[Card]:
+        # remaining cards, next to be dealt first
+        return (self.cards[i] for i in self.order[self.cursor :])
+
+    def __repr__(self) -> str:
+        return f"DrawPile({list(self)})"
+
+    def deal(self) -> Card:
+        card = self.cards[self.order[self.cursor]]
+        self.cursor += 1
+        return card
+
+    def extend(self, cards: Iterable[Card]) -> None:
+        # add cards to the bottom of the pile
+        self.order.extend(self._slot(c) for c in cards)
+
+    def refill(self, cards: Iterable[Card], rng: random.Random) -> None:
+        # replace the (empty) pile with the given cards in a random order
+        self.clear()
+        self.extend(cards)
+        rng.shuffle(self.order)
+
+    def clear(self) -> None:
+        self.order = []
+        self.cursor = 0
+
+
+class Hand(list[Card]):
+    # a player's hand that keeps a count of each card kind and the set of cards
+    # held, so "how many Just Say No cards" and "is this card in hand" are O(1).
+    # Only the mutators below keep the counts up to date.
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+        super().__init__(cards)
+        self.counts: Counter[str] = Counter(c.kind for c in self)
+        self.members: set[Card] = set(self)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # rebuild from the cards alone, so copies and pickles recount
+        return (Hand, (list(self),))
+
+    def __contains__(self, card: object) -> bool:
+        return card in self.members
+
+    def count_of(self, kind: str) -> int:
+        return self.counts[kind]
+
+    def first_of(self, kind: str) -> Card | None:
+        if not self.counts[kind]:
+            return None
+        return next(c for c in self if c.kind == kind)
+
+    def append(self, card: Card) -> None:
+        super().append(card)
+        self.counts[card.kind] += 1
+        self.members.add(card)
+
+    def insert(self, index: SupportsIndex, card: Card) -> None:
+        super().insert(index, card)
+        self.counts[card.kind] += 1
+        self.members.add(card)
+
+    def extend(self, cards: Iterable[Card]) -> None:
+        for card in cards:
+            self.append(card)
+
+    def __iadd__(self, cards: Iterable[Card]) -> Self:  # type: ignore[override, misc]
+        self.extend(cards)
+        return self
+
+    def remove(self, card: Card) -> None:
+        super().remove(card)
+        self.counts[card.kind] -= 1
+        self.members.discard(card)
+
+    def pop(self, index: SupportsIndex = -1) -> Card:
+        card = super().pop(index)
+        self.counts[card.kind] -= 1
+        self.members.discard(card)
+        return card
+
+    def clear(self) -> None:
+        super().clear()
+        self.counts.clear()
+        self.members.clear()
+
+
 if __name__ == "__main__":
     for c in DECK:
         print(c)
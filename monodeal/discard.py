@@ -0,0 +1,169 @@
+from collections import Counter
+from collections.abc import Mapping, Sequence
+
+from .deck import (
+    RENTS,
+    Card,
+    HotelCard,
+    HouseCard,
+    MoneyCard,
+    PropertyCard,
+    PropertyColour,
+    RainbowRentCard,
+    RentCard,
+    WildPropertyCard,
+)
+from .propertyset import PropertySet
+
+# value of holding a single card of each kind, before the property layout is
+# taken into account
+ACTION_VALUES: dict[str, float] = {
+    "JustSayNoCard": 12,
+    "DealBreakerCard": 12,
+    "SlyDealCard": 7,
+    "ForcedDealCard": 6,
+    "DebtCollectorCard": 6,
+    "BirthdayCard": 4,
+    "PassGoCard": 4,
+    "DoubleTheRentCard": 1,
+}
+# each further copy of an action kind is worth this fraction of the previous one
+REPEAT_DISCOUNT = 0.75
+# property progress: worth PROGRESS per set filled, plus COMPLETE on completion
+PROGRESS = 4.0
+COMPLETE = 6.0
+# a surplus card (e.g. a fourth property for a 3 card set) only has cash value
+SURPLUS = 0.5
+
+
+def _held(propertysets: Mapping[PropertyColour, PropertySet], c: PropertyColour) -> int:
+    ps = propertysets.get(c)
+    return 0 if ps is None else len(ps.properties) + len(ps.wilds)
+
+
+def _property_marginal(held: int, size: int, j: int, cash: int) -> float:
+    # value of the j-th (1-based) extra card towards a set of the given size
+    if held + j > size:
+        return cash * SURPLUS
+    value = cash + PROGRESS * (held + j) / size
+    if held + j == size:
+        value += COMPLETE
+    return value
+
+
+def _marginals(
+    card: Card,
+    n: int,
+    propertysets: Mapping[PropertyColour, PropertySet],
+    hand_kinds: Counter[str],
+    claimed: Counter[PropertyColour],
+) -> list[float]:
+    # Value of keeping the 1st, 2nd ... nth card of this kind. Property cards
+    # count those of earlier kinds already placed in claimed as held, and add
+    # their own, so a colour's completion bonus goes to one card only.
+    if isinstance(card, MoneyCard):
+        return [card.cash] * n
+    if isinstance(card, PropertyCard):
+        held = _held(propertysets, card.colour) + claimed[card.colour]
+        size = len(RENTS[card.colour])
+        claimed[card.colour] += n
+        return [_property_marginal(held, size, j, card.cash) for j in range(1, n + 1)]
+    if isinstance(card, WildPropertyCard):
+        # each copy goes to the colour it is worth most to
+        cash = max(card.cash, 1)
+
+        def worth(c: PropertyColour) -> float:
+            held = _held(propertysets, c) + claimed[c]
+            return _property_marginal(held, len(RENTS[c]), 1, cash)
+
+        values = []
+        for _ in range(n):
+            colour = max(card.colours, key=worth)
+            values.append(worth(colour))
+            claimed[colour] += 1
+        return values
+
+    if isinstance(card, (RentCard, RainbowRentCard)):
+        rent = max(
+            (ps.rent_value() for c, ps in propertysets.items() if c in card.colours),
+            default=0,
+        )
+        single = card.cash * SURPLUS + rent
+    elif isinstance(card, HouseCard):
+        can_build = any(ps.can_build_house() for ps in propertysets.values())
+        single = card.cash + (3 if can_build else 0)
+    elif isinstance(card, HotelCard):
+        can_build = any(ps.can_build_hotel() for ps in propertysets.values())
+        single = card.cash + (4 if can_build else 0)
+    elif card.kind == "DoubleTheRentCard":
+        rent_cards = sum(
+            count
+            for kind, count in hand_kinds.items()
+            if kind.startswith(("Rent", "Rainbow"))
+        )
+        single = ACTION_VALUES[card.kind] + (3 if rent_cards else 0)
+    else:
+        single = ACTION_VALUES.get(card.kind, card.cash)
+    return [single * REPEAT_DISCOUNT**j for j in range(n)]
+
+
+def _claim_order(card: Card) -> int:
+    if isinstance(card, WildPropertyCard):
+        return len(card.colours)
+    return 0
+
+
+def choose_discards(
+    hand: Sequence[Card],
+    count: int,
+    propertysets: Mapping[PropertyColour, PropertySet],
+) -> list[Card]:
+    # Pick the `count` cards to discard that leave the most valuable hand.
+    #
+    # Cards of the same kind are interchangeable, so the choice is how many of each
+    # kind to keep. The value of keeping k cards of a kind comes from the tables
+    # above given the current property layout, and need not be concave (the card
+    # that completes a set is worth more than the one before it). A knapsack DP
+    # over kinds picks the exact best split of the cards to keep in
+    # O(kinds * hand size^2), rather than re-scoring the hand per discard.
+    if count <= 0:
+        return []
+    if count >= len(hand):
+        return list(hand)
+
+    by_kind: dict[str, list[Card]] = {}
+    for card in hand:
+        by_kind.setdefault(card.kind, []).append(card)
+    hand_kinds = Counter({k: len(cs) for k, cs in by_kind.items()})
+    keep = len(hand) - count
+
+    # property kinds claim their colours plain cards first, then wildcards of
+    # fewer colours, so cards that can only go one way are placed there
+    claimed: Counter[PropertyColour] = Counter()
+    marginals = {
+        kind: _marginals(cards[0], len(cards), propertysets, hand_kinds, claimed)
+        for kind, cards in sorted(
+            by_kind.items(), key=lambda kc: _claim_order(kc[1][0])
+        )
+    }
+
+    # best[kept] = (value, keep count per kind so far)
+    best: dict[int, tuple[float, tuple[int, ...]]] = {0: (0.0, ())}
+    for kind, cards in by_kind.items():
+        totals = [0.0]
+        for m in marginals[kind]:
+            totals.append(totals[-1] + m)
+        step: dict[int, tuple[float, tuple[int, ...]]] = {}
+        for kept, (value, choice) in best.items():
+            for k in range(min(len(cards), keep - kept) + 1):
+                candidate = (value + totals[k], (*choice, k))
+                current = step.get(kept + k)
+                if current is None or candidate[0] > current[0]:
+                    step[kept + k] = candidate
+        best = step
+
+    _, choice = best[keep]
+    discards: list[Card] = []
+    for cards, k in zip(by_kind.values(), choice):
+        discards.extend(cards[k:])
+    return discards
@@ -0,0 +1,149 @@
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from . import Action
+from .actions import (
+    ActionKey,
+    seated_action_key,
+)
+from .deck import (
+    ALLOWED_BUILDINGS,
+    CARD_KINDS,
+    KIND_CARDS,
+    KIND_INDEX,
+    HotelCard,
+    HouseCard,
+    PropertyCard,
+    PropertyColour,
+    RainbowRentCard,
+    RentCard,
+    WildPropertyCard,
+)
+from .game import Game, Player, cash_value
+
+# Fixed layout observation of one player's view of a game, for learned policies.
+#
+#   [0, 40)          count of each card kind in own hand (see deck.CARD_KINDS)
+#   then per seat, starting with the observing player and continuing clockwise
+#   (opponents beyond MAX_SEATS are dropped, missing seats left as zero):
+#     +0             bank value
+#     +1             hand size
+#     +2 + 4*colour  cards in set, set complete, house, hotel
+#   then             draw pile size, discard pile size, actions left
+
+MAX_SEATS = 5
+COLOURS: list[PropertyColour] = list(PropertyColour.ALL)
+COLOUR_INDEX: dict[PropertyColour, int] = {c: i for i, c in enumerate(COLOURS)}
+
+HAND_OFFSET = 0
+SEAT_OFFSET = HAND_OFFSET + len(CARD_KINDS)
+SEAT_SIZE = 2 + 4 * len(COLOURS)
+GLOBAL_OFFSET = SEAT_OFFSET + MAX_SEATS * SEAT_SIZE
+OBS_SIZE = GLOBAL_OFFSET + 3
+
+
+def _build_action_space() -> list[ActionKey]:
+    keys: list[ActionKey] = [("SkipAction", "", None, 0, 0)]
+    # building moves are keyed by destination only
+    keys += [("MoveBuildingAction", "", c, 0, 0) for c in ALLOWED_BUILDINGS]
+    targets = range(1, MAX_SEATS)
+    for kind, card in KIND_CARDS.items():
+        keys.append(("DepositAction", kind, None, 0, 0))
+        if isinstance(card, PropertyCard):
+            keys.append(("PlayPropertyAction", kind, card.colour, 0, 0))
+        elif isinstance(card, WildPropertyCard):
+            for c in card.colours:
+                keys.append(("PlayPropertyAction", kind, c, 0, 0))
+                keys.append(("MovePropertyAction", kind, c, 0, 0))
+        elif isinstance(card, (HouseCard, HotelCard)):
+            for c in ALLOWED_BUILDINGS:
+                keys.append(("PlayPropertyAction", kind, c, 0, 0))
+        elif isinstance(card, (RentCard, RainbowRentCard)):
+            rent_targets = [0] if isinstance(card, RentCard) else targets
+            for c in card.colours:
+                for t in rent_targets:
+                    for doubles in range(3):
+                        keys.append(("RentAction", kind, c, t, doubles))
+        elif card.kind == "BirthdayCard":
+            keys.append(("BirthdayAction", kind, None, 0, 0))
+        elif card.kind == "PassGoCard":
+            keys.append(("PassGoAction", kind, None, 0, 0))
+        elif card.kind == "DebtCollectorCard":
+            for t in targets:
+                keys.append(("DebtCollectorAction", kind, None, t, 0))
+        elif card.kind == "DealBreakerCard":
+            for t in targets:
+                for c in COLOURS:
+                    keys.append(("DealBreakerAction", kind, c, t, 0))
+    return keys
+
+
+ACTION_SPACE: list[ActionKey] = _build_action_space()
+ACTION_INDEX: dict[ActionKey, int] = {k: i for i, k in enumerate(ACTION_SPACE)}
+ACTION_SIZE = len(ACTION_SPACE)
+
+
+def new_observation(n: int | None = None) -> npt.NDArray[np.float32]:
+    # allocate once and reuse, every encode call overwrites the whole buffer
+    shape = (OBS_SIZE,) if n is None else (n, OBS_SIZE)
+    return np.zeros(shape, dtype=np.float32)
+
+
+def new_action_mask(n: int | None = None) -> npt.NDArray[np.bool_]:
+    shape = (ACTION_SIZE,) if n is None else (n, ACTION_SIZE)
+    return np.zeros(shape, dtype=np.bool_)
+
+
+def seats_from(game: Game, player: Player) -> list[Player]:
+    # players in turn order, starting with the given player
+    i = game.players.index(player)
+    return game.players[i:] + game.players[:i]
+
+
+def encode_observation(
+    game: Game, player: Player, actions_left: int, out: npt.NDArray[Any]
+) -> None:
+    out[:] = 0
+    for card in player.hand:
+        out[HAND_OFFSET + KIND_INDEX[card.kind]] += 1
+
+    for seat, p in enumerate(seats_from(game, player)[:MAX_SEATS]):
+        base = SEAT_OFFSET + seat * SEAT_SIZE
+        out[base] = cash_value(p.cash)
+        out[base + 1] = len(p.hand)
+        # several sets of one colour are summed into the same slots
+        for ps in p.propertysets.all():
+            at = base + 2 + 4 * COLOUR_INDEX[ps.colour]
+            out[at] += len(ps.properties) + len(ps.wilds)
+            out[at + 1] += ps.is_complete()
+            out[at + 2] += ps.house is not None
+            out[at + 3] += ps.hotel is not None
+
+    out[GLOBAL_OFFSET] = len(game.draw)
+    out[GLOBAL_OFFSET + 1] = len(game.discarded)
+    out[GLOBAL_OFFSET + 2] = actions_left
+
+
+def action_key(game: Game, action: Action) -> ActionKey:
+    return seated_action_key(game.players, action)
+
+
+def encode_actions(
+    game: Game, actions: Sequence[Action], mask: npt.NDArray[np.bool_]
+) -> list[int]:
+    # fill the legal action mask, returning the action space index of each action.
+    # Interchangeable actions (e.g. depositing either of two MoneyCard[1]) share
+    # an index.
+    mask[:] = False
+    indices = [ACTION_INDEX[action_key(game, a)] for a in actions]
+    mask[indices] = True
+    return indices
+
+
+def decode_action(
+    actions: Sequence[Action], indices: Sequence[int], choice: int
+) -> Action:
+    return actions[indices.index(choice)]
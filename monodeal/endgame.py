@@ -0,0 +1,258 @@
+import copy
+import random
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+
+from . import Action, GameProto
+from .actions import (
+    BirthdayAction,
+    DealBreakerAction,
+    DebtCollectorAction,
+    MoveBuildingAction,
+    MovePropertyAction,
+    PassGoAction,
+    PlayPropertyAction,
+    RentAction,
+    SkipAction,
+    generate_actions,
+)
+from .game import Game, Player, quiet
+
+WIN = 1
+LOSS = -1
+UNKNOWN = 0
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# cheap static move ordering, most promising first
+ORDER: dict[type[Action], int] = {
+    MovePropertyAction: 0,
+    MoveBuildingAction: 0,
+    PlayPropertyAction: 1,
+    DealBreakerAction: 2,
+    RentAction: 3,
+    DebtCollectorAction: 4,
+    BirthdayAction: 5,
+    PassGoAction: 6,
+    SkipAction: 9,
+}
+
+
+def legal_actions(g: Game) -> list[Action]:
+    p = g.current_player()
+    actions = generate_actions(g, p, g.actions_left)
+    actions.append(SkipAction(p))
+    return actions
+
+
+def position_key(g: Game) -> Hashable:
+    # Cards of the same kind are interchangeable, so positions are keyed by kinds.
+    # The shuffle RNG state is left out: it only matters once the draw pile runs
+    # out, and then positions with equal piles have had the same history.
+    def table(p: Player) -> Hashable:
+        return (
+            tuple(sorted(c.kind for c in p.hand)),
+            tuple(sorted(c.kind for c in p.cash)),
+            tuple(sorted(c.kind for c in p.unallocated_buildings)),
+            tuple(
+                (
+                    ps.colour.value,
+                    tuple(sorted(c.kind for c in ps.properties)),
+                    tuple(sorted(c.kind for c in ps.wilds)),
+                    ps.house is not None,
+                    ps.hotel is not None,
+                )
+                for ps in p.propertysets.all()
+                if len(ps)
+            ),
+        )
+
+    return (
+        g.current,
+        g.actions_left,
+        tuple(c.kind for c in g.draw),
+        tuple(c.kind for c in g.discarded),
+        tuple(table(p) for p in g.players),
+    )
+
+
+@dataclass
+class EndgameResult:
+    # value of each legal action for the player to move: WIN or LOSS when proven,
+    # UNKNOWN when the search ran out of depth or node budget first
+    values: list[tuple[Action, int]]
+    nodes: int
+    depth: int
+
+    def best(self) -> Action:
+        return max(self.values, key=lambda av: av[1])[0]
+
+
+@dataclass
+class EndgameSolver:
+    # Perfect-information search of the given position: the draw pile order and
+    # every hand are known, and the choices made inside Action.apply (payments,
+    # wildcard colours, discards) are the players' own deterministic heuristics.
+    # Every move is played with Game.step on a copy of the game, so results
+    # match play. Searching the real game is for analysis: a player searches
+    # determinized copies, see EndgamePlayer.
+    #
+    # Iterative deepening alpha-beta over single actions, with a transposition
+    # table and static move ordering. Against several opponents the search is
+    # paranoid: every other player is assumed to play against the root player.
+    max_nodes: int = 20000
+    max_depth: int = 12
+    nodes: int = 0
+    table: dict[Hashable, tuple[int, int, int, int]] = field(default_factory=dict)
+
+    def out_of_budget(self) -> bool:
+        return self.nodes >= self.max_nodes
+
+    def _child(self, g: Game, i: int) -> tuple[Game, Player | None]:
+        child = copy.deepcopy(g)
+        winner = child.step(legal_actions(child)[i])
+        return child, winner
+
+    def _order(self, g: Game, actions: list[Action], first: int) -> list[int]:
+        order = sorted(
+            range(len(actions)), key=lambda i: ORDER.get(type(actions[i]), 7)
+        )
+        if 0 <= first < len(actions):
+            order.remove(first)
+            order.insert(0, first)
+        return order
+
+    def _search(self, g: Game, root: int, depth: int, alpha: int, beta: int) -> int:
+        self.nodes += 1
+        key = position_key(g)
+        entry = self.table.get(key)
+        best_move = -1
+        if entry is not None:
+            entry_depth, value, flag, best_move = entry
+            # a proven win or loss holds at any depth
+            if flag == EXACT and (value != UNKNOWN or entry_depth >= depth):
+                return value
+            if entry_depth >= depth:
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                elif flag == UPPER:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        if depth == 0 or self.out_of_budget():
+            return UNKNOWN
+
+        maximising = g.current == root
+        actions = legal_actions(g)
+        alpha0, beta0 = alpha, beta
+        best = LOSS if maximising else WIN
+        for i in self._order(g, actions, best_move):
+            child, winner = self._child(g, i)
+            if winner is not None:
+                value = WIN if child.players.index(winner) == root else LOSS
+            else:
+                value = self._search(child, root, depth - 1, alpha, beta)
+            if (value > best) if maximising else (value < best):
+                best, best_move = value, i
+            if maximising:
+                alpha = max(alpha, best)
+            else:
+                beta = min(beta, best)
+            if alpha >= beta:
+                break
+
+        if not self.out_of_budget():
+            flag = EXACT
+            if best <= alpha0:
+                flag = UPPER
+            elif best >= beta0:
+                flag = LOWER
+            self.table[key] = (depth, best, flag, best_move)
+        return best
+
+    def solve(self, game: Game) -> EndgameResult:
+        root = game.current
+        actions = legal_actions(game)
+        values = [UNKNOWN] * len(actions)
+        completed = 0
+        with quiet():
+            for depth in range(1, self.max_depth + 1):
+                found = list(values)
+                for i in range(len(actions)):
+                    if found[i] != UNKNOWN:
+                        continue
+                    child, winner = self._child(game, i)
+                    if winner is not None:
+                        found[i] = WIN if child.players.index(winner) == root else LOSS
+                    else:
+                        found[i] = self._search(child, root, depth - 1, LOSS, WIN)
+                if self.out_of_budget():
+                    # only keep what was proven in the interrupted iteration
+                    values = [v if v != UNKNOWN else f for v, f in zip(values, found)]
+                    break
+                values = found
+                completed = depth
+                if UNKNOWN not in values:
+                    break
+        return EndgameResult(list(zip(actions, values)), self.nodes, completed)
+
+
+def determinize(game: Game, player: Player, rng: random.Random) -> Game:
+    # A copy of the game as the player might imagine it: the cards it has not
+    # seen, those game.unseen_cards(player) counts, are dealt again at random
+    # into the draw pile and the opponents' hands, each keeping its size, and
+    # later reshuffles follow a new random order.
+    g = copy.deepcopy(game)
+    me = g.players[game.players.index(player)]
+    opponents = [q for q in g.players if q is not me]
+    cards = [*g.draw, *(c for q in opponents for c in q.hand)]
+    rng.shuffle(cards)
+    held = len(cards) - len(g.draw)
+    g.draw.clear()
+    g.draw.extend(cards[held:])
+    for q in opponents:
+        size = len(q.hand)
+        q.hand, cards = cards[:size], cards[size:]
+    g.random = random.Random(rng.getrandbits(64))
+    g.recount_unseen()
+    return g
+
+
+class EndgamePlayer(Player):
+    # Once the draw pile is small, searches several determinizations of the game
+    # and plays an action the solver proves wins in all of them, otherwise falls
+    # back to the heuristic. It never looks at the draw order or the opponents'
+    # hands.
+    def __init__(
+        self,
+        name: str,
+        draw_threshold: int = 10,
+        max_nodes: int = 20000,
+        samples: int = 4,
+    ) -> None:
+        super().__init__(name)
+        self.draw_threshold = draw_threshold
+        self.max_nodes = max_nodes
+        self.samples = samples
+
+    def solve(self, game: Game) -> list[tuple[Action, int]]:
+        # the value of each legal action in the worst determinization
+        actions = legal_actions(game)
+        values = [WIN] * len(actions)
+        for _ in range(self.samples):
+            g = determinize(game, self, game.decisions)
+            result = EndgameSolver(max_nodes=self.max_nodes).solve(g)
+            assert len(result.values) == len(actions)
+            values = [min(v, w) for v, (_, w) in zip(values, result.values)]
+        return list(zip(actions, values))
+
+    def get_action(self, game: GameProto, actions_left: int) -> Action:
+        if not isinstance(game, Game) or len(game.draw) > self.draw_threshold:
+            return super().get_action(game, actions_left)
+        action, value = max(self.solve(game), key=lambda av: av[1])
+        if value != WIN:
+            return super().get_action(game, actions_left)
+        return action
@@ -0,0 +1,146 @@
+import random
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from . import Action, Variations
+from .actions import SkipAction, generate_actions
+from .encode import (
+    decode_action,
+    encode_actions,
+    encode_observation,
+    new_action_mask,
+    new_observation,
+)
+from .game import Game, Player
+
+
+class _Table:
+    # one environment: a game where the learner is driven by the caller and every
+    # other seat plays with its own get_action
+    def __init__(self, game: Game, learner: Player) -> None:
+        self.game = game
+        self.learner = learner
+        self.actions: list[Action] = []
+        self.indices: list[int] = []
+        self.steps = 0
+
+    def advance(self) -> Player | None:
+        # play opponents until it is the learner's turn or the game is over
+        g = self.game
+        while g.current_player() is not self.learner:
+            p = g.current_player()
+            winner = g.step(p.get_action(g, g.actions_left))
+            if winner is not None:
+                return winner
+        return None
+
+    def observe(self, obs: npt.NDArray[Any], mask: npt.NDArray[np.bool_]) -> None:
+        g = self.game
+        self.actions = generate_actions(g, self.learner, g.actions_left)
+        self.actions.append(SkipAction(self.learner))
+        encode_observation(g, self.learner, g.actions_left, obs)
+        self.indices = encode_actions(g, self.actions, mask)
+
+
+class VectorEnv:
+    # Steps num_envs games together for training. Observations and legal action
+    # masks come from monodeal.encode and are written into preallocated arrays,
+    # one row per environment. Actions are indices into encode.ACTION_SPACE.
+    #
+    # Only the learner's turn actions are exposed. Payments, wildcard and building
+    # placement and discards use the built-in Player heuristics. Rewards are +1 for
+    # a win, -1 for a loss and 0 otherwise. With auto_reset a finished environment
+    # starts a new game straight away, and the observation returned is from it;
+    # without it, reset() must be called once any environment is done.
+    def __init__(
+        self,
+        num_envs: int,
+        num_players: int = 2,
+        opponent: Callable[[str], Player] = Player,
+        seed: int = 0,
+        variations: Variations = Variations.FORCE_UNPLACED_PROPERTY_AS_CASH,
+        auto_reset: bool = True,
+    ) -> None:
+        assert 2 <= num_players <= 5
+        self.num_envs = num_envs
+        self.num_players = num_players
+        self.opponent = opponent
+        self.seed = seed
+        self.variations = variations
+        self.auto_reset = auto_reset
+        self.episodes = [0] * num_envs
+        self.tables: list[_Table] = []
+
+        self.observations = new_observation(num_envs)
+        self.masks = new_action_mask(num_envs)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.dones = np.zeros(num_envs, dtype=np.bool_)
+
+    def _new_table(self, i: int) -> _Table:
+        while True:
+            learner = Player("learner")
+            players = [learner]
+            players += [self.opponent(f"op{n}") for n in range(1, self.num_players)]
+            rng = random.Random(f"{self.seed}/{i}/{self.episodes[i]}")
+            self.episodes[i] += 1
+            # rotate the learner's seat so it does not always move first
+            first = self.episodes[i] % self.num_players
+            game = Game(
+                players=players[first:] + players[:first],
+                random=rng,
+                variations=self.variations,
+            )
+            table = _Table(game, learner)
+            game.start()
+            # deal again in the unlikely case an opponent won before we moved
+            if table.advance() is None:
+                return table
+
+    def reset(
+        self, seed: int | None = None
+    ) -> tuple[npt.NDArray[np.float32], npt.NDArray[np.bool_]]:
+        if seed is not None:
+            self.seed = seed
+            self.episodes = [0] * self.num_envs
+        self.tables = [self._new_table(i) for i in range(self.num_envs)]
+        for i, t in enumerate(self.tables):
+            t.observe(self.observations[i], self.masks[i])
+        self.dones[:] = False
+        return self.observations, self.masks
+
+    def step(
+        self, actions: Sequence[int] | npt.NDArray[np.integer[Any]]
+    ) -> tuple[
+        npt.NDArray[np.float32],
+        npt.NDArray[np.bool_],
+        npt.NDArray[np.float32],
+        npt.NDArray[np.bool_],
+        list[dict[str, Any]],
+    ]:
+        assert len(actions) == self.num_envs
+        self.rewards[:] = 0
+        self.dones[:] = False
+        infos: list[dict[str, Any]] = []
+        for i, t in enumerate(self.tables):
+            info: dict[str, Any] = {}
+            choice = int(actions[i])
+            assert self.masks[i, choice], f"env {i}: action {choice} is not legal"
+            t.steps += 1
+            action = decode_action(t.actions, t.indices, choice)
+            winner = t.game.step(action)
+            if winner is None:
+                winner = t.advance()
+            if winner is not None:
+                self.rewards[i] = 1 if winner is t.learner else -1
+                self.dones[i] = True
+                info["winner"] = winner.name
+                info["steps"] = t.steps
+                if self.auto_reset:
+                    t = self.tables[i] = self._new_table(i)
+            if winner is None or self.auto_reset:
+                t.observe(self.observations[i], self.masks[i])
+            infos.append(info)
+        return self.observations, self.masks, self.rewards, self.dones, infos
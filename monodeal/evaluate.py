@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+
+from . import PlayerProto
+from .deck import KIND_CARDS, MoneyCard, PropertyCard, WildPropertyCard
+from .game import Game, Player, cash_value
+
+# kinds that are played for an effect: rent, actions and buildings
+ACTION_KINDS = [
+    kind
+    for kind, card in KIND_CARDS.items()
+    if not isinstance(card, (MoneyCard, PropertyCard, WildPropertyCard))
+]
+
+
+@dataclass(frozen=True)
+class Features:
+    complete: int  # complete sets
+    near_complete: int  # sets one card from completion
+    rent: int  # summed rent over all sets
+    bank: int
+    actions: int  # action cards in hand
+
+
+def features(p: Player) -> Features:
+    # from the totals the player's property sets, bank and hand keep as cards
+    # move, so a constant number of lookups
+    sets = p.propertysets
+    return Features(
+        len(sets.complete),
+        sets.near_complete,
+        sets.rent,
+        p.get_money(),
+        sum(p.hand.count_of(kind) for kind in ACTION_KINDS),
+    )
+
+
+def recount_features(p: Player) -> Features:
+    # the same from scratch, to check the running totals
+    sets = list(p.propertysets.all())
+    return Features(
+        sum(ps.is_complete() for ps in sets),
+        sum(ps.is_near_complete() for ps in sets),
+        sum(ps.rent_value() for ps in sets),
+        cash_value(p.cash),
+        sum(c.kind in ACTION_KINDS for c in p.hand),
+    )
+
+
+@dataclass(frozen=True)
+class Evaluator:
+    # A static score of a position for search and rollouts: the weighted
+    # features of the player less those of its strongest opponent.
+    complete: float = 10.0
+    near_complete: float = 3.0
+    rent: float = 0.5
+    bank: float = 0.25
+    actions: float = 0.5
+    # recount every feature rather than reading the running totals
+    full: bool = False
+
+    def value(self, p: Player) -> float:
+        f = recount_features(p) if self.full else features(p)
+        return (
+            self.complete * f.complete
+            + self.near_complete * f.near_complete
+            + self.rent * f.rent
+            + self.bank * f.bank
+            + self.actions * f.actions
+        )
+
+    def __call__(self, g: Game, player: PlayerProto) -> float:
+        mine = 0.0
+        best = float("-inf")
+        for p in g.players:
+            if p is player:
+                mine = self.value(p)
+            else:
+                best = max(best, self.value(p))
+        return mine if best == float("-inf") else mine - best
@@ -0,0 +1,307 @@
+import random
+import time
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field, replace
+from itertools import repeat
+from typing import TYPE_CHECKING
+
+from . import Action, Variations
+from .actions import SkipAction, generate_actions
+from .deck import ALLOWED_BUILDINGS, CARD_KINDS, DECK, Card
+from .game import Game, Player, cash_value, quiet
+from .payment import PaymentSchedule
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+# Drives games with random legal actions under random rules variations, checking
+# the engine's cheap invariants after every step and the deep ones every
+# DEEP_EVERY steps. A failing game is kept as a Case, replayable from its seed
+# and action choices, and shrunk to a short one. One core fuzzes about 25 games
+# a second this way, and about 5 with --deep-every 1; the game steps themselves
+# take most of the rest, so throughput scales with --workers rather than further
+# sampling.
+
+
+class InvariantError(AssertionError):
+    pass
+
+
+def check(ok: bool, reason: str, *args: object) -> None:
+    # the reason is only formatted on failure, as checks run after every step
+    if not ok:
+        raise InvariantError(reason.format(*args))
+
+
+def check_invariants(g: Game, deep: bool = True) -> None:
+    # The cheap checks count cards and compare each player's running totals.
+    # deep also places every card, walks every set, recounts unseen kinds and
+    # re-solves payment schedules, which costs several game steps, so random
+    # games only ask for it on some steps.
+    cards = len(g.draw) + len(g.discarded)
+    for p in g.players:
+        cards += len(p.hand) + len(p.cash) + len(p.unallocated_buildings)
+        cards += len(p.cards_to_ps)
+        check(p.get_money() == cash_value(p.cash), "{} bank value", p)
+        check(len(p.hand) == p.hand.counts.total(), "{} hand size", p)
+    check(cards == len(DECK), "{} cards, not {}", cards, len(DECK))
+    hidden_total = len(g.draw) + sum(len(p.hand) for p in g.players)
+    for p, unseen in zip(g.players, g.unseen):
+        check(unseen.total == hidden_total - len(p.hand), "{} unseen total", p)
+    if deep:
+        _check_deep(g)
+
+
+def _check_deep(g: Game) -> None:
+    # every card is in exactly one zone
+    zones: dict[int, str] = {}
+
+    def place(cards: Iterable[Card], zone: str) -> None:
+        for c in cards:
+            other = zones.setdefault(id(c), zone)
+            check(other == zone, "{} in {} and {}", c, other, zone)
+
+    place(g.draw, "draw")
+    place(g.discarded, "discarded")
+    for p in g.players:
+        place(p.hand, f"{p} hand")
+        place(p.cash, f"{p} cash")
+        place(p.unallocated_buildings, f"{p} buildings")
+        for ps in p.propertysets.all():
+            place(ps, f"{p} property")
+    check(len(zones) == len(DECK), "{} cards, not {}", len(zones), len(DECK))
+    check(all(id(c) in zones for c in DECK), "cards are not the deck")
+
+    forfeit = g.variations & (
+        Variations.FORFEIT_BUILDINGS | Variations.FORFEIT_BUILDINGS_TO_BANK
+    )
+    for p in g.players:
+        sets = p.propertysets
+        held = 0
+        for ps in sets.all():
+            colour = ps.colour
+            check(all(c.colour == colour for c in ps.properties), "{} colours", ps)
+            check(all(colour in w.colours for w in ps.wilds), "{} wild colours", ps)
+            if ps.house is not None or ps.hotel is not None:
+                check(colour in ALLOWED_BUILDINGS, "building on {}", ps)
+                check(ps.house is not None, "hotel without a house on {}", ps)
+                check(ps.is_complete() or not forfeit, "building on incomplete {}", ps)
+            for c in ps:
+                check(p.cards_to_ps.get(c) is ps, "{} not mapped to {}", c, ps)
+                held += 1
+            index = sets.complete if ps.is_complete() else sets.incomplete
+            check(ps in index, "{} not indexed as complete={}", ps, ps.is_complete())
+            check(
+                sets.scores.get(ps) == (ps.rent_value(), int(ps.is_near_complete())),
+                "{} score",
+                ps,
+            )
+        check(held == len(p.cards_to_ps), "{} maps cards outside its sets", p)
+        check(
+            len(sets.complete) + len(sets.incomplete) == sum(1 for _ in sets.all()),
+            "{} set index size",
+            p,
+        )
+        check(sets.rent == sum(ps.rent_value() for ps in sets.all()), "{} rent", p)
+        check(
+            p.get_property_as_cash()
+            == cash_value([*p.cards_to_ps, *p.unallocated_buildings]),
+            "{} property value",
+            p,
+        )
+        check(p.hand.counts == Counter(c.kind for c in p.hand), "{} hand counts", p)
+        fresh = PaymentSchedule(p.cash, p.unallocated_buildings, p.propertysets)
+        check(p.payment_schedule().payments == fresh.payments, "{} payments", p)
+
+    # unseen cards are those in the draw pile and the other hands
+    hidden = Counter(c.kind for c in g.draw)
+    for p in g.players:
+        hidden.update(p.hand.counts)
+    for p, unseen in zip(g.players, g.unseen):
+        for kind in CARD_KINDS:
+            n = hidden[kind] - p.hand.counts[kind]
+            check(unseen.count(kind) == n, "{} unseen {}", p, kind)
+
+
+# steps between deep invariant checks in random games; replays check every step,
+# so a failure found on a deep step is still found when the case is shrunk
+DEEP_EVERY = 64
+
+
+@dataclass
+class Case:
+    # a game replayed from its seed with each action picked by index, modulo the
+    # number of legal actions at that step
+    seed: int
+    variations: Variations
+    players: int
+    choices: list[int] = field(default_factory=list)
+
+
+def _legal(g: Game) -> list[Action]:
+    p = g.current_player()
+    return [*generate_actions(g, p, g.actions_left), SkipAction(p)]
+
+
+def _new_game(case: Case) -> Game:
+    seats = [Player(chr(ord("A") + i)) for i in range(case.players)]
+    return Game(seats, variations=case.variations, seed=case.seed)
+
+
+def replay(case: Case) -> Exception | None:
+    # the error the case ends in, None if it plays through its choices
+    g = _new_game(case)
+    try:
+        with quiet():
+            g.start()
+            check_invariants(g)
+            for choice in case.choices:
+                actions = _legal(g)
+                winner = g.step(actions[choice % len(actions)])
+                check_invariants(g)
+                check_winner(g, winner)
+                if winner is not None:
+                    break
+    # any error is a failure to report, whatever raised it
+    except Exception as e:  # noqa: BLE001
+        return e
+    return None
+
+
+def check_winner(g: Game, winner: Player | None) -> None:
+    won = [p for p in g.players if p.has_won()]
+    if winner is None:
+        check(not won or g.decked_out, "{} won unnoticed", won)
+    elif not g.decked_out:
+        check(winner in won, "{} declared without winning", winner)
+
+
+def random_case(
+    seed: int, max_steps: int = 2000, deep_every: int = DEEP_EVERY
+) -> Case | None:
+    # plays one random game, returning it as a Case if it fails; the deep
+    # invariants are checked every deep_every steps and on the last one
+    rng = random.Random(seed)
+    variations = Variations.FORCE_UNPLACED_PROPERTY_AS_CASH
+    for flag in Variations:
+        if rng.random() < 0.5:
+            variations |= flag
+    case = Case(seed, variations, rng.randint(2, 5))
+    g = _new_game(case)
+    try:
+        with quiet():
+            g.start()
+            check_invariants(g)
+            for step in range(1, max_steps + 1):
+                choice = rng.randrange(1 << 16)
+                case.choices.append(choice)
+                actions = _legal(g)
+                winner = g.step(actions[choice % len(actions)])
+                check_invariants(g, winner is not None or step % deep_every == 0)
+                check_winner(g, winner)
+                if winner is not None:
+                    return None
+    # any error makes the game a failing case, to be shrunk and replayed
+    except Exception:  # noqa: BLE001
+        return case
+    return None
+
+
+def _same_failure(a: Exception | None, b: Exception) -> bool:
+    return type(a) is type(b) and (
+        not isinstance(b, InvariantError) or str(a).split()[-1:] == str(b).split()[-1:]
+    )
+
+
+def shrink(case: Case) -> Case:
+    # Delta debugging over the action choices: drop ever smaller chunks, then
+    # lower each remaining choice, keeping any change that still fails the same
+    # way. Then tries smaller seeds with the shrunk choices.
+    failure = replay(case)
+    assert failure is not None, "case does not fail"
+
+    def fails(c: Case) -> bool:
+        return _same_failure(replay(c), failure)
+
+    choices = list(case.choices)
+    chunk = len(choices) // 2
+    while chunk >= 1:
+        i = 0
+        while i < len(choices):
+            trial = choices[:i] + choices[i + chunk :]
+            if trial and fails(replace(case, choices=trial)):
+                choices = trial
+            else:
+                i += chunk
+        chunk //= 2
+    for i in range(len(choices)):
+        for smaller in range(choices[i]):
+            trial = choices[:i] + [smaller] + choices[i + 1 :]
+            if fails(replace(case, choices=trial)):
+                choices = trial
+                break
+            if smaller >= 8:
+                break
+    shrunk = replace(case, choices=choices)
+    for seed in range(min(case.seed, 32)):
+        if fails(replace(shrunk, seed=seed)):
+            return replace(shrunk, seed=seed)
+    return shrunk
+
+
+def _fuzz_one(seed: int, deep_every: int = DEEP_EVERY) -> Case | None:
+    case = random_case(seed, deep_every=deep_every)
+    return shrink(case) if case is not None else None
+
+
+def fuzz(
+    games: int,
+    seed: int = 0,
+    executor: "Executor | None" = None,
+    deep_every: int = DEEP_EVERY,
+) -> list[Case]:
+    # shrunk failing cases among games random games
+    seeds = range(seed, seed + games)
+    deeps = repeat(deep_every, games)
+    results: Iterable[Case | None]
+    if executor is None:
+        results = map(_fuzz_one, seeds, deeps)
+    else:
+        results = executor.map(_fuzz_one, seeds, deeps, chunksize=16)
+    return [c for c in results if c is not None]
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    import argparse
+
+    from .workers import process_pool
+
+    parser = argparse.ArgumentParser(
+        prog="python -m monodeal.fuzz",
+        description="random games checked for engine invariants after every step",
+    )
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--deep-every",
+        type=int,
+        default=DEEP_EVERY,
+        help="steps between deep invariant checks, 1 for every step",
+    )
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    with process_pool(args.workers) as executor:
+        failures = fuzz(args.games, args.seed, executor, args.deep_every)
+    elapsed = time.perf_counter() - start
+    for case in failures:
+        print(f"{case!r}: {replay(case)!r}")
+    print(
+        f"{len(failures)} failures in {args.games} games"
+        f" ({args.games / elapsed:.0f} games/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
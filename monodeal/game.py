@@ -1,34 +1,59 @@
 import copy
+import os
 import random
 from collections import Counter, defaultdict, deque
-from itertools import chain, combinations
-from typing import Iterable, Mapping, MutableSequence, Sequence, Tuple
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager, redirect_stdout
+from itertools import chain
 
 from . import (
     Action,
     GameProto,
+    IllegalAction,
     PlayerProto,
     Variations,
 )
-from .actions import DealBreakerAction, SkipAction, generate_actions
+from .actions import (
+    DealBreakerAction,
+    DebtCollectorAction,
+    RentAction,
+    SkipAction,
+    generate_actions,
+)
 from .deck import (
     ALLOWED_BUILDINGS,
     DECK,
     Card,
+    DrawPile,
+    Hand,
     HotelCard,
     HouseCard,
-    JustSayNoCard,
     PropertyCard,
     PropertyColour,
     WildPropertyCard,
 )
-from .propertyset import PropertySet
+from .discard import choose_discards
+from .payment import PaymentSchedule
+from .propertyset import PropertySet, PropertySets
+from .rng import GameStreams
+from .unseen import UnseenCards
+from .wildcards import WildcardMove, wildcard_moves
+
+# a payment at least this large is worth a Just Say No
+STOP_AMOUNT = 5
 
 
 def cash_value(cards: Iterable[Card]) -> int:
     return sum(card.cash for card in cards)
 
 
+@contextmanager
+def quiet() -> Iterator[None]:
+    # discard the engine's progress output, for search and bulk simulation
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        yield
+
+
 class default_copydict(defaultdict[PropertySet, PropertySet]):
     def __missing__(self, key: PropertySet) -> PropertySet:
         value = copy.copy(key)
@@ -38,7 +63,7 @@ class default_copydict(defaultdict[PropertySet, PropertySet]):
 
 def property_cps_rv_without(
     pss: dict[Card, PropertySet], without: Sequence[Card]
-) -> Tuple[int, int]:
+) -> tuple[int, int]:
     # precondition: each card in without should be in pss
     sets: dict[Card, PropertySet] = {}
     if without == []:
@@ -62,32 +87,31 @@ def property_cps_rv_without(
     return complete_sets, rent_value
 
 
-def smallest_cash_remaining_without(
-    cards: Sequence[Card], without: Sequence[Card]
-) -> int:
-    remain = set(cards)
-    for w in without:
-        remain.remove(w)
-    if len(remain) == 0:
-        return 9999
-    return min(card.cash for card in remain)
-
-
-def card_powerset(card: Sequence[Card]) -> Iterable[Sequence[Card]]:
-    "Subsequences of the iterable from shortest to longest."
-    # powerset([1,2,3]) → () (1,) (2,) (3,) (1,2) (1,3) (2,3) (1,2,3)
-    s = list(card)
-    return chain.from_iterable(combinations(s, r) for r in range(len(s) + 1))
-
-
 class Player(PlayerProto):
     def __init__(self, name: str) -> None:
         self.name = name
-        self.hand: list[Card] = []
+        self._hand = Hand()
         self.cash: list[Card] = []
-        self.propertysets: dict[PropertyColour, PropertySet] = {}
+        self.propertysets = PropertySets()
         self.cards_to_ps: dict[Card, PropertySet] = {}
         self.unallocated_buildings: list[HouseCard | HotelCard] = []
+        # running totals of what the player could pay with: the bank, and
+        # property plus unallocated buildings. Kept by the methods below, so the
+        # cards must only change through them
+        self.bank_value = 0
+        self.property_value = 0
+        # how the player would pay each amount, until its cards change
+        self._payments: PaymentSchedule | None = None
+        # the wildcard moves to its best layout, until its property sets change
+        self._wildcard_moves: list[WildcardMove] | None = None
+
+    @property
+    def hand(self) -> Hand:
+        return self._hand
+
+    @hand.setter
+    def hand(self, cards: Iterable[Card]) -> None:
+        self._hand = Hand(cards)
 
     def deal_card(self, card: Card) -> None:
         print(f"Player {self.name} recieved {card}")
@@ -99,27 +123,35 @@ class Player(PlayerProto):
         print(f"{self} considering {len(actions)} actions")
         return actions[0]
 
-    def get_hand(self) -> MutableSequence[Card]:
+    def get_hand(self) -> Hand:
         return self.hand
 
-    def get_property_sets(self) -> Mapping[PropertyColour, PropertySet]:
+    def get_property_sets(self) -> PropertySets:
         return self.propertysets
 
     def has_won(self) -> bool:
-        complete_sets, _ = property_cps_rv_without(self.cards_to_ps, [])
-        return complete_sets >= 3
+        # three complete sets of different colours; a second set of one colour
+        # (with SEPARATE_PROPERTY_SETS) does not count again
+        return len({ps.colour for ps in self.propertysets.complete}) >= 3
 
     def get_discard(self) -> Card:
-        return self.hand.pop()
+        return self.get_discards(1)[0]
+
+    def get_discards(self, count: int) -> list[Card]:
+        # remove and return the cards that leave the most valuable hand
+        discards = choose_discards(self.hand, count, self.propertysets)
+        for card in discards:
+            self.hand.remove(card)
+        return discards
 
     def __repr__(self) -> str:
         return f"Player {self.name}"
 
-    def _get_or_create_ps(self, colour: PropertyColour) -> PropertySet:
-        ps = self.propertysets.get(colour, None)
+    def _get_or_create_ps(self, colour: PropertyColour, card: Card) -> PropertySet:
+        ps = self.propertysets.target(colour, card)
         if ps is None:
             ps = PropertySet(colour)
-            self.propertysets[colour] = ps
+            self.propertysets.add(ps)
         return ps
 
     def add_property(
@@ -127,153 +159,77 @@ class Player(PlayerProto):
         colour: PropertyColour,
         card: PropertyCard | WildPropertyCard | HouseCard | HotelCard,
     ) -> None:
-        ps = self._get_or_create_ps(colour)
+        ps = self._get_or_create_ps(colour, card)
         ps.add_property(card)
+        self.propertysets.update(ps)
         self.cards_to_ps[card] = ps
+        self.property_value += card.cash
+        self._payments = None
+        self._wildcard_moves = None
 
     def add_money(self, card: Card) -> None:
         self.cash.append(card)
+        self.bank_value += card.cash
+        self._payments = None
 
     def add_unallocated_building(self, card: HouseCard | HotelCard) -> None:
         self.unallocated_buildings.append(card)
+        self.property_value += card.cash
+        self._payments = None
 
     def remove(self, card: Card) -> None:
+        self._payments = None
         ps: PropertySet | None = self.cards_to_ps.get(card, None)
         if ps:
             ps.remove(card)
+            self.propertysets.update(ps)
             self.cards_to_ps.pop(card)
+            self.property_value -= card.cash
+            self._wildcard_moves = None
         elif isinstance(card, HouseCard) or isinstance(card, HotelCard):
             if card in self.unallocated_buildings:
                 self.unallocated_buildings.remove(card)
+                self.property_value -= card.cash
             else:
                 self.cash.remove(card)
+                self.bank_value -= card.cash
         else:
             self.cash.remove(card)
+            self.bank_value -= card.cash
+
+    def set_of(self, card: Card) -> PropertySet | None:
+        return self.cards_to_ps.get(card)
 
     def get_money(self) -> int:
-        return cash_value(self.cash)
+        return self.bank_value
 
     def get_property_as_cash(self) -> int:
-        return cash_value(self.cards_to_ps.keys()) + cash_value(
-            self.unallocated_buildings
-        )
+        return self.property_value
 
-    def choose_how_to_pay(self, amount: int) -> Sequence[Card]:
-        # split cards in to bands based on desirability.
-        #  {cash} {unallocated_buildings} {incomplete property} {complete property}
+    def payable_cards(self) -> list[Card]:
+        return [*self.cash, *self.unallocated_buildings, *self.cards_to_ps.keys()]
 
-        def filter_property(include_complete: bool) -> Sequence[Card]:
-            cards = []
-            for c, ps in self.cards_to_ps.items():
-                if isinstance(c, WildPropertyCard) and c.colours == PropertyColour.ALL:
-                    continue
-                if ps.is_complete() == include_complete:
-                    cards.append(c)
-            return cards
-
-        bands: list[Sequence[Card]] = [
-            self.cash,
-            self.unallocated_buildings,
-            filter_property(include_complete=False),
-            filter_property(include_complete=True),
-        ]
-        print(
-            f"{self} choose_how_to_pay amount={amount} bands={list(map(cash_value, bands))}"
-        )
-
-        # go as deep through the bands as required assuming lower bands completely spent.
-        # on the way back, powerset the deepest band first, and carry any overpayment up to
-        # to the previous.
-        needed_bands: list[tuple[int, Sequence[Card]]] = []
-        still_need = amount
-        for band in bands:
-            if still_need < 0:
-                break
-            needed_bands.append((min(still_need, cash_value(band)), band))
-            still_need -= cash_value(band)
-
-        # now work from most desired out, powersetting for any slack
-        needed_bands.reverse()
-        certain_cards: list[Card] = []
-        slack = 0
-        for amt, band in needed_bands:
-            cs = self._choose_how_to_pay(amt - slack, band)
-            certain_cards = [*cs, *certain_cards]
-            slack = cash_value(cs) - (amt - slack)
-            assert slack >= 0
-
-        return certain_cards
-
-    def _choose_how_to_pay(self, amount: int, cards: Sequence[Card]) -> Sequence[Card]:
-        # we are handing over everything, shortcut the eval
-        if amount >= cash_value(cards):
-            return cards
-
-        # iterate over the powerset evaluating a metric for each
-        # solution with an overpay >= 0
-        #
-        # rank options by minimising (cps,rv,sr,overpay)
-        #   cps - reduction in complete property sets
-        #   rv  - reduction in rental value
-        #   overpay - cash sent above to_pay
-        #   sc  - smallest cash card
-        # e.g. a spend of [1,3,10] [Green->[G,G,G,H,H], Red->[R]]
-        #  for a target to_pay=6 could be [3,R] at (0,2,0)
-        #        target to_pay=20 could be [10,3,1,H,H,R] (0,7,1)
-        #        target to_pay=22 could be [10,3,1,H,H,R,G] (1,9,0)
-        #
-        # order of cards does not matter
-
-        # baseline metrics, with all player's cards
-        best: Sequence[Card] = []
-        sc_orig = smallest_cash_remaining_without(cards, [])
-        cps_orig, rv_orig = property_cps_rv_without(self.cards_to_ps, [])
-
-        least_score = (9999, 0, 0, 0)
-        valid_minimal_sets: list[set[Card]] = []
-
-        for cs in card_powerset(cards):
-            cv = cash_value(cs)
-            overpay = cv - amount
-            if overpay < 0:
-                continue
-
-            # if a subset of this combination was viable, this set is strictly worse, skip eval
-            if any(ms.issubset(cs) for ms in valid_minimal_sets):
-                continue
-            valid_minimal_sets.append(set(cs))
-
-            # print(f"{self} checking {cs} with cv={cv} overpayment={overpay}")
-            cs_props = [c for c in cs if c in self.cards_to_ps]
-            cs_cash = [c for c in cs if c in self.cash]
-
-            # calculate cps, rv, sc
-            cps = cps_orig
-            rv = rv_orig
-            sc = sc_orig
-            if cs_props:
-                cps, rv = property_cps_rv_without(self.cards_to_ps, cs_props)
-            if cs_cash:
-                sc = smallest_cash_remaining_without(self.cash, cs_cash)
-
-            score = (cps_orig - cps, rv_orig - rv, overpay, sc - sc_orig)
-            print(
-                f"{self} scored {cs} with cv={cv} overpayment={overpay} as {score} vs. least {least_score}"
+    def payment_schedule(self) -> PaymentSchedule:
+        if self._payments is None:
+            self._payments = PaymentSchedule(
+                self.cash, self.unallocated_buildings, self.propertysets
             )
+        return self._payments
 
-            if score < least_score:
-                print(f" ** improves score {score} < {least_score}")
+    def wildcard_moves(self) -> list[WildcardMove]:
+        if self._wildcard_moves is None:
+            self._wildcard_moves = wildcard_moves(self.propertysets)
+        return self._wildcard_moves
 
-                # OK candidate
-                best = cs
-                least_score = score
-                # exit early if optimal
-                if overpay == 0 and sc == sc_orig and rv == rv_orig and cps == cps_orig:
-                    break
+    def choose_how_to_pay(self, amount: int) -> Sequence[Card]:
+        # from the bank, then unallocated buildings, incomplete and complete
+        # property, losing as few sets and as little rent as it can, see payment
+        payment = self.payment_schedule()[amount]
         print(
-            f"{self} choose_how_to_pay() solver for {amount} chose {best} with ps,rv,overpay,sr={least_score}"
+            f"{self} choose_how_to_pay amount={amount} chose {list(payment.cards)} "
+            f"losing {payment.complete_lost} sets and {payment.rent_lost} rent"
         )
-        return list(best)
+        return list(payment.cards)
 
     def pick_colour_for_recieved_wildcard(
         self, card: WildPropertyCard
@@ -287,7 +243,7 @@ class Player(PlayerProto):
         for pc in card.colours:
             if best is None:
                 best = pc
-            ps = self._get_or_create_ps(pc)
+            ps = self._get_or_create_ps(pc, card)
             rv_base = ps.rent_value()
             rv_new = copy.copy(ps).add_property(card).rent_value()
             print(
@@ -310,7 +266,7 @@ class Player(PlayerProto):
         best: PropertyColour | None = None
         rv_incr = 0
         for pc in ALLOWED_BUILDINGS:
-            ps = self._get_or_create_ps(pc)
+            ps = self._get_or_create_ps(pc, card)
             if (is_house and ps.can_build_house()) or (
                 not is_house and ps.can_build_hotel()
             ):
@@ -325,16 +281,14 @@ class Player(PlayerProto):
         print(f"{self} chose {card} as {best} with rv_incr {rv_incr}")
         return best
 
-    def add_property_set(self, propertyset: PropertySet) -> None:
+    def add_property_set(self, propertyset: PropertySet, merge: bool = True) -> None:
         # we might already have a propertyset for this colour?
         colour = propertyset.get_colour()
 
         existing_ps = self.propertysets.get(colour, None)
-        if existing_ps is None:
-            print("No existing ps")
-            self.propertysets[colour] = propertyset
-            for card in propertyset:
-                self.cards_to_ps[card] = propertyset
+        if existing_ps is None or not merge:
+            print("Keeping ps separate" if existing_ps else "No existing ps")
+            self.keep_property_set(propertyset)
             return
 
         # merge propertyset properties first, then wildcards
@@ -365,154 +319,387 @@ class Player(PlayerProto):
                 else:
                     self.add_money(propertyset.hotel)
 
+    def keep_property_set(self, propertyset: PropertySet) -> None:
+        # add the set as it is, alongside any others of its colour
+        self.propertysets.add(propertyset)
+        for card in propertyset:
+            self.cards_to_ps[card] = propertyset
+        self.property_value += cash_value(propertyset)
+        self._payments = None
+        self._wildcard_moves = None
+
     def remove_property_set(self, propertyset: PropertySet) -> None:
-        cards_to_remove: set[Card] = set()
-        for card, ps in self.cards_to_ps.items():
-            if ps == propertyset:
-                cards_to_remove.add(card)
-        for c in cards_to_remove:
-            self.cards_to_ps.pop(c)
-        self.propertysets.pop(propertyset.get_colour())
+        for card in propertyset:
+            self.cards_to_ps.pop(card)
+        self.propertysets.remove(propertyset)
+        self.property_value -= cash_value(propertyset)
+        self._payments = None
+        self._wildcard_moves = None
+
+    def _worth_a_stop(self, action: Action) -> bool:
+        # a Just Say No is spent on losing or winning a set or a large payment
+        if isinstance(action, RentAction):
+            return action.rent() >= STOP_AMOUNT
+        return isinstance(action, (DealBreakerAction, DebtCollectorAction))
 
     def should_stop_action(self, action: "Action") -> bool:
-        if isinstance(action, DealBreakerAction):
-            return True
+        return self._worth_a_stop(action)
 
-        return False
+    def should_counter_stop(self, action: "Action") -> bool:
+        return self._worth_a_stop(action)
+
+
+def deck_out_score(p: Player) -> tuple[int, int, int]:
+    # ranks players when the game ends on an empty draw pile
+    complete_sets, rent_value = property_cps_rv_without(p.cards_to_ps, [])
+    return complete_sets, rent_value, p.get_money() + p.get_property_as_cash()
 
 
 class Game(GameProto):
     def __init__(
         self,
         players: list[Player] = [],
-        random: random.Random = random.Random(),
+        random: random.Random | None = None,
         variations: Variations = Variations(0),
+        deck: Sequence[Card] | None = None,
+        seed: int | None = None,
+        index: int = 0,
     ):
+        # Randomness comes from the game's own streams: derived from (seed, index)
+        # so the game can be replayed alone, else driven by the given generator,
+        # else unseeded.
+        if random is not None:
+            self.streams = GameStreams.from_random(random)
+        elif seed is not None:
+            self.streams = GameStreams.for_game(seed, index)
+        else:
+            self.streams = GameStreams.fresh()
+        self.random = self.streams.shuffle
+        self.decisions = self.streams.decisions
         self.players = players
-        self.draw: deque[Card] = deque()
+        self.draw = DrawPile()
         self.discarded: deque[Card] = deque()
-        self.random = random
         self.variations = variations
+        # preset draw order, e.g. to replay a deal. Shuffled from DECK otherwise
+        self.deck = deck
+        self.current = 0
+        self.actions_left = 0
+        # completed turns, a measure of game length
+        self.turns = 0
+        self.decked_out = False
+        # what each seat has not seen, in seat order
+        self.unseen = [UnseenCards(DECK) for _ in players]
+        # during step(), the acting player and the cards it held that are not
+        # yet revealed
+        self.held: tuple[Player, list[Card]] | None = None
 
     def deal_to(self, p: PlayerProto) -> None:
         if len(self.draw) == 0:
+            if Variations.DECK_OUT_ENDS_GAME in self.variations:
+                # VARIATION: no reshuffle, the game is scored at the end of step()
+                print("draw pile exhausted")
+                self.decked_out = True
+                return
             print(f"reshuffling {len(self.discarded)} discarded cards")
-            self.draw.extend(self.discarded)
+            # e.g. a Pass Go card, discarded before its draws
+            self.reveal_played()
+            self.draw.refill(self.discarded, self.random)
+            for unseen in self.unseen:
+                for card in self.discarded:
+                    unseen.unsee(card)
             self.discarded.clear()
-            self.random.shuffle(self.draw)
-        p.deal_card(self.draw.popleft())
+        card = self.draw.deal()
+        self.unseen_cards(p).see(card)
+        p.deal_card(card)
 
-    def _play(self) -> PlayerProto:
+    def start(self) -> None:
         # initial setup
-        self.discarded.extend(DECK)
+        if self.deck is None:
+            self.draw.refill(DECK, self.random)
+        else:
+            assert len(self.deck) == len(DECK)
+            self.draw.extend(self.deck)
         for i in range(5):
             for p in self.players:
                 self.deal_to(p)
+        self.current = 0
+        self._begin_turn()
+
+    def current_player(self) -> Player:
+        return self.players[self.current]
+
+    def _begin_turn(self) -> None:
+        p = self.current_player()
+        print(f"{p} go")
+        deal = 5 if len(p.get_hand()) == 0 else 2
+        for i in range(deal):
+            self.deal_to(p)
+        print(f"{p} has hand {p.hand}")
+        print(f"{p} has property {p.propertysets}")
+        self.actions_left = 3
+
+    def _end_turn(self) -> None:
+        p = self.current_player()
+        if len(p.hand) > 7:
+            discards = p.get_discards(len(p.hand) - 7)
+            for d in discards:
+                print(f"{p} discarded {d}")
+                self.discarded.append(d)
+            self.reveal(p, discards)
+
+        self.audit()
+        self.turns += 1
+        self.current = (self.current + 1) % len(self.players)
+        self._begin_turn()
+
+    def check_action(self, a: Action) -> None:
+        # raise IllegalAction if the player to move can not play this action now
+        if a.player is not self.current_player():
+            raise IllegalAction(f"it is not {a.player}'s turn")
+        if a.action_count() > self.actions_left:
+            raise IllegalAction(f"{a} needs more than {self.actions_left} actions")
+        a.validate(self)
+
+    def step(self, a: Action) -> Player | None:
+        # apply one action for the player to move, returning the winner if any.
+        # Turns advance automatically once the player's actions are used up.
+        # Illegal actions are rejected before anything changes.
+        self.check_action(a)
+        p = self.current_player()
+        self.actions_left = self.actions_left - a.action_count()
+        self.held = (p, list(p.hand))
+        # actions apply themselves to game state
+        print(f"{p} does action {a}")
+        a.apply(self)
+        self.reveal_played()
+        self.held = None
+
+        self.audit()
+
+        if p.has_won():
+            print(f"{p} has won!")
+            return p
+
+        if self.actions_left <= 0:
+            self._end_turn()
+        if self.decked_out:
+            winner = max(self.players, key=deck_out_score)
+            print(f"{winner} wins on deck out")
+            return winner
+        return None
 
-        # game loop
+    def _play(self) -> PlayerProto:
+        self.start()
         while True:
-            for p in self.players:
-                print(f"{p} go")
-                deal = 5 if len(p.get_hand()) == 0 else 2
-                for i in range(deal):
-                    self.deal_to(p)
-                print(f"{p} has hand {p.hand}")
-                print(f"{p} has property {p.propertysets.values()}")
-
-                actions = 3
-                while actions > 0:
-                    a = p.get_action(self, actions)
-                    actions = actions - a.action_count()
-                    # actions apply themselves to game state
-                    print(f"{p} does action {a}")
-                    a.apply(self)
-
-                    self.audit()
-
-                    if p.has_won():
-                        print(f"{p} has won!")
-                        return p
-
-                while len(p.hand) > 7:
-                    d = p.get_discard()
-                    print(f"{p} discarded {d}")
-                    self.discarded.append(d)
-
-                self.audit()
+            p = self.current_player()
+            winner = self.step(p.get_action(self, self.actions_left))
+            if winner is not None:
+                return winner
 
     def play(self) -> PlayerProto:
         try:
             return self._play()
         except:
-            print("==== CRASHED - state was ====")
-            print(f"draw: {self.draw}")
-            print(f"discarded: {self.discarded}")
-            for p in self.players:
-                print(p)
-                print(f"    hand: {p.hand}")
-                print("    property:")
-                for v in p.propertysets.values():
-                    print(f"      {v}")
-                print(f"    cash: {p.cash}")
+            self.dump_state()
             raise
 
+    def dump_state(self) -> None:
+        # The position in monodeal.notation's format, which parse_position loads
+        # back. Also written to a file when MONODEAL_CRASH_DIR is set, as crashes
+        # in bulk simulation happen under quiet().
+        from .notation import format_position  # notation imports this module
+
+        try:
+            position = format_position(self)
+        # the dump runs while handling the crash, so must not raise over it,
+        # e.g. for a player name the notation can not hold
+        except Exception:  # noqa: BLE001
+            position = self._describe()
+        print("==== CRASHED - state was ====")
+        print(position)
+        crash_dir = os.environ.get("MONODEAL_CRASH_DIR")
+        if crash_dir:
+            path = os.path.join(crash_dir, f"crash-{os.getpid()}-{id(self)}.txt")
+            with open(path, "w") as f:
+                f.write(position + "\n")
+
+    def _describe(self) -> str:
+        lines = [f"draw: {self.draw}", f"discarded: {self.discarded}"]
+        for p in self.players:
+            lines.append(str(p))
+            lines.append(f"    hand: {p.hand}")
+            lines.append("    property:")
+            lines.extend(f"      {v}" for v in p.propertysets.all())
+            lines.append(f"    cash: {p.cash}")
+        return "\n".join(lines)
+
     def get_opposition(self, player: PlayerProto) -> Sequence[Player]:
         return [p for p in self.players if p != player]
 
+    def is_opponent(self, player: PlayerProto, target: PlayerProto) -> bool:
+        # a scan of at most five seats
+        return target is not player and any(p is target for p in self.players)
+
     def player_owes_money(
         self, from_player: PlayerProto, to_player: PlayerProto, amount: int
     ) -> None:
-        cards: Sequence[Card] = from_player.choose_how_to_pay(amount)
-        amount_sent = 0
+        self.settle_debts(to_player, [(from_player, amount)])
 
-        for c in cards:
-            from_player.remove(c)
-            amount_sent += c.cash
-
-        if amount_sent < amount:
-            # check player has nothing left if underpaying
-            assert from_player.get_money() == 0, "Player underpaid but has cash"
-            assert from_player.get_property_as_cash() == 0, (
-                "Player underpaid but has assets"
-            )
+    def settle_debts(
+        self, to_player: PlayerProto, debts: Sequence[tuple[PlayerProto, int]]
+    ) -> None:
+        # Collect every payment owed to one player by an action, e.g. a birthday
+        # or rent from all opponents. Each payer chooses from their own cards only,
+        # so all choices are made before any card moves, then the receiver places
+        # everything it was sent in a single pass.
+        payments = [(p, amount, p.choose_how_to_pay(amount)) for p, amount in debts]
+        received: list[Card] = []
+        for from_player, amount, cards in payments:
+            amount_sent = 0
+            for c in cards:
+                from_player.remove(c)
+                amount_sent += c.cash
+            received.extend(cards)
+
+            self.forfeit_buildings(from_player)
+
+            if amount_sent < amount:
+                # check player has nothing left if underpaying
+                assert from_player.get_money() == 0, "Player underpaid but has cash"
+                assert from_player.get_property_as_cash() == 0, (
+                    "Player underpaid but has assets"
+                )
+        self.receive_cards(to_player, received)
 
-        # TODO: to optimise the layout of recieved payment, report in order:
-        # 1) PropertyCard, 2) WildPropertyCard, 3) HouseCard, 4) HotelCard
+    def receive_cards(self, to_player: PlayerProto, cards: Sequence[Card]) -> None:
+        # place received cards in the order that lays them out best: properties,
+        # then wildcards, arranged together once, then houses before hotels
         for c in cards:
             if isinstance(c, PropertyCard):
                 to_player.add_property(c.colour, c)
-            elif isinstance(c, WildPropertyCard):
-                colour = to_player.pick_colour_for_recieved_wildcard(c)
-                to_player.add_property(colour, c)
-            elif isinstance(c, HouseCard) or isinstance(c, HotelCard):
-                optional_colour = to_player.pick_colour_for_recieved_building(c)
-                if optional_colour is not None:
-                    to_player.add_property(optional_colour, c)
-                else:
-                    # VARIATION: where to store unallocated house/hotel?
-                    # storing in unallocated will trigger
-                    # calls to player.pick_colour_for_recieved_building() later
-                    if Variations.FORCE_UNPLACED_PROPERTY_AS_CASH in self.variations:
-                        print(f"cash: unplaced property becomes cash {c}")
-                        to_player.add_money(c)
-                    else:
-                        to_player.add_unallocated_building(c)
-                        raise ValueError("store unallocated house/hotel?!")
+
+        wilds = [c for c in cards if isinstance(c, WildPropertyCard)]
+        if wilds:
+            for w in wilds:
+                to_player.add_property(next(iter(w.colours)), w)
+            for w, colour in to_player.wildcard_moves():
+                to_player.remove(w)
+                to_player.add_property(colour, w)
+
+        buildings: list[HouseCard | HotelCard] = [
+            c for c in cards if isinstance(c, HouseCard)
+        ]
+        buildings += [c for c in cards if isinstance(c, HotelCard)]
+        for b in buildings:
+            optional_colour = to_player.pick_colour_for_recieved_building(b)
+            if optional_colour is not None:
+                to_player.add_property(optional_colour, b)
             else:
+                # VARIATION: where to store unallocated house/hotel?
+                # storing in unallocated will trigger
+                # calls to player.pick_colour_for_recieved_building() later
+                if Variations.FORCE_UNPLACED_PROPERTY_AS_CASH in self.variations:
+                    print(f"cash: unplaced property becomes cash {b}")
+                    to_player.add_money(b)
+                else:
+                    to_player.add_unallocated_building(b)
+                    raise ValueError("store unallocated house/hotel?!")
+
+        for c in cards:
+            if not isinstance(
+                c, (PropertyCard, WildPropertyCard, HouseCard, HotelCard)
+            ):
                 to_player.add_money(c)
 
+    def forfeit_buildings(self, p: PlayerProto) -> None:
+        # VARIATION: buildings on a set that is no longer complete
+        if not self.variations & (
+            Variations.FORFEIT_BUILDINGS | Variations.FORFEIT_BUILDINGS_TO_BANK
+        ):
+            return
+        for ps in list(p.get_property_sets().incomplete):
+            for b in (ps.hotel, ps.house):
+                if b is None:
+                    continue
+                print(f"{p} forfeits {b}")
+                p.remove(b)
+                if Variations.FORFEIT_BUILDINGS_TO_BANK in self.variations:
+                    p.add_money(b)
+                else:
+                    self.discard(b)
+
     def discard(self, card: Card) -> None:
         self.discarded.append(card)
 
     def check_stop_action(self, p: PlayerProto, a: Action) -> bool:
-        stop_cards = [card for card in p.get_hand() if isinstance(card, JustSayNoCard)]
-        if len(stop_cards) > 0:
-            card = stop_cards[0]
-            if p.should_stop_action(a):
-                p.get_hand().remove(card)
-                self.discard(card)
-                return True
-        return False
+        # Just Say No chain for an action against p: p may stop it, then the
+        # acting player may stop the stop, and so on until one side passes or
+        # runs out. Returns True if the action against p is cancelled.
+        stopped = False
+        side = p
+        while side.get_hand().count_of("JustSayNoCard"):
+            if side is p:
+                if not p.should_stop_action(a):
+                    break
+            elif not side.should_counter_stop(a):
+                break
+            card = side.get_hand().first_of("JustSayNoCard")
+            assert card is not None
+            side.get_hand().remove(card)
+            self.discard(card)
+            if side is p:
+                # the acting player's cards are revealed by step()
+                self.reveal(side, [card])
+            print(f"{side} plays {card} {'against' if side is p else 'back at'} {a}")
+            stopped = not stopped
+            side = a.player if side is p else p
+        return stopped
+
+    def rank_targets(
+        self, player: PlayerProto, amount: int
+    ) -> list[tuple[PlayerProto, int]]:
+        # Opponents by what charging each of them `amount` should collect, best
+        # first. A target pays what it can, unless it has more Just Say No cards
+        # than the player can answer and the charge is worth stopping.
+        stops = player.get_hand().count_of("JustSayNoCard")
+        ranked: list[tuple[PlayerProto, int]] = []
+        for t in self.get_opposition(player):
+            if amount >= STOP_AMOUNT and t.get_hand().count_of("JustSayNoCard") > stops:
+                ranked.append((t, 0))
+            else:
+                ranked.append(
+                    (t, min(amount, t.get_money() + t.get_property_as_cash()))
+                )
+        ranked.sort(key=lambda tv: -tv[1])
+        return ranked
+
+    def reveal(self, p: PlayerProto, cards: Sequence[Card]) -> None:
+        # cards that left p's hand for the table or the discard pile
+        for q, unseen in zip(self.players, self.unseen):
+            if q is not p:
+                for card in cards:
+                    unseen.see(card)
+
+    def reveal_played(self) -> None:
+        # cards the acting player has played from its hand so far are public
+        if self.held is not None:
+            p, held = self.held
+            self.reveal(p, [c for c in held if c not in p.hand])
+            self.held = (p, [c for c in held if c in p.hand])
+
+    def unseen_cards(self, player: PlayerProto) -> UnseenCards:
+        for p, unseen in zip(self.players, self.unseen):
+            if p is player:
+                return unseen
+        raise ValueError(f"{player} is not playing")
+
+    def recount_unseen(self) -> None:
+        # rebuild every seat's tracker from the zones, for positions set up
+        # without dealing, e.g. parsed ones
+        self.unseen = [
+            UnseenCards(chain(self.draw, *(q.hand for q in self.players if q is not p)))
+            for p in self.players
+        ]
 
     def audit(self) -> None:
         cards = len(self.discarded) + len(self.draw)
@@ -527,7 +714,11 @@ class ConsolePlayer(Player):
 
 
 class RandomPlayer(Player):
-    pass
+    # picks uniformly from the legal actions, using the game's decision stream
+    def get_action(self, game: GameProto, actions_left: int) -> Action:
+        actions = generate_actions(game, self, actions_left)
+        actions.append(SkipAction(self))
+        return game.decisions.choice(actions)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,160 @@
+import asyncio
+import json
+from collections.abc import Awaitable, Callable, Sequence
+from functools import partial
+from typing import Any, TypeVar
+
+from . import Action, IllegalAction
+from .actions import SkipAction, generate_actions
+from .deck import Card
+from .game import Game, Player
+from .protocol import (
+    action_request,
+    decode_action_choice,
+    decode_payment_choice,
+    payment_request,
+)
+
+T = TypeVar("T")
+
+
+class AsyncPlayer(Player):
+    # A Player whose turn and payment decisions are awaited by the host. Choices
+    # made inside Action.apply (wildcard colours, buildings, stopping an action)
+    # stay synchronous and use the built-in Player heuristics, so the host can
+    # reuse Action.apply as-is.
+    def __init__(self, name: str, timeout: float | None = None) -> None:
+        super().__init__(name)
+        self.timeout = timeout
+        self.prepared_payments: dict[int, Sequence[Card]] = {}
+
+    async def decide_action(self, game: Game, actions_left: int) -> Action:
+        return self.get_action(game, actions_left)
+
+    async def decide_payment(self, amount: int) -> Sequence[Card]:
+        return Player.choose_how_to_pay(self, amount)
+
+    def choose_how_to_pay(self, amount: int) -> Sequence[Card]:
+        # payments are collected by the host before the action is applied
+        prepared = self.prepared_payments.pop(amount, None)
+        if prepared is not None:
+            return prepared
+        return super().choose_how_to_pay(amount)
+
+
+async def _decide(
+    p: AsyncPlayer, decision: Awaitable[T], fallback: Callable[[], T]
+) -> T:
+    if p.timeout is None:
+        return await decision
+    try:
+        return await asyncio.wait_for(decision, p.timeout)
+    except TimeoutError:
+        print(f"{p} timed out after {p.timeout}s, using fallback")
+        return fallback()
+
+
+async def _prepare_payment(payer: AsyncPlayer, amount: int) -> None:
+    payer.prepared_payments[amount] = await _decide(
+        payer,
+        payer.decide_payment(amount),
+        lambda: Player.choose_how_to_pay(payer, amount),
+    )
+
+
+async def _prepare_payments(game: Game, action: Action) -> None:
+    # every payer only chooses from their own cards, so all are asked at once
+    await asyncio.gather(
+        *(
+            _prepare_payment(payer, amount)
+            for payer, amount in action.debts(game)
+            if isinstance(payer, AsyncPlayer)
+        )
+    )
+
+
+async def play_async(game: Game) -> Player:
+    try:
+        game.start()
+        while True:
+            p = game.current_player()
+            actions_left = game.actions_left
+            if isinstance(p, AsyncPlayer):
+                action = await _decide(
+                    p,
+                    p.decide_action(game, actions_left),
+                    partial(p.get_action, game, actions_left),
+                )
+                try:
+                    game.check_action(action)
+                except IllegalAction as e:
+                    print(f"{p} chose an illegal action ({e}), using fallback")
+                    action = p.get_action(game, actions_left)
+                await _prepare_payments(game, action)
+            else:
+                action = p.get_action(game, actions_left)
+
+            winner = game.step(action)
+            for op in game.players:
+                if isinstance(op, AsyncPlayer):
+                    op.prepared_payments.clear()
+            if winner is not None:
+                return winner
+            # let the other tables on this loop make progress
+            await asyncio.sleep(0)
+    except:
+        game.dump_state()
+        raise
+
+
+async def run_tables(games: Sequence[Game]) -> list[Player]:
+    return await asyncio.gather(*(play_async(g) for g in games))
+
+
+class StreamPlayer(AsyncPlayer):
+    # Player whose decisions are made at the other end of a line-delimited JSON
+    # stream (see monodeal.protocol), e.g. a local socket or pipe. Replies for a
+    # request that already timed out are skipped by sequence number.
+    def __init__(
+        self,
+        name: str,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        timeout: float | None = None,
+    ) -> None:
+        super().__init__(name, timeout)
+        self.reader = reader
+        self.writer = writer
+        self.seq = 0
+
+    async def _ask(self, msg: dict[str, Any]) -> Any:
+        self.seq += 1
+        msg["seq"] = self.seq
+        self.writer.write((json.dumps(msg) + "\n").encode())
+        await self.writer.drain()
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                raise ConnectionError(f"{self} stream closed")
+            reply = json.loads(line)
+            if reply.get("seq") == self.seq:
+                return reply["choice"]
+
+    async def decide_action(self, game: Game, actions_left: int) -> Action:
+        actions = generate_actions(game, self, actions_left)
+        actions.append(SkipAction(self))
+        choice = await self._ask(action_request(game, self, actions_left, actions))
+        action = decode_action_choice(choice, actions)
+        if action is None:
+            print(f"{self} sent invalid action choice {choice!r}")
+            return self.get_action(game, actions_left)
+        return action
+
+    async def decide_payment(self, amount: int) -> Sequence[Card]:
+        cards = self.payable_cards()
+        choice = await self._ask(payment_request(self, amount, cards))
+        chosen = decode_payment_choice(choice, amount, cards)
+        if chosen is None:
+            print(f"{self} sent invalid payment {choice!r} for {amount}")
+            return Player.choose_how_to_pay(self, amount)
+        return chosen
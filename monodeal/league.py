@@ -0,0 +1,228 @@
+import math
+import random
+import sys
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import TYPE_CHECKING, TextIO
+
+from . import Variations
+from .compare import Strategy, deck_order
+from .game import Game, Player, RandomPlayer, quiet
+from .sweep import load_strategy
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+
+# (strategy names in seat order, seed, variations)
+Match = tuple[tuple[str, ...], int, Variations]
+
+
+def play_match(match: Match, strategies: Mapping[str, Strategy]) -> list[str]:
+    # one deal played once per seat rotation, so every strategy takes every seat
+    # on the same cards. Returns the winning strategy of each game
+    names, seed, variations = match
+    deck = deck_order(seed)
+    winners: list[str] = []
+    for r in range(len(names)):
+        seats = names[r:] + names[:r]
+        players = [strategies[n](f"{n}@{i}") for i, n in enumerate(seats)]
+        g = Game(players, random=random.Random(seed), variations=variations, deck=deck)
+        with quiet():
+            winner = g.play()
+        winners.append(next(n for n, p in zip(seats, players) if p is winner))
+    return winners
+
+
+@dataclass
+class Rating:
+    rating: float = 1500.0
+    games: int = 0
+    wins: int = 0
+
+    @property
+    def uncertainty(self) -> float:
+        # shrinks as games are played, 1 before the first
+        return 1 / math.sqrt(1 + self.games)
+
+
+def expected(a: float, b: float) -> float:
+    # Elo's chance that a rating of a beats a rating of b
+    return 1 / (1 + 10 ** ((b - a) / 400))
+
+
+@dataclass
+class League:
+    # Elo ratings over games of 2 to 5 seats. A game with one winner counts as
+    # the winner beating each other seat, with K split between those pairs, and
+    # is applied as soon as its result arrives, so nothing is refitted.
+    names: list[str]
+    k: float = 32.0
+    ratings: dict[str, Rating] = field(default_factory=dict)
+    # games picked but not yet recorded, by strategy and by pair of strategies,
+    # so the matches picked for one batch spread out rather than repeat
+    pending: Counter[str] = field(default_factory=Counter)
+    pending_pairs: Counter[frozenset[str]] = field(default_factory=Counter)
+
+    def __post_init__(self) -> None:
+        for n in self.names:
+            self.ratings.setdefault(n, Rating())
+
+    def record(self, seats: Sequence[str], winner: str) -> None:
+        k = self.k / (len(seats) - 1)
+        w = self.ratings[winner]
+        for n in seats:
+            r = self.ratings[n]
+            r.games += 1
+            if self.pending[n]:
+                self.pending[n] -= 1
+            if n == winner:
+                continue
+            delta = k * (1 - expected(w.rating, r.rating))
+            w.rating += delta
+            r.rating -= delta
+        w.wins += 1
+        for pair in map(frozenset, combinations(seats, 2)):
+            if self.pending_pairs[pair]:
+                self.pending_pairs[pair] -= 1
+
+    def informativeness(self, a: str, b: str) -> float:
+        # close ratings give the least predictable results, and uncertain ones
+        # move the most
+        ra, rb = self.ratings[a], self.ratings[b]
+        p = expected(ra.rating, rb.rating)
+        return p * (1 - p) * (ra.uncertainty + rb.uncertainty)
+
+    def pick(self, size: int, rng: random.Random) -> tuple[str, ...]:
+        # The least played strategy, and the opponents it learns most against,
+        # counting games already picked as played and a pair already picked as
+        # less informative. The match's games are then pending until recorded.
+        size = min(size, len(self.names))
+        anchor = min(
+            self.names,
+            key=lambda n: (self.ratings[n].games + self.pending[n], rng.random()),
+        )
+
+        def value(n: str) -> float:
+            repeats = self.pending_pairs[frozenset((anchor, n))]
+            return self.informativeness(anchor, n) / (1 + repeats)
+
+        others = sorted(
+            (n for n in self.names if n != anchor),
+            key=lambda n: (-value(n), rng.random()),
+        )
+        seats = [anchor, *others[: size - 1]]
+        rng.shuffle(seats)
+        # one game per seat rotation
+        for n in seats:
+            self.pending[n] += size
+        for a, b in combinations(seats, 2):
+            self.pending_pairs[frozenset((a, b))] += size
+        return tuple(seats)
+
+    def leaderboard(self) -> list[tuple[str, Rating]]:
+        return sorted(self.ratings.items(), key=lambda nr: -nr[1].rating)
+
+
+def run_league(
+    league: League,
+    strategies: Mapping[str, Strategy],
+    matches: int,
+    sizes: Sequence[int] = (2,),
+    seed: int = 0,
+    batch: int = 16,
+    variations: Variations = Variations.FORCE_UNPLACED_PROPERTY_AS_CASH,
+    executor: "Executor | None" = None,
+) -> None:
+    # Plays matches in batches, each picked from the ratings as they stand, with
+    # table sizes taken in turn from sizes. Within a batch results are recorded
+    # in the order matches finish on the executor, or one by one on this process
+    # if none is given.
+    rng = random.Random(seed)
+    played = 0
+    while played < matches:
+        todo: list[Match] = []
+        for _ in range(min(batch, matches - played)):
+            size = sizes[played % len(sizes)]
+            todo.append((league.pick(size, rng), seed + played, variations))
+            played += 1
+        if executor is None:
+            for m in todo:
+                for winner in play_match(m, strategies):
+                    league.record(m[0], winner)
+            continue
+        from concurrent.futures import as_completed
+
+        futures: dict[Future[list[str]], Match] = {
+            executor.submit(play_match, m, strategies): m for m in todo
+        }
+        for f in as_completed(futures):
+            for winner in f.result():
+                league.record(futures[f][0], winner)
+
+
+def format_leaderboard(league: League) -> str:
+    lines = [f"{'strategy':20} {'rating':>7} {'games':>6} {'win_rate':>8}"]
+    for name, r in league.leaderboard():
+        win_rate = r.wins / r.games if r.games else 0.0
+        lines.append(f"{name:20} {r.rating:7.1f} {r.games:6d} {win_rate:8.3f}")
+    return "\n".join(lines)
+
+
+def write_leaderboard(league: League, out: TextIO) -> None:
+    out.write(format_leaderboard(league) + "\n")
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    import argparse
+
+    from .workers import process_pool
+
+    parser = argparse.ArgumentParser(
+        prog="python -m monodeal.league",
+        description="Elo ratings for strategies from seat-rotated games",
+    )
+    parser.add_argument(
+        "--strategy",
+        action="append",
+        default=[],
+        help="name=module:callable taking a player name, may be repeated",
+    )
+    parser.add_argument("--matches", type=int, default=100)
+    parser.add_argument(
+        "--players",
+        type=int,
+        action="append",
+        choices=range(2, 6),
+        help="players per game, may be repeated to mix table sizes",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", help="also write the leaderboard to this file")
+    args = parser.parse_args(argv)
+
+    strategies = dict(map(load_strategy, args.strategy)) or {
+        "heuristic": Player,
+        "random": RandomPlayer,
+    }
+    if len(strategies) < 2:
+        parser.error("a league needs at least two strategies")
+    league = League(list(strategies))
+    with process_pool(args.workers) as executor:
+        run_league(
+            league,
+            strategies,
+            args.matches,
+            sizes=args.players or [2],
+            seed=args.seed,
+            executor=executor,
+        )
+    write_leaderboard(league, sys.stdout)
+    if args.out:
+        with open(args.out, "w") as f:
+            write_leaderboard(league, f)
+
+
+if __name__ == "__main__":
+    main()
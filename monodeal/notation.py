@@ -0,0 +1,217 @@
+from collections.abc import Sequence
+
+from . import Variations
+from .deck import (
+    DECK,
+    KIND_CARDS,
+    Card,
+    HotelCard,
+    HouseCard,
+    MoneyCard,
+    PropertyCard,
+    PropertyColour,
+    RainbowRentCard,
+    RentCard,
+    WildPropertyCard,
+)
+from .game import Game, Player
+from .propertyset import PropertySet
+
+# A compact one line notation for a whole game position, e.g.
+#
+#   - 1.2.14 GR,3,go,... sd,R*,... A/go,x2/5/-/GR:GR,WGRDB B/1,no/-/-/RD:RD;RD:RD
+#
+# Space separated fields:
+#
+#   variations      flag names joined by "|", or "-" for none
+#   seat.actions.turns
+#                   seat to move, actions it has left, completed turns
+#   draw            the draw pile, next card to be dealt first
+#   discarded       the discard pile, oldest first
+#   players         one field per seat: name/hand/cash/buildings/sets
+#
+# Zones are comma separated card tokens, "-" when empty. Sets are separated by
+# ";", each written COLOUR:cards, and a wildcard's colour is the set it is in.
+# Cards of a kind are interchangeable, so tokens name kinds and parsing picks
+# cards of that kind from DECK. RNG state is not part of a position.
+
+COLOUR_CODES: dict[PropertyColour, str] = {
+    PropertyColour.UTILITY: "UT",
+    PropertyColour.STATION: "ST",
+    PropertyColour.BROWN: "BR",
+    PropertyColour.PALEBLUE: "LB",
+    PropertyColour.ORANGE: "OR",
+    PropertyColour.MAGENTA: "MG",
+    PropertyColour.YELLOW: "YL",
+    PropertyColour.RED: "RD",
+    PropertyColour.GREEN: "GR",
+    PropertyColour.DARKBLUE: "DB",
+}
+CODE_COLOURS = {code: colour for colour, code in COLOUR_CODES.items()}
+
+ACTION_CODES = {
+    "PassGoCard": "go",
+    "HouseCard": "hs",
+    "HotelCard": "ht",
+    "DoubleTheRentCard": "x2",
+    "BirthdayCard": "bd",
+    "ForcedDealCard": "fd",
+    "SlyDealCard": "sd",
+    "DealBreakerCard": "brk",
+    "DebtCollectorCard": "dc",
+    "JustSayNoCard": "no",
+}
+
+
+def _colours_code(colours: PropertyColour) -> str:
+    if colours == PropertyColour.ALL:
+        return "*"
+    return "".join(COLOUR_CODES[c] for c in colours)
+
+
+def _token(card: Card) -> str:
+    if isinstance(card, MoneyCard):
+        return str(card.cash)
+    if isinstance(card, PropertyCard):
+        return COLOUR_CODES[card.colour]
+    if isinstance(card, WildPropertyCard):
+        return "W" + _colours_code(card.colours)
+    if isinstance(card, (RentCard, RainbowRentCard)):
+        return "R" + _colours_code(card.colours)
+    return ACTION_CODES[card.kind]
+
+
+KIND_TOKENS: dict[str, str] = {kind: _token(c) for kind, c in KIND_CARDS.items()}
+TOKEN_KINDS: dict[str, str] = {t: kind for kind, t in KIND_TOKENS.items()}
+assert len(TOKEN_KINDS) == len(KIND_TOKENS)
+
+
+def _zone(cards: Sequence[Card] | PropertySet) -> str:
+    return ",".join(KIND_TOKENS[c.kind] for c in cards) or "-"
+
+
+def _player(p: Player) -> str:
+    if not p.name or any(ch.isspace() or ch == "/" for ch in p.name):
+        raise ValueError(f"player name {p.name!r} can not be written")
+    sets = ";".join(
+        f"{COLOUR_CODES[ps.colour]}:{_zone(ps)}" for ps in p.propertysets.all()
+    )
+    return "/".join(
+        [
+            p.name,
+            _zone(p.hand),
+            _zone(p.cash),
+            _zone(p.unallocated_buildings),
+            sets or "-",
+        ]
+    )
+
+
+def format_position(g: Game) -> str:
+    variations = "|".join(str(f.name) for f in g.variations) or "-"
+    return " ".join(
+        [
+            variations,
+            f"{g.current}.{g.actions_left}.{g.turns}",
+            _zone(list(g.draw)),
+            _zone(list(g.discarded)),
+            *(_player(p) for p in g.players),
+        ]
+    )
+
+
+class _Cards:
+    # hands out distinct DECK cards of each kind, so a parsed position holds
+    # each card object once like a dealt game does
+    def __init__(self) -> None:
+        self.free: dict[str, list[Card]] = {}
+        for card in reversed(DECK):
+            self.free.setdefault(card.kind, []).append(card)
+
+    def take(self, token: str) -> Card:
+        kind = TOKEN_KINDS.get(token)
+        if kind is None:
+            raise ValueError(f"unknown card {token!r}")
+        free = self.free[kind]
+        if not free:
+            raise ValueError(f"too many {token!r} cards")
+        return free.pop()
+
+    def zone(self, field: str) -> list[Card]:
+        if field == "-":
+            return []
+        return [self.take(t) for t in field.split(",")]
+
+
+def _parse_set(cards: _Cards, field: str) -> PropertySet:
+    code, sep, zone = field.partition(":")
+    if not sep or code not in CODE_COLOURS:
+        raise ValueError(f"bad property set {field!r}")
+    ps = PropertySet(CODE_COLOURS[code])
+    for card in cards.zone(zone):
+        # a card written in the wrong zone is bad notation, like any parse error
+        if not isinstance(card, (PropertyCard, WildPropertyCard, HouseCard, HotelCard)):
+            raise ValueError(f"{card} can not be placed in a property set")  # noqa: TRY004
+        try:
+            ps.add_property(card)
+        except AssertionError:
+            raise ValueError(f"{card} can not be placed in {field!r}") from None
+    return ps
+
+
+def _parse_player(cards: _Cards, field: str, p: Player) -> None:
+    parts = field.split("/")
+    if len(parts) != 5:
+        raise ValueError(f"bad player {field!r}")
+    _, hand, cash, buildings, sets = parts
+    p.hand = cards.zone(hand)
+    for card in cards.zone(cash):
+        p.add_money(card)
+    for card in cards.zone(buildings):
+        if not isinstance(card, (HouseCard, HotelCard)):
+            raise ValueError(f"{card} is not a building")  # noqa: TRY004
+        p.add_unallocated_building(card)
+    if sets != "-":
+        for s in sets.split(";"):
+            p.keep_property_set(_parse_set(cards, s))
+
+
+def parse_position(
+    text: str, players: Sequence[Player] | None = None, seed: int | None = None
+) -> Game:
+    # The game in the written position, ready for Game.step. Seats are filled by
+    # the given players, e.g. to benchmark a strategy's decision, else by Players
+    # named as written. The seed drives any later reshuffles and decisions.
+    fields = text.split()
+    if len(fields) < 5:
+        raise ValueError(f"not a position: {text!r}")
+    flags, turn, draw, discarded, *seats = fields
+
+    variations = Variations(0)
+    if flags != "-":
+        for name in flags.split("|"):
+            if name not in Variations.__members__:
+                raise ValueError(f"unknown variation {name!r}")
+            variations |= Variations[name]
+
+    if players is None:
+        players = [Player(s.partition("/")[0]) for s in seats]
+    elif len(players) != len(seats):
+        raise ValueError(f"{len(seats)} seats but {len(players)} players")
+
+    try:
+        current, actions_left, turns = map(int, turn.split("."))
+    except ValueError:
+        raise ValueError(f"bad turn {turn!r}") from None
+    if not 0 <= current < len(seats):
+        raise ValueError(f"no seat {current}")
+
+    cards = _Cards()
+    g = Game(list(players), variations=variations, seed=seed)
+    g.current, g.actions_left, g.turns = current, actions_left, turns
+    g.draw.extend(cards.zone(draw))
+    g.discarded.extend(cards.zone(discarded))
+    for p, s in zip(g.players, seats):
+        _parse_player(cards, s, p)
+    g.recount_unseen()
+    return g
@@ -0,0 +1,159 @@
+import copy
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from itertools import combinations
+
+from .deck import Card, HotelCard, HouseCard, PropertyColour, WildPropertyCard
+from .propertyset import PropertySet, PropertySets
+
+# How a player pays every amount it could owe, from nothing up to all it holds,
+# worked out in one pass over its holdings. The player keeps its schedule until
+# its holdings change, so a birthday, a debt and rent at several multiples cost
+# one solve, and other players can read how much each amount would hurt it.
+#
+# Cards are paid from four bands: the bank, unplaced buildings, incomplete sets
+# and complete sets. An amount spends every band before the last one it needs,
+# working back from that band, which pays its share of the amount, with any
+# overpayment taken off the share of the band before. Within a band a payment
+# minimises, in order, complete sets lost, rent lost, overpayment and any rise
+# in the smallest bank card kept, then takes the fewest and earliest cards.
+
+# the smallest bank card of an empty bank
+NO_CASH = 9999
+
+# (complete sets lost, rent lost, positions of the cards paid in their band)
+Choice = tuple[int, int, tuple[int, ...]]
+# (complete sets lost, rent lost, cards paid, their positions)
+Partial = tuple[int, int, int, tuple[int, ...]]
+
+
+@dataclass(frozen=True)
+class Payment:
+    cards: tuple[Card, ...]
+    complete_lost: int
+    rent_lost: int
+    paid: int
+
+
+def _set_options(
+    ps: PropertySet, cards: Sequence[tuple[int, Card]]
+) -> list[tuple[int, Choice]]:
+    # every way to pay from one set, with its value
+    complete, rent = ps.is_complete(), ps.rent_value()
+    options: list[tuple[int, Choice]] = []
+    for r in range(len(cards) + 1):
+        for chosen in combinations(cards, r):
+            left = copy.copy(ps)
+            for _, c in chosen:
+                left.remove(c)
+            lost = (complete - left.is_complete(), rent - left.rent_value())
+            value = sum(c.cash for _, c in chosen)
+            options.append((value, (*lost, tuple(i for i, _ in chosen))))
+    return options
+
+
+class Band:
+    # The best payment from one band's cards for each target from 0 to their
+    # value. A knapsack over groups of cards whose losses add up: each set, or
+    # each single card outside sets, where skipping a bank card may lower the
+    # smallest one kept.
+    def __init__(
+        self,
+        cards: Sequence[Card],
+        groups: Iterable[list[tuple[int, Choice]]],
+        keeps: Iterable[int],
+    ) -> None:
+        self.cards = list(cards)
+        self.value = sum(c.cash for c in cards)
+        # (value paid, smallest bank card kept) -> the least partial payment
+        states: dict[tuple[int, int], Partial] = {(0, NO_CASH): (0, 0, 0, ())}
+        for options, keep in zip(groups, keeps):
+            after: dict[tuple[int, int], Partial] = {}
+            for (paid, kept), (complete, rent, n, at) in states.items():
+                for value, (c, r, chosen) in options:
+                    key = (paid + value, kept if chosen else min(kept, keep))
+                    entry = (complete + c, rent + r, n + len(chosen), at + chosen)
+                    if key not in after or entry < after[key]:
+                        after[key] = entry
+            states = after
+
+        # a payment of some value serves every target up to it, overpaying by
+        # the difference, so each target takes the best from that value up
+        by_paid: dict[int, tuple[int, int, int, int, int, tuple[int, ...]]] = {}
+        for (paid, kept), (complete, rent, n, at) in states.items():
+            ranked = (complete, rent, paid, kept, n, at)
+            if paid not in by_paid or ranked < by_paid[paid]:
+                by_paid[paid] = ranked
+        self.best: list[Choice] = []
+        least = by_paid[self.value]
+        for target in range(self.value, -1, -1):
+            least = min(least, by_paid.get(target, least))
+            self.best.append((least[0], least[1], least[5]))
+        self.best.reverse()
+
+
+def _single_options(cards: Sequence[Card]) -> list[list[tuple[int, Choice]]]:
+    # cards outside sets lose nothing but their value
+    return [[(0, (0, 0, ())), (c.cash, (0, 0, (i,)))] for i, c in enumerate(cards)]
+
+
+class PaymentSchedule:
+    def __init__(
+        self,
+        cash: Sequence[Card],
+        buildings: Sequence[HouseCard | HotelCard],
+        propertysets: PropertySets,
+    ) -> None:
+        self.bands = [
+            Band(cash, _single_options(cash), (c.cash for c in cash)),
+            Band(buildings, _single_options(buildings), (NO_CASH for _ in buildings)),
+            self._property_band(propertysets.incomplete),
+            self._property_band(propertysets.complete),
+        ]
+        self.total = sum(band.value for band in self.bands)
+        self.payments = [self._solve(amount) for amount in range(self.total + 1)]
+
+    @staticmethod
+    def _property_band(sets: Iterable[PropertySet]) -> Band:
+        # rainbow wilds are worth nothing, so never paid
+        cards: list[Card] = []
+        groups = []
+        for ps in sets:
+            payable = [
+                c
+                for c in ps
+                if not (
+                    isinstance(c, WildPropertyCard) and c.colours == PropertyColour.ALL
+                )
+            ]
+            groups.append(_set_options(ps, list(enumerate(payable, len(cards)))))
+            cards.extend(payable)
+        return Band(cards, groups, (NO_CASH for _ in groups))
+
+    def _solve(self, amount: int) -> Payment:
+        needed: list[tuple[int, Band]] = []
+        still_need = amount
+        for band in self.bands:
+            if still_need < 0:
+                break
+            needed.append((min(still_need, band.value), band))
+            still_need -= band.value
+
+        cards: list[Card] = []
+        complete_lost = rent_lost = paid = 0
+        slack = 0
+        for share, band in reversed(needed):
+            target = share - slack
+            complete, rent, at = band.best[max(target, 0)]
+            chosen = [band.cards[i] for i in at]
+            cards[:0] = chosen
+            value = sum(c.cash for c in chosen)
+            slack = value - target
+            complete_lost += complete
+            rent_lost += rent
+            paid += value
+        return Payment(tuple(cards), complete_lost, rent_lost, paid)
+
+    def __getitem__(self, amount: int) -> Payment:
+        # more than the player holds takes everything
+        return self.payments[min(max(amount, 0), self.total)]
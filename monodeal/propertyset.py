@@ -1,4 +1,5 @@
-from typing import Iterator, Self, Sequence
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Self
 
 from .deck import (
     ALLOWED_BUILDINGS,
@@ -37,6 +38,11 @@ class PropertySet:
                 return False
         return len(self.rents) <= len(self.properties) + len(self.wilds)
 
+    def is_near_complete(self) -> bool:
+        # one more card of the colour would complete it
+        cards = len(self.properties) + len(self.wilds)
+        return 0 < cards and len(self.rents) - 1 <= cards and not self.is_complete()
+
     def get_colour(self) -> PropertyColour:
         return self.colour
 
@@ -128,3 +134,85 @@ class PropertySet:
             and self.house is not None
             and self.hotel is None
         )
+
+
+class PropertySets(Mapping[PropertyColour, PropertySet]):
+    # A player's property sets, allowing several sets of one colour. As a Mapping
+    # it gives the first set of each colour, which is the only one unless a stolen
+    # set was kept separate. Sets are also indexed by completion, in insertion
+    # ordered dicts used as sets, so the holder must call update() after changing
+    # a set's cards. update() also keeps the total rent and the number of sets one
+    # card from completion, from each set's last (rent, near complete) score.
+    def __init__(self) -> None:
+        self.by_colour: dict[PropertyColour, list[PropertySet]] = {}
+        self.complete: dict[PropertySet, None] = {}
+        self.incomplete: dict[PropertySet, None] = {}
+        self.scores: dict[PropertySet, tuple[int, int]] = {}
+        self.rent = 0
+        self.near_complete = 0
+
+    def __getitem__(self, colour: PropertyColour) -> PropertySet:
+        return self.by_colour[colour][0]
+
+    def __iter__(self) -> Iterator[PropertyColour]:
+        return iter(self.by_colour)
+
+    def __len__(self) -> int:
+        return len(self.by_colour)
+
+    def __repr__(self) -> str:
+        return repr(list(self.all()))
+
+    def holds(self, ps: PropertySet) -> bool:
+        return ps in self.complete or ps in self.incomplete
+
+    def sets(self, colour: PropertyColour) -> Sequence[PropertySet]:
+        return self.by_colour.get(colour, [])
+
+    def all(self) -> Iterator[PropertySet]:
+        for sets in self.by_colour.values():
+            yield from sets
+
+    def target(self, colour: PropertyColour, card: Card) -> PropertySet | None:
+        # the set a new card of this colour joins: one it can extend or build on
+        sets = self.by_colour.get(colour)
+        if not sets:
+            return None
+        for ps in sets:
+            if isinstance(card, HouseCard):
+                if ps.can_build_house():
+                    return ps
+            elif isinstance(card, HotelCard):
+                if ps.can_build_hotel():
+                    return ps
+            elif ps in self.incomplete:
+                return ps
+        return sets[0]
+
+    def add(self, ps: PropertySet) -> None:
+        self.by_colour.setdefault(ps.colour, []).append(ps)
+        self.update(ps)
+
+    def remove(self, ps: PropertySet) -> None:
+        sets = self.by_colour[ps.colour]
+        sets.remove(ps)
+        if not sets:
+            del self.by_colour[ps.colour]
+        self.complete.pop(ps, None)
+        self.incomplete.pop(ps, None)
+        rent, near = self.scores.pop(ps)
+        self.rent -= rent
+        self.near_complete -= near
+
+    def update(self, ps: PropertySet) -> None:
+        old_rent, old_near = self.scores.get(ps, (0, 0))
+        rent, near = ps.rent_value(), int(ps.is_near_complete())
+        self.scores[ps] = (rent, near)
+        self.rent += rent - old_rent
+        self.near_complete += near - old_near
+        if ps.is_complete():
+            self.incomplete.pop(ps, None)
+            self.complete[ps] = None
+        else:
+            self.complete.pop(ps, None)
+            self.incomplete[ps] = None
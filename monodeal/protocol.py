@@ -0,0 +1,125 @@
+import dataclasses
+from collections.abc import Sequence
+from typing import Any
+
+from . import Action
+from .deck import Card, PropertyColour
+from .game import Game, Player
+from .propertyset import PropertySet
+
+# Line-delimited JSON messages exchanged with players outside the engine. Every
+# message is one JSON object on a single line. Requests from the host carry a
+# "type" and a "seq" number; a reply is {"seq": <same seq>, "choice": ...}.
+#
+#   {"type": "new_game", "seq": n, "player": name}                 no reply
+#   {"type": "action", "seq": n, "view": {...}, "actions": [...]}  choice: index
+#   {"type": "pay", "seq": n, "amount": m, "cards": [...]}         choice: [index]
+#   {"type": "game_over", "seq": n, "won": bool}                   no reply
+#
+# Only the information visible to the player is sent: their own hand, everyone's
+# bank and property, and the sizes of the hidden zones.
+
+JSON = dict[str, Any]
+
+
+def encode_colours(colours: PropertyColour) -> list[str]:
+    return [str(c.name) for c in colours]
+
+
+def encode_card(card: Card) -> JSON:
+    out: JSON = {"kind": type(card).__name__, "name": card.name, "cash": card.cash}
+    colour: PropertyColour | None = getattr(card, "colour", None)
+    colours: PropertyColour | None = getattr(card, "colours", colour)
+    if colours is not None:
+        out["colours"] = encode_colours(colours)
+    return out
+
+
+def encode_propertyset(ps: PropertySet) -> JSON:
+    return {
+        "colour": ps.colour.name,
+        "cards": [encode_card(c) for c in ps],
+        "complete": ps.is_complete(),
+        "rent": ps.rent_value(),
+    }
+
+
+def encode_table(p: Player) -> JSON:
+    return {
+        "name": p.name,
+        "hand_size": len(p.hand),
+        "bank": [encode_card(c) for c in p.cash],
+        "property": [encode_propertyset(ps) for ps in p.propertysets.all()],
+        "unallocated": [encode_card(c) for c in p.unallocated_buildings],
+    }
+
+
+def encode_view(game: Game, player: Player, actions_left: int) -> JSON:
+    return {
+        "you": {**encode_table(player), "hand": [encode_card(c) for c in player.hand]},
+        "opponents": [encode_table(op) for op in game.get_opposition(player)],
+        "draw_size": len(game.draw),
+        "discard_size": len(game.discarded),
+        "actions_left": actions_left,
+        "variations": [str(v.name) for v in game.variations],
+    }
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, Card):
+        return encode_card(value)
+    if isinstance(value, PropertySet):
+        return value.colour.name
+    if isinstance(value, PropertyColour):
+        return value.name
+    if isinstance(value, Player):
+        return value.name
+    return value
+
+
+def encode_action(action: Action) -> JSON:
+    out: JSON = {"type": type(action).__name__}
+    for field in dataclasses.fields(action):
+        if field.name != "player":
+            out[field.name] = _encode_value(getattr(action, field.name))
+    return out
+
+
+def action_request(
+    game: Game, player: Player, actions_left: int, actions: Sequence[Action]
+) -> JSON:
+    return {
+        "type": "action",
+        "player": player.name,
+        "view": encode_view(game, player, actions_left),
+        "actions": [encode_action(a) for a in actions],
+    }
+
+
+def payment_request(player: Player, amount: int, cards: Sequence[Card]) -> JSON:
+    return {
+        "type": "pay",
+        "player": player.name,
+        "amount": amount,
+        "cards": [encode_card(c) for c in cards],
+    }
+
+
+def decode_action_choice(choice: Any, actions: Sequence[Action]) -> Action | None:
+    if isinstance(choice, int) and 0 <= choice < len(actions):
+        return actions[choice]
+    return None
+
+
+def decode_payment_choice(
+    choice: Any, amount: int, cards: Sequence[Card]
+) -> list[Card] | None:
+    # a payment must cover the amount, unless every payable card is handed over
+    if not isinstance(choice, list) or not all(
+        isinstance(i, int) and 0 <= i < len(cards) for i in choice
+    ):
+        return None
+    chosen = [cards[i] for i in dict.fromkeys(choice)]
+    if sum(c.cash for c in chosen) >= amount or len(chosen) == len(cards):
+        return chosen
+    return None
@@ -0,0 +1,39 @@
+import copy
+import random
+from dataclasses import dataclass
+
+# Random number streams for simulation at scale. Every game gets generators
+# derived from (master seed, game index), so any single game of a long run can
+# be replayed on its own, and each game splits into independent substreams for
+# shuffling the draw pile and for randomised player decisions.
+
+
+def stream(seed: int | str, *path: int | str) -> random.Random:
+    # an independent generator for a path below the master seed, e.g.
+    # stream(7, 1234, "shuffle"). A str seed is hashed with SHA-512, so distinct
+    # paths give unrelated streams, and building one never advances another.
+    return random.Random("/".join(str(part) for part in (seed, *path)))
+
+
+@dataclass
+class GameStreams:
+    shuffle: random.Random
+    decisions: random.Random
+
+    @classmethod
+    def for_game(cls, seed: int | str, index: int = 0) -> "GameStreams":
+        return cls(stream(seed, index, "shuffle"), stream(seed, index, "decisions"))
+
+    @classmethod
+    def fresh(cls) -> "GameStreams":
+        # unseeded, from OS entropy
+        return cls(random.Random(), random.Random())
+
+    @classmethod
+    def from_random(cls, rng: random.Random) -> "GameStreams":
+        # an explicit generator drives the shuffles, decisions branch off it
+        return cls(rng, random.Random(rng.getrandbits(64)))
+
+    def fork(self) -> "GameStreams":
+        # copies that continue the same sequences, e.g. for a rollout
+        return GameStreams(copy.copy(self.shuffle), copy.copy(self.decisions))
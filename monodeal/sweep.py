@@ -0,0 +1,200 @@
+import csv
+import importlib
+import random
+import sys
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from itertools import chain, combinations, combinations_with_replacement
+from typing import TYPE_CHECKING, TextIO
+
+from . import Variations
+from .compare import Strategy, deck_order
+from .game import Game, Player, quiet
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+# (variations, strategy A name, strategy B name, seed)
+Job = tuple[Variations, str, str, int]
+
+# the standard rules, with no variation flags set
+STANDARD = Variations(0)
+# the flags the command line sets in every game unless given --base
+DEFAULT_BASE = Variations.FORCE_UNPLACED_PROPERTY_AS_CASH
+
+
+def variation_name(v: Variations) -> str:
+    return "|".join(sorted(str(f.name) for f in v)) or "-"
+
+
+def variation_grid(
+    flags: Sequence[Variations], base: Variations = STANDARD
+) -> list[Variations]:
+    # every combination of the given flags, each on top of the base rules
+    subsets = chain.from_iterable(combinations(flags, r) for r in range(len(flags) + 1))
+    grid: list[Variations] = []
+    for subset in subsets:
+        v = base
+        for f in subset:
+            v |= f
+        if v not in grid:
+            grid.append(v)
+    return grid
+
+
+def _play_job(job: Job, strategies: Mapping[str, Strategy]) -> list[tuple[bool, int]]:
+    # one deal played twice with the seats swapped: (A won, turns) per game
+    variations, a, b, seed = job
+    deck = deck_order(seed)
+    results: list[tuple[bool, int]] = []
+    for swapped in (False, True):
+        mine, theirs = strategies[a]("A"), strategies[b]("B")
+        g = Game(
+            players=[theirs, mine] if swapped else [mine, theirs],
+            random=random.Random(seed),
+            variations=variations,
+            deck=deck,
+        )
+        with quiet():
+            winner = g.play()
+        results.append((winner is mine, g.turns))
+    return results
+
+
+@dataclass
+class SweepRow:
+    variations: Variations
+    a: str
+    b: str
+    games: int = 0
+    wins: int = 0  # games won by strategy A
+    turns: int = 0  # summed over all games
+    longest: int = 0
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.5
+
+    @property
+    def mean_turns(self) -> float:
+        return self.turns / self.games if self.games else 0.0
+
+
+def sweep(
+    variations: Sequence[Variations],
+    strategies: Mapping[str, Strategy],
+    seeds: Iterable[int],
+    executor: "Executor | None" = None,
+) -> list[SweepRow]:
+    # Plays every rules variation x strategy matchup x seed, each seed as a
+    # seat-swapped pair on the same deal. Matchups are all pairs of strategies
+    # including each against itself, which measures the first seat's advantage.
+    # Jobs run on the executor, in order on this process if none is given.
+    # Strategies must be picklable (e.g. classes) to run in other processes.
+    matchups = list(combinations_with_replacement(strategies, 2))
+    seeds = list(seeds)
+    jobs: list[Job] = [
+        (v, a, b, s) for v in variations for a, b in matchups for s in seeds
+    ]
+    if executor is None:
+        results = [_play_job(job, strategies) for job in jobs]
+    else:
+        results = list(executor.map(_play_job, jobs, [strategies] * len(jobs)))
+
+    rows: dict[tuple[Variations, str, str], SweepRow] = {}
+    for (v, a, b, _), games in zip(jobs, results):
+        row = rows.setdefault((v, a, b), SweepRow(v, a, b))
+        for won, turns in games:
+            row.games += 1
+            row.wins += won
+            row.turns += turns
+            row.longest = max(row.longest, turns)
+    return list(rows.values())
+
+
+COLUMNS = ["variations", "a", "b", "games", "win_rate", "mean_turns", "longest"]
+
+
+def _cells(row: SweepRow) -> list[str]:
+    return [
+        variation_name(row.variations),
+        row.a,
+        row.b,
+        str(row.games),
+        f"{row.win_rate:.3f}",
+        f"{row.mean_turns:.1f}",
+        str(row.longest),
+    ]
+
+
+def format_table(rows: Sequence[SweepRow]) -> str:
+    cells = [COLUMNS] + [_cells(r) for r in rows]
+    widths = [max(len(line[i]) for line in cells) for i in range(len(COLUMNS))]
+    return "\n".join(
+        "  ".join(c.ljust(w) for c, w in zip(line, widths)).rstrip() for line in cells
+    )
+
+
+def write_csv(rows: Sequence[SweepRow], out: TextIO) -> None:
+    writer = csv.writer(out)
+    writer.writerow(COLUMNS)
+    writer.writerows(_cells(r) for r in rows)
+
+
+def load_strategy(spec: str) -> tuple[str, Strategy]:
+    # "name=package.module:Class", or just "package.module:Class"
+    name, _, path = spec.rpartition("=")
+    module, _, attr = path.partition(":")
+    strategy: Strategy = getattr(importlib.import_module(module), attr)
+    return name or attr, strategy
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    import argparse
+
+    from .workers import process_pool
+
+    parser = argparse.ArgumentParser(
+        prog="python -m monodeal.sweep",
+        description="win rates and game lengths across rules variations",
+    )
+    parser.add_argument(
+        "--flag",
+        action="append",
+        default=[],
+        choices=[str(f.name) for f in Variations],
+        help="flag to sweep on and off, may be repeated",
+    )
+    parser.add_argument(
+        "--base",
+        action="append",
+        choices=[str(f.name) for f in Variations],
+        help=f"flag set in every game, may be repeated (default {DEFAULT_BASE.name})",
+    )
+    parser.add_argument(
+        "--strategy",
+        action="append",
+        default=[],
+        help="name=module:callable taking a player name, may be repeated",
+    )
+    parser.add_argument("--seeds", type=int, default=100, help="deals per matchup")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--csv", action="store_true", help="write CSV to stdout")
+    args = parser.parse_args(argv)
+
+    base = STANDARD if args.base else DEFAULT_BASE
+    for name in args.base or ():
+        base |= Variations[name]
+    grid = variation_grid([Variations[name] for name in args.flag], base)
+    strategies = dict(map(load_strategy, args.strategy)) or {"heuristic": Player}
+
+    with process_pool(args.workers) as executor:
+        rows = sweep(grid, strategies, range(args.seeds), executor)
+    if args.csv:
+        write_csv(rows, sys.stdout)
+    else:
+        print(format_table(rows))
+
+
+if __name__ == "__main__":
+    main()
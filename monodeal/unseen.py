@@ -0,0 +1,72 @@
+from collections import Counter
+from collections.abc import Iterable
+from functools import cache
+from math import comb
+
+from .deck import KIND_CARDS, Card, PropertyCard, PropertyColour, WildPropertyCard
+
+# A class of cards: a card kind, e.g. "JustSayNoCard", or a colour, meaning any
+# card that can be placed in a set of that colour
+CardClass = str | PropertyColour
+
+
+def _classes(card: Card) -> tuple[CardClass, ...]:
+    if isinstance(card, PropertyCard):
+        return (card.kind, card.colour)
+    if isinstance(card, WildPropertyCard):
+        return (card.kind, *card.colours)
+    return (card.kind,)
+
+
+CARD_CLASSES: dict[str, tuple[CardClass, ...]] = {
+    kind: _classes(card) for kind, card in KIND_CARDS.items()
+}
+
+
+@cache
+def at_least(population: int, successes: int, draws: int, k: int) -> float:
+    # hypergeometric P(at least k successes in `draws` cards taken without
+    # replacement from `population` cards of which `successes` are successes)
+    draws = min(draws, population)
+    if k <= 0:
+        return 1.0
+    if k > min(draws, successes):
+        return 0.0
+    ways = sum(
+        comb(successes, i) * comb(population - successes, draws - i)
+        for i in range(k, min(draws, successes) + 1)
+    )
+    return ways / comb(population, draws)
+
+
+class UnseenCards:
+    # One player's public information: counts of the cards it has not seen,
+    # which are those in the draw pile and in the opponents' hands. The game
+    # keeps it up to date as cards are dealt, revealed from hands and reshuffled,
+    # so every query is a lookup.
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+        self.counts: Counter[CardClass] = Counter()
+        self.total = 0
+        for card in cards:
+            self.unsee(card)
+
+    def __repr__(self) -> str:
+        return f"UnseenCards({self.total})"
+
+    def see(self, card: Card) -> None:
+        for c in CARD_CLASSES[card.kind]:
+            self.counts[c] -= 1
+        self.total -= 1
+
+    def unsee(self, card: Card) -> None:
+        for c in CARD_CLASSES[card.kind]:
+            self.counts[c] += 1
+        self.total += 1
+
+    def count(self, cls: CardClass) -> int:
+        return self.counts[cls]
+
+    def chance(self, cls: CardClass, k: int = 1, draws: int = 2) -> float:
+        # probability of at least k cards of the class within the next draws,
+        # taking every unseen card as equally likely to be drawn
+        return at_least(self.total, self.counts[cls], draws, k)
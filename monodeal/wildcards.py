@@ -0,0 +1,204 @@
+from functools import cache, lru_cache
+from itertools import product
+from operator import le, sub
+
+from .deck import RENTS, PropertyColour, WildPropertyCard
+from .propertyset import PropertySet, PropertySets
+
+# (complete sets, total rent, -wildcards moved): compared lexicographically, so
+# among equally good layouts the one closest to the current layout wins
+Score = tuple[int, int, int]
+
+COLOURS: list[PropertyColour] = list(PropertyColour.ALL)
+
+# a wildcard and the colour to move it to
+WildcardMove = tuple[WildPropertyCard, PropertyColour]
+
+
+def _set_score(
+    colour: PropertyColour,
+    properties: int,
+    wilds: int,
+    rainbow_only: bool,
+    house: bool,
+    hotel: bool,
+    keep_complete: bool,
+) -> tuple[int, int] | None:
+    # (complete, rent) for a set with these cards, following PropertySet's rules.
+    # None if the layout would strand a house or hotel on a set that was complete.
+    rents = RENTS[colour]
+    cards = properties + wilds
+    if cards == 0 or (properties == 0 and rainbow_only):
+        return None if keep_complete else (0, 0)
+    complete = cards >= len(rents)
+    if not complete:
+        return None if keep_complete else (0, rents[cards - 1])
+    rent = rents[-1] + (3 if house else 0) + (5 if house and hotel else 0)
+    return (1, rent)
+
+
+# a set wildcards can be laid out in: one the player holds, or a new set of a
+# colour it holds none of
+Slot = tuple[PropertyColour, PropertySet | None]
+
+
+def _slots(propertysets: PropertySets) -> list[Slot]:
+    slots: list[Slot] = []
+    for colour in COLOURS:
+        sets = propertysets.sets(colour)
+        slots += [(colour, ps) for ps in sets] if sets else [(colour, None)]
+    return slots
+
+
+# what the search needs to know of a set: its colour, property count, house,
+# hotel, whether its buildings keep it complete, how many wildcards of each type
+# it holds and whether a wildcard moved to its colour would join it
+SlotKey = tuple[PropertyColour, int, bool, bool, bool, tuple[int, ...], bool]
+
+# one way to fill a set: wildcards taken of each type, and its score
+Option = tuple[tuple[int, ...], Score]
+
+
+@lru_cache(maxsize=4096)
+def _allocate(
+    types: tuple[PropertyColour, ...], keys: tuple[SlotKey, ...]
+) -> tuple[tuple[int, ...], ...] | None:
+    # How many wildcards of each type each set takes in the best layout, None
+    # if there is no valid one. Sets left out take none. It depends on counts
+    # alone, so a layout is shared by every position with the same counts, in
+    # any game.
+    #
+    # Wildcards with the same colours are interchangeable, so the search is a DP
+    # over sets whose state is how many of each wildcard type are still to be
+    # placed. Each set's options are scored once from its (property count,
+    # wildcard count): it never takes more than it needs to complete beyond
+    # those it holds already, as they add nothing.
+    counts = tuple(sum(key[5][j] for key in keys) for j in range(len(types)))
+    options: list[list[Option]] = []
+    for colour, properties, house, hotel, keep, held, joins in keys:
+        eligible = [j for j, t in enumerate(types) if colour in t]
+        cap = max(len(RENTS[colour]) - properties, sum(held))
+        most = [counts[j] if joins else held[j] for j in eligible]
+        slot_options: list[Option] = []
+        for take in product(*(range(min(n, cap) + 1) for n in most)):
+            if sum(take) > cap:
+                continue
+            assigned = [0] * len(types)
+            for j, k in zip(eligible, take):
+                assigned[j] = k
+            rainbow_only = all(
+                t == PropertyColour.ALL for t, k in zip(types, assigned) if k
+            )
+            score = _set_score(
+                colour, properties, sum(take), rainbow_only, house, hotel, keep
+            )
+            if score is not None:
+                moved = sum(max(0, k - h) for k, h in zip(assigned, held))
+                slot_options.append((tuple(assigned), (*score, -moved)))
+        options.append(slot_options)
+
+    @cache
+    def solve(
+        n: int, remaining: tuple[int, ...]
+    ) -> tuple[Score, tuple[tuple[int, ...], ...]] | None:
+        if n == len(options):
+            return ((0, 0, 0), ()) if not any(remaining) else None
+        best: tuple[Score, tuple[tuple[int, ...], ...]] | None = None
+        for assigned, score in options[n]:
+            if not all(map(le, assigned, remaining)):
+                continue
+            rest = solve(n + 1, tuple(map(sub, remaining, assigned)))
+            if rest is None:
+                continue
+            total = (
+                score[0] + rest[0][0],
+                score[1] + rest[0][1],
+                score[2] + rest[0][2],
+            )
+            if best is None or total > best[0]:
+                best = (total, (assigned, *rest[1]))
+        return best
+
+    solved = solve(0, counts)
+    return None if solved is None else solved[1]
+
+
+def _layout(propertysets: PropertySets) -> dict[WildPropertyCard, Slot]:
+    # Exact placement of every wildcard held in property that maximises complete
+    # sets, then total rent, then leaves as many wildcards where they are. A
+    # wildcard moved to a colour joins the set the player would add it to, so
+    # other sets of that colour can only keep the wildcards they have.
+    if not any(ps.wilds for ps in propertysets.all()):
+        return {}
+    slots = _slots(propertysets)
+    wilds: dict[PropertyColour, list[WildPropertyCard]] = {}
+    for _, ps in slots:
+        for w in ps.wilds if ps is not None else ():
+            wilds.setdefault(w.colours, []).append(w)
+    types = tuple(wilds)
+    # any wildcard joins the same set of a colour, or a new one if none is held
+    wild = wilds[types[0]][0]
+    # The sets worth placing wildcards in, and what the search needs of them.
+    # A rainbow wildcard alone makes nothing of an empty set, and is better
+    # left where it is, so empty sets only two colour wildcards fit are given.
+    fits = [
+        i
+        for i, (colour, ps) in enumerate(slots)
+        if any(colour in t for t in types)
+        and (
+            (ps is not None and len(ps) > 0)
+            or any(colour in t and t != PropertyColour.ALL for t in types)
+        )
+    ]
+    keys: list[SlotKey] = []
+    for colour, ps in (slots[i] for i in fits):
+        joins = ps is propertysets.target(colour, wild)
+        if ps is None:
+            keys.append((colour, 0, False, False, False, (0,) * len(types), joins))
+            continue
+        held = tuple(sum(w.colours == t for w in ps.wilds) for t in types)
+        keep = (ps.house is not None or ps.hotel is not None) and ps.is_complete()
+        house, hotel = ps.house is not None, ps.hotel is not None
+        keys.append((colour, len(ps.properties), house, hotel, keep, held, joins))
+    solved = _allocate(types, tuple(keys))
+    if solved is None:
+        raise ValueError(f"no valid wildcard layout for {propertysets}")
+    allocation = [(0,) * len(types)] * len(slots)
+    for i, alloc in zip(fits, solved):
+        allocation[i] = alloc
+
+    # turn counts back into cards, keeping wildcards in place where possible
+    layout: dict[WildPropertyCard, Slot] = {}
+    for j, t in enumerate(types):
+        want = [alloc[j] for alloc in allocation]
+        movers: list[WildPropertyCard] = []
+        for i, (_, ps) in enumerate(slots):
+            for w in ps.wilds if ps is not None else ():
+                if w.colours != t:
+                    continue
+                if want[i] > 0:
+                    want[i] -= 1
+                    layout[w] = slots[i]
+                else:
+                    movers.append(w)
+        for i, n in enumerate(want):
+            for _ in range(n):
+                layout[movers.pop()] = slots[i]
+    return layout
+
+
+def best_wildcard_layout(
+    propertysets: PropertySets,
+) -> dict[WildPropertyCard, PropertyColour]:
+    return {w: colour for w, (colour, _) in _layout(propertysets).items()}
+
+
+def wildcard_moves(propertysets: PropertySets) -> list[WildcardMove]:
+    # wildcards that should change set to reach the best layout
+    layout = _layout(propertysets)
+    return [
+        (w, layout[w][0])
+        for ps in propertysets.all()
+        for w in ps.wilds
+        if layout[w][1] is not ps
+    ]
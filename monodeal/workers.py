@@ -0,0 +1,116 @@
+import importlib
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+# Worker processes for simulation at scale. Short jobs are dominated by each
+# worker importing the engine, so pools are started from a forkserver that has
+# imported it once: every worker forks from that warm process rather than
+# importing again. Modules that workers import keep their command line and
+# process pool imports inside main(), and the import time of the engine is kept
+# to a budget, reported by python -m monodeal.workers.
+
+# what a worker needs to play games
+PRELOAD = ["monodeal.game"]
+
+# seconds to import each module into a fresh interpreter, bytecode cached
+IMPORT_BUDGET = {
+    "monodeal.game": 0.05,
+    "monodeal.league": 0.08,
+    "monodeal.sweep": 0.08,
+    "monodeal.fuzz": 0.08,
+}
+
+
+def preload(*modules: str) -> None:
+    # pool initializer for workers that spawn
+    for module in modules:
+        importlib.import_module(module)
+
+
+def process_pool(
+    workers: int | None = None, modules: Sequence[str] = ()
+) -> "ProcessPoolExecutor":
+    # A process pool whose workers start with modules imported. Where there is
+    # no forkserver (Windows, where pools spawn) an initializer imports them in
+    # each worker as it starts, rather than during its first job.
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    modules = [*PRELOAD, *modules]
+    forkserver = "forkserver" in multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if forkserver else None)
+    if forkserver:
+        # only takes effect if this process has not yet started its forkserver,
+        # otherwise modules it did not preload are imported by the first job
+        multiprocessing.set_forkserver_preload(modules)
+        return ProcessPoolExecutor(workers, mp_context=context)
+    return ProcessPoolExecutor(
+        workers, mp_context=context, initializer=preload, initargs=tuple(modules)
+    )
+
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(module: str, runs: int = 5) -> dict[str, float]:
+    # Cumulative seconds to import module and each module it pulls in, in a
+    # fresh interpreter after a first run has cached the bytecode, as workers
+    # of an installed package would see it. The fastest of several runs, as
+    # other load on the machine only ever adds time.
+    times: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as cache:
+        env = {**os.environ, "PYTHONPYCACHEPREFIX": cache}
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        command = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+        subprocess.run(command, env=env, capture_output=True, check=True)
+        for _ in range(runs):
+            out = subprocess.run(
+                command, env=env, capture_output=True, text=True, check=True
+            )
+            for line in out.stderr.splitlines():
+                m = IMPORT_LINE.match(line)
+                if m:
+                    seconds = int(m[2]) / 1e6
+                    times[m[4]] = min(times.get(m[4], seconds), seconds)
+    return times
+
+
+def import_time(module: str) -> float:
+    return import_times(module)[module]
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    # Prints the import time of each budgeted module against its budget. Wall
+    # clock times vary with the machine, so this only reports unless --strict
+    # is given, when it fails if any module is over twice its budget.
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m monodeal.workers",
+        description="import times of the engine against their budgets",
+    )
+    parser.add_argument("modules", nargs="*", default=list(IMPORT_BUDGET))
+    parser.add_argument("--strict", action="store_true")
+    args = parser.parse_args(argv)
+    over = 0
+    for module in args.modules:
+        seconds = import_time(module)
+        budget = IMPORT_BUDGET.get(module, float("inf"))
+        over += seconds > 2 * budget
+        mark = "  over" if seconds > budget else ""
+        print(
+            f"{module:20} {seconds * 1000:6.1f}ms  budget {budget * 1000:.0f}ms{mark}"
+        )
+    sys.exit(1 if args.strict and over else 0)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,8 +1,15 @@
+import pytest
+
+from monodeal import IllegalAction, Variations
 from monodeal.actions import (
     BirthdayAction,
     DealBreakerAction,
+    DebtCollectorAction,
     DepositAction,
+    MoveBuildingAction,
+    MovePropertyAction,
     PlayPropertyAction,
+    RentAction,
     generate_actions,
 )
 from monodeal.deck import (
@@ -10,14 +17,19 @@ from monodeal.deck import (
     PROPERTY_DECK,
     BirthdayCard,
     DealBreakerCard,
+    DebtCollectorCard,
+    DoubleTheRentCard,
     HotelCard,
     HouseCard,
+    JustSayNoCard,
     MoneyCard,
     PropertyCard,
     PropertyColour,
+    RentCard,
     WildPropertyCard,
 )
 from monodeal.game import Game, Player
+from monodeal.propertyset import PropertySet
 
 
 def test_property_actions() -> None:
@@ -212,3 +224,300 @@ def test_deal_breaker_ps_merge() -> None:
 
     # This does not consider cacade
     # e.g. if PALEBLUE was already complete and pushed out a wildcard
+
+
+def test_move_buildings_variation() -> None:
+    p = Player("P1")
+    brown = [PropertyCard(PropertyColour.BROWN, n, 1) for n in ("OKR", "WR")]
+    blue = [PropertyCard(PropertyColour.DARKBLUE, n, 4) for n in ("PL", "MF")]
+    for c in brown:
+        p.add_property(PropertyColour.BROWN, c)
+    p.add_property(PropertyColour.BROWN, house := HouseCard())
+    p.add_property(PropertyColour.BROWN, hotel := HotelCard())
+    for c in blue:
+        p.add_property(PropertyColour.DARKBLUE, c)
+
+    assert generate_actions(Game([p]), p, 3) == []
+
+    g = Game([p], variations=Variations.MOVABLE_BUILDINGS)
+    move = MoveBuildingAction(
+        player=p,
+        source=p.propertysets[PropertyColour.BROWN],
+        colour=PropertyColour.DARKBLUE,
+    )
+    assert generate_actions(g, p, 3) == [move]
+    assert move.action_count() == 0
+    move.apply(g)
+    ps = p.get_property_sets()[PropertyColour.DARKBLUE]
+    assert (ps.house, ps.hotel) == (house, hotel)
+    assert ps.rent_value() == 16
+    # never moved back to the cheaper set
+    assert generate_actions(g, p, 3) == []
+
+    g = Game(
+        [p],
+        variations=Variations.MOVABLE_BUILDINGS | Variations.BUILDING_MOVE_COSTS_ACTION,
+    )
+    p.add_property(PropertyColour.GREEN, PropertyCard(PropertyColour.GREEN, "a", 4))
+    for name in ("b", "c"):
+        p.add_property(
+            PropertyColour.GREEN, PropertyCard(PropertyColour.GREEN, name, 4)
+        )
+    assert generate_actions(g, p, 3) == []
+
+
+def test_move_buildings_from_a_second_set() -> None:
+    p = Player("P1")
+    for name in ("OKR", "WR"):
+        p.add_property(
+            PropertyColour.BROWN, PropertyCard(PropertyColour.BROWN, name, 1)
+        )
+    stolen = PropertySet(PropertyColour.BROWN)
+    for card in (
+        PropertyCard(PropertyColour.BROWN, "OKR", 1),
+        PropertyCard(PropertyColour.BROWN, "WR", 1),
+        house := HouseCard(),
+    ):
+        stolen.add_property(card)
+    p.keep_property_set(stolen)
+    for name in ("PL", "MF"):
+        p.add_property(
+            PropertyColour.DARKBLUE, PropertyCard(PropertyColour.DARKBLUE, name, 4)
+        )
+
+    g = Game([p], variations=Variations.MOVABLE_BUILDINGS)
+    move = MoveBuildingAction(player=p, source=stolen, colour=PropertyColour.DARKBLUE)
+    assert generate_actions(g, p, 3) == [move]
+    move.apply(g)
+    assert p.get_property_sets()[PropertyColour.DARKBLUE].house is house
+    assert stolen.house is None
+
+
+def test_deal_breaker_separate_sets() -> None:
+    p1 = Player("P1")
+    p2 = Player("P2")
+    g = Game([p1, p2], variations=Variations.SEPARATE_PROPERTY_SETS)
+    brown = PropertyColour.BROWN
+
+    mine = PropertyCard(brown, "Whitechapel Road", 1)
+    p1.add_property(brown, mine)
+    p1.deal_card(dbc := DealBreakerCard())
+    p2.add_property(brown, PropertyCard(brown, "Old Kent Road", 1))
+    p2.add_property(brown, WildPropertyCard(PropertyColour.PALEBLUE | brown, 1))
+    to_steal = p2.get_property_sets()[brown]
+
+    DealBreakerAction(player=p1, card=dbc, target=p2, propertyset=to_steal).apply(g)
+
+    # the stolen set stays whole, next to our own incomplete brown set
+    sets = p1.get_property_sets()
+    assert list(sets.sets(brown)) == [sets[brown], to_steal]
+    assert list(sets.complete) == [to_steal]
+    assert p1.cards_to_ps[mine] is sets[brown]
+    assert brown not in p2.get_property_sets()
+
+    # rent can be charged on either set
+    p1.deal_card(rent := RentCard(brown | PropertyColour.PALEBLUE, 1))
+    rents = [a for a in generate_actions(g, p1, 3) if isinstance(a, RentAction)]
+    assert [a.propertyset for a in rents] == [sets[brown], to_steal]
+    assert rents[0].card is rent
+
+
+def test_just_say_no_chain() -> None:
+    def table(stops: int, counters: int) -> tuple[Player, Player, Game]:
+        actor, target = Player("A"), Player("T")
+        target.add_money(MoneyCard(5))
+        target.hand = [JustSayNoCard() for _ in range(stops)]
+        actor.hand = [JustSayNoCard() for _ in range(counters)]
+        return actor, target, Game([actor, target])
+
+    # (target stops, actor counters) -> stop cards played, payment made
+    for stops, counters, played, paid in [
+        (0, 0, 0, True),
+        (1, 0, 1, False),
+        (1, 1, 2, True),
+        (2, 1, 3, False),
+        (2, 2, 4, True),
+    ]:
+        actor, target, g = table(stops, counters)
+        actor.hand.append(card := DebtCollectorCard())
+        DebtCollectorAction(player=actor, card=card, target=target).apply(g)
+        assert len(g.discarded) == played + 1
+        assert actor.get_money() == (5 if paid else 0)
+        assert target.hand.count_of("JustSayNoCard") == stops - (played + 1) // 2
+
+    # a small payment is not worth a stop
+    actor, target, g = table(1, 0)
+    actor.hand.append(birthday := BirthdayCard())
+    BirthdayAction(player=actor, card=birthday).apply(g)
+    assert actor.get_money() == 5
+    assert target.hand.count_of("JustSayNoCard") == 1
+
+
+def test_birthday_settles_all_payers_together() -> None:
+    me, wild_payer, station_payer = Player("me"), Player("P1"), Player("P2")
+    g = Game([me, wild_payer, station_payer])
+    station = PropertyColour.STATION
+    for name in ("Kings Cross", "Marylebone"):
+        me.add_property(station, PropertyCard(station, name, 2))
+    wild = WildPropertyCard(station | PropertyColour.UTILITY, 2)
+    wild_payer.add_property(PropertyColour.UTILITY, wild)
+    station_payer.add_property(station, PropertyCard(station, "Fenchurch St", 2))
+
+    me.deal_card(card := BirthdayCard())
+    BirthdayAction(player=me, card=card).apply(g)
+
+    # the wildcard is paid first but placed after the station, so it completes
+    # the stations instead of starting a utility set
+    ps = me.get_property_sets()[station]
+    assert ps.is_complete() and ps.wilds == [wild]
+    assert not wild_payer.cards_to_ps and not station_payer.cards_to_ps
+
+
+def test_validate_rejects_before_applying() -> None:
+    a, b = Player("A"), Player("B")
+    g = Game([a, b], variations=Variations.FORCE_UNPLACED_PROPERTY_AS_CASH)
+    g.actions_left = 3
+    brown = PropertyColour.BROWN
+    okr = PropertyCard(brown, "Old Kent Road", 1)
+    wild = WildPropertyCard(PropertyColour.RED | PropertyColour.YELLOW, 3)
+    a.hand = [okr, wild, house := HouseCard(), dbc := DealBreakerCard()]
+    b.add_property(brown, b_okr := PropertyCard(brown, "Whitechapel Road", 1))
+    b.hand = [m := MoneyCard(1)]
+    # keep the game's card count audit happy
+    g.discarded.extend(MoneyCard(1) for _ in range(100))
+
+    illegal = [
+        # not our turn
+        DepositAction(player=b, card=m),
+        # not in our hand
+        DepositAction(player=a, card=m),
+        # property can not be banked
+        DepositAction(player=a, card=okr),
+        PlayPropertyAction(player=a, card=okr, colour=PropertyColour.GREEN),
+        PlayPropertyAction(player=a, card=wild, colour=PropertyColour.GREEN),
+        PlayPropertyAction(
+            player=a, card=wild, colour=PropertyColour.RED | PropertyColour.YELLOW
+        ),
+        # no complete set to build on
+        PlayPropertyAction(player=a, card=house, colour=brown),
+        # target set is not complete, or not the target's
+        DealBreakerAction(
+            player=a, card=dbc, target=b, propertyset=b.propertysets[brown]
+        ),
+        DealBreakerAction(
+            player=a, card=dbc, target=a, propertyset=b.propertysets[brown]
+        ),
+        MoveBuildingAction(
+            player=a, source=b.propertysets[brown], colour=PropertyColour.DARKBLUE
+        ),
+    ]
+    for action in illegal:
+        with pytest.raises(IllegalAction):
+            g.step(action)
+    assert g.actions_left == 3 and len(a.hand) == 4 and b.set_of(b_okr)
+
+    g.step(PlayPropertyAction(player=a, card=okr, colour=brown))
+    g.step(PlayPropertyAction(player=a, card=wild, colour=PropertyColour.RED))
+    assert g.actions_left == 1
+    # a double rent costs two actions, and is not offered with one left
+    a.hand.extend([rent := RentCard(brown | PropertyColour.PALEBLUE, 1)])
+    a.hand.append(double := DoubleTheRentCard())
+    with pytest.raises(IllegalAction):
+        g.check_action(
+            RentAction(
+                player=a,
+                card=rent,
+                propertyset=a.propertysets[brown],
+                double_rent=double,
+                quad_rent=None,
+                target=None,
+            )
+        )
+    rents = [x for x in generate_actions(g, a, 1) if isinstance(x, RentAction)]
+    assert rents and all(x.double_rent is None for x in rents)
+
+
+def test_validate_rejects_bad_rent_cards_and_moves() -> None:
+    a, b = Player("A"), Player("B")
+    g = Game(
+        [a, b],
+        variations=Variations.FORCE_UNPLACED_PROPERTY_AS_CASH
+        | Variations.ALLOW_QUAD_RENT,
+    )
+    g.actions_left = 3
+    brown = PropertyColour.BROWN
+    a.add_property(brown, okr := PropertyCard(brown, "Old Kent Road", 1))
+    rent = RentCard(brown | PropertyColour.PALEBLUE, 1)
+    a.hand = [rent, m := MoneyCard(1), double := DoubleTheRentCard()]
+    b.add_money(MoneyCard(5))
+    g.discarded.extend(MoneyCard(1) for _ in range(100))
+
+    def rent_with(d: object, q: object = None) -> RentAction:
+        return RentAction(
+            player=a,
+            card=rent,
+            propertyset=a.propertysets[brown],
+            double_rent=d,  # type: ignore[arg-type]
+            quad_rent=q,  # type: ignore[arg-type]
+            target=None,
+        )
+
+    illegal = [
+        # a money card, or the rent card itself, as a DoubleTheRent
+        rent_with(m),
+        rent_with(rent),
+        rent_with(double, rent),
+        rent_with(double, double),
+        # only wildcards move between sets
+        MovePropertyAction(
+            player=a,
+            card=okr,  # type: ignore[arg-type]
+            colour=PropertyColour.PALEBLUE,
+        ),
+    ]
+    for action in illegal:
+        with pytest.raises(IllegalAction):
+            g.step(action)
+    assert a.hand == [rent, m, double] and b.get_money() == 5
+    assert a.set_of(okr) is a.propertysets[brown]
+
+
+def test_validate_rejects_cycling_moves() -> None:
+    # free moves are only legal towards a better layout, so can not cycle
+    a, b = Player("A"), Player("B")
+    g = Game(
+        [a, b],
+        variations=Variations.FORCE_UNPLACED_PROPERTY_AS_CASH
+        | Variations.MOVABLE_BUILDINGS,
+    )
+    g.actions_left = 3
+    # keep the game's card count audit happy
+    g.discarded.extend(MoneyCard(1) for _ in range(103))
+    brown, paleblue = PropertyColour.BROWN, PropertyColour.PALEBLUE
+    darkblue = PropertyColour.DARKBLUE
+    wild = WildPropertyCard(paleblue | brown, 1)
+    a.add_property(paleblue, PropertyCard(paleblue, "Euston Road", 1))
+    a.add_property(paleblue, wild)
+    a.add_property(brown, PropertyCard(brown, "Old Kent Road", 1))
+
+    g.step(MovePropertyAction(player=a, card=wild, colour=brown))
+    for colour in (paleblue, brown):
+        with pytest.raises(IllegalAction):
+            g.step(MovePropertyAction(player=a, card=wild, colour=colour))
+    assert a.set_of(wild) is a.propertysets[brown]
+
+    a.add_property(brown, house := HouseCard())
+    for name in ("Park Lane", "Mayfair"):
+        a.add_property(darkblue, PropertyCard(darkblue, name, 4))
+    for _ in range(3):
+        g.discarded.pop()
+    g.step(MoveBuildingAction(player=a, source=a.propertysets[brown], colour=darkblue))
+    for colour in (brown, darkblue):
+        with pytest.raises(IllegalAction):
+            g.step(
+                MoveBuildingAction(
+                    player=a, source=a.propertysets[darkblue], colour=colour
+                )
+            )
+    assert a.propertysets[darkblue].house is house
+    assert g.actions_left == 3
@@ -0,0 +1,73 @@
+import random
+from collections.abc import Sequence
+
+import pytest
+
+from monodeal import Variations
+from monodeal.batch import BatchedPlayer, BatchScheduler, Decision, run_batched
+from monodeal.game import Game, quiet
+
+
+def make_games(scheduler: BatchScheduler, n: int) -> list[Game]:
+    return [
+        Game(
+            players=[BatchedPlayer("A", scheduler), BatchedPlayer("B", scheduler)],
+            random=random.Random(i),
+            variations=Variations.FORCE_UNPLACED_PROPERTY_AS_CASH,
+        )
+        for i in range(n)
+    ]
+
+
+def test_batches_across_games() -> None:
+    sizes: list[int] = []
+
+    def first_action(batch: Sequence[Decision]) -> list[int]:
+        sizes.append(len(batch))
+        assert len({id(d.game) for d in batch}) == len(batch)
+        return [0] * len(batch)
+
+    scheduler = BatchScheduler(first_action, max_batch=8, max_wait=0.01)
+    games = make_games(scheduler, 20)
+    winners = run_batched(games)
+
+    assert all(w.has_won() for w in winners)
+    assert max(sizes) == 8
+    assert scheduler.batches == len(sizes)
+    assert scheduler.decisions == sum(sizes)
+    assert scheduler.decisions / scheduler.batches > 4
+
+
+def test_evaluator_error_reaches_games() -> None:
+    def broken(batch: Sequence[Decision]) -> list[int]:
+        raise RuntimeError("model offline")
+
+    scheduler = BatchScheduler(broken, max_batch=4)
+    with pytest.raises(RuntimeError):
+        run_batched(make_games(scheduler, 4))
+
+
+def test_timed_out_decisions_are_skipped() -> None:
+    # the players give up long before a batch is flushed, so every decision
+    # falls back and the scheduler must leave their cancelled futures alone
+    scheduler = BatchScheduler(lambda batch: [0] * len(batch), max_wait=0.05)
+    games = [
+        Game(
+            players=[
+                BatchedPlayer("A", scheduler, timeout=0.001),
+                BatchedPlayer("B", scheduler, timeout=0.001),
+            ],
+            random=random.Random(i),
+            variations=Variations.FORCE_UNPLACED_PROPERTY_AS_CASH,
+        )
+        for i in range(3)
+    ]
+    with quiet():
+        winners = run_batched(games)
+    assert all(w.has_won() for w in winners)
+
+
+def test_evaluator_must_score_every_decision() -> None:
+    scheduler = BatchScheduler(lambda batch: [], max_batch=2)
+    with pytest.raises(ValueError, match="scored 0 of"):
+        run_batched(make_games(scheduler, 1))
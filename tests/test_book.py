@@ -0,0 +1,64 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from monodeal import Variations
+from monodeal.actions import seated_action_key
+from monodeal.book import (
+    OpeningBook,
+    OpeningBookMixin,
+    build_book,
+    hand_key,
+    write_book,
+)
+from monodeal.compare import deck_order
+from monodeal.deck import DECK, PropertyColour
+from monodeal.game import Game, Player, quiet
+
+VARIATIONS = Variations.FORCE_UNPLACED_PROPERTY_AS_CASH
+
+
+def test_table_round_trip(tmp_path: Path) -> None:
+    rng = random.Random(1)
+    plans = {
+        hand_key(rng.sample(DECK, 7)): (
+            ("PlayPropertyAction", "PropertyCard[GREEN]", PropertyColour.GREEN, 0, 0),
+            ("DebtCollectorAction", "DebtCollectorCard", None, i % 4 + 1, 0),
+            ("SkipAction", "", None, 0, 0),
+        )[: i % 3 + 1]
+        for i in range(200)
+    }
+    path = str(tmp_path / "test.book")
+    write_book(path, 2, VARIATIONS, plans)
+    book = OpeningBook(path)
+    assert len(book) == len(plans)
+    assert book.players == 2 and book.variations == VARIATIONS
+    for key, plan in plans.items():
+        assert book.lookup(key) == plan
+    assert book.lookup(bytes([0] * 7)) is None
+
+
+class BookPlayer(OpeningBookMixin, Player):
+    pass
+
+
+def test_player_follows_book(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = str(tmp_path / "opening.book")
+    assert build_book(path, [0, 0], rollouts=2) == 1
+    deck = deck_order(0)
+    plan = OpeningBook(path).lookup(hand_key(deck[0:10:2] + deck[10:12]))
+    assert plan is not None
+
+    monkeypatch.setattr(BookPlayer, "book_path", path)
+    a, b = BookPlayer("A"), Player("B")
+    g = Game([a, b], variations=VARIATIONS, deck=deck, seed=0)
+    played = []
+    with quiet():
+        g.start()
+        while g.current == 0 and g.turns == 0:
+            action = a.get_action(g, g.actions_left)
+            played.append(seated_action_key(g.players, action))
+            if g.step(action) is not None:
+                break
+    assert tuple(played[: len(plan)]) == plan
@@ -0,0 +1,105 @@
+import random
+import sys
+from pathlib import Path
+
+from monodeal import Variations
+from monodeal.bot import BotPool
+from monodeal.game import Game, quiet
+
+# a third-party bot: only needs json, never imports the engine
+FIRST_CHOICE_BOT = """
+import json, sys
+for line in sys.stdin:
+    msg = json.loads(line)
+    if msg["type"] == "action":
+        choice = 0
+    elif msg["type"] == "pay":
+        choice = list(range(len(msg["cards"])))
+    else:
+        continue
+    print(json.dumps({"seq": msg["seq"], "choice": choice}), flush=True)
+"""
+
+# replies that are valid JSON but not a choice
+MISBEHAVING_BOT = """
+import itertools, json, sys
+replies = itertools.cycle(["[]", "1", "null", "{{seq}}", '{{"seq": {seq}}}'])
+for line, reply in zip(sys.stdin, replies):
+    msg = json.loads(line)
+    if msg["type"] in ("action", "pay"):
+        print(reply.format(seq=msg["seq"]), flush=True)
+"""
+
+# the first bot asked for an action hangs; its restart and other bots play on
+HANGING_BOT = """
+import json, sys, time
+from pathlib import Path
+hung = Path(sys.argv[1])
+for line in sys.stdin:
+    msg = json.loads(line)
+    if msg["type"] == "action":
+        if not hung.exists():
+            hung.touch()
+            time.sleep(60)
+        choice = 0
+    elif msg["type"] == "pay":
+        choice = list(range(len(msg["cards"])))
+    else:
+        continue
+    print(json.dumps({"seq": msg["seq"], "choice": choice}), flush=True)
+"""
+
+
+def play(pool: BotPool, seed: int) -> None:
+    with pool.players(["A", "B"]) as players:
+        g = Game(
+            players=list(players),
+            random=random.Random(seed),
+            variations=Variations.FORCE_UNPLACED_PROPERTY_AS_CASH,
+        )
+        winner = g.play()
+        assert winner.has_won()
+
+
+def test_pool_reuses_processes(tmp_path: Path) -> None:
+    script = tmp_path / "bot.py"
+    script.write_text(FIRST_CHOICE_BOT)
+    with BotPool([sys.executable, str(script)]) as pool:
+        for seed in range(3):
+            play(pool, seed)
+        assert pool.spawned == 2
+        assert sorted(b.games for b in pool.idle) == [3, 3]
+
+
+def test_crashed_bot_falls_back(tmp_path: Path) -> None:
+    script = tmp_path / "bot.py"
+    script.write_text("import sys\nsys.exit(0)\n")
+    with BotPool([sys.executable, str(script)]) as pool:
+        play(pool, 1)
+        play(pool, 2)
+        # dead processes are replaced rather than returned to the pool
+        assert pool.spawned == 4
+
+
+def test_misbehaving_bot_falls_back(tmp_path: Path) -> None:
+    script = tmp_path / "bot.py"
+    script.write_text(MISBEHAVING_BOT)
+    with BotPool([sys.executable, str(script)]) as pool, quiet():
+        play(pool, 1)
+
+
+def test_hanging_bot_forfeits_turn(tmp_path: Path) -> None:
+    script = tmp_path / "bot.py"
+    script.write_text(HANGING_BOT)
+    command = [sys.executable, str(script), str(tmp_path / "hung")]
+    with BotPool(command, timeout=1) as pool, quiet():
+        with pool.players(["A", "B"]) as players:
+            g = Game(
+                players=list(players),
+                seed=1,
+                variations=Variations.FORCE_UNPLACED_PROPERTY_AS_CASH,
+            )
+            assert g.play().has_won()
+            assert sorted(p.forfeits for p in players) == [0, 1]
+            assert sorted(p.bot.restarts for p in players) == [0, 1]
+        assert pool.spawned == 2 and len(pool.idle) == 2
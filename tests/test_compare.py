@@ -0,0 +1,93 @@
+import math
+
+from monodeal import Action, GameProto, Variations
+from monodeal.actions import SkipAction
+from monodeal.compare import (
+    compare,
+    deck_order,
+    estimate,
+    hand_advantage,
+    mirrored_deck,
+    pair_llr,
+    play_pair,
+)
+from monodeal.game import Player
+
+
+class SkipPlayer(Player):
+    def get_action(self, game: GameProto, actions_left: int) -> Action:
+        return SkipAction(self)
+
+
+def test_pair_swaps_seats() -> None:
+    # identical strategies on the same deal: the same seat wins both games
+    assert play_pair(Player, Player, 3, Variations.FORCE_UNPLACED_PROPERTY_AS_CASH) in (
+        (1, 0),
+        (0, 1),
+    )
+
+
+def test_stops_early_on_mismatch() -> None:
+    result = compare(Player, SkipPlayer)
+    assert result.decision == "A"
+    assert result.games <= 20
+    assert result.win_rate == 1.0
+    assert result.low <= result.win_rate <= result.high
+
+    assert compare(SkipPlayer, Player).decision == "B"
+
+
+def test_undecided_within_budget() -> None:
+    result = compare(Player, Player, max_games=10)
+    assert result.decision is None
+    assert result.games == 10
+    assert result.win_rate == 0.5
+    assert result.llr < 0 and math.isclose(result.llr, result.llr_b)
+
+
+def test_identical_strategies_tie() -> None:
+    # every pair splits, which is evidence against either being better
+    result = compare(Player, Player)
+    assert result.decision == "tie"
+    assert result.games < 100
+    assert result.win_rate == 0.5
+
+
+def test_llr_counts_pairs_not_games() -> None:
+    def independent(scores: list[float]) -> float:
+        # as if each game were its own trial
+        wins = sum(2 * s for s in scores)
+        losses = 2 * len(scores) - wins
+        return wins * math.log(0.55 / 0.45) + losses * math.log(0.45 / 0.55)
+
+    # the deal decides both games: a pair is one trial, not two
+    swept = [1.0] * 6 + [0.0] * 4
+    assert 0 < pair_llr(swept, 0.45, 0.55) < independent(swept) / 1.5
+    # the deal cancels out: the one decided pair is stronger evidence
+    split = [1.0] + [0.5] * 9
+    assert pair_llr(split, 0.45, 0.55) > 1.5 * independent(split)
+    assert pair_llr([0.5] * 10, 0.45, 0.55) == 0
+
+
+def test_mirrored_deck_swaps_opening_hands() -> None:
+    deck = deck_order(1)
+    mirror = mirrored_deck(deck)
+    assert mirror[0:10:2] == deck[1:10:2]
+    assert mirror[1:10:2] == deck[0:10:2]
+    assert mirror[10:] == deck[10:]
+    assert hand_advantage(mirror) == -hand_advantage(deck)
+
+
+def test_paired_designs_cancel_deal_luck() -> None:
+    # identical strategies: every pair splits, so the estimate has no variance
+    for design in ("paired", "antithetic", "stratified"):
+        est = estimate(Player, Player, groups=4, design=design)
+        assert math.isclose(est.win_rate, 0.5)
+        assert est.variance == 0
+        assert est.variance_reduction == math.inf
+        low, high = est.interval()
+        assert math.isclose(low, 0.5) and math.isclose(high, 0.5)
+
+    est = estimate(Player, SkipPlayer, groups=4, design="antithetic")
+    assert est.games == 16
+    assert est.win_rate == 1.0
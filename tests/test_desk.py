@@ -1,10 +1,18 @@
+import copy
+import random
+
 from monodeal.deck import (
     ACTION_CARDS,
+    CARD_KINDS,
     DECK,
     MONEY_DECK,
     PROPERTY_DECK,
     PROPERTY_WILDCARDS,
     RENT_CARDS,
+    DrawPile,
+    Hand,
+    JustSayNoCard,
+    MoneyCard,
 )
 
 
@@ -20,3 +28,44 @@ def test_deck() -> None:
 
     # trap any equals or duplicate members
     assert len(set(DECK)) == 106
+
+
+def test_card_kinds() -> None:
+    assert len(CARD_KINDS) == 40
+    assert CARD_KINDS[0] == "MoneyCard[1]"
+    assert "PropertyCard[GREEN]" in CARD_KINDS
+    assert sum(1 for c in DECK if c.kind == "PropertyCard[GREEN]") == 3
+
+
+def test_hand_counts() -> None:
+    jsn, m1 = JustSayNoCard(), MoneyCard(1)
+    hand = Hand([jsn, m1])
+    hand += [JustSayNoCard()]
+    assert hand.count_of("JustSayNoCard") == 2
+    assert hand.first_of("JustSayNoCard") is jsn
+    hand.remove(jsn)
+    hand.pop()
+    assert hand.count_of("JustSayNoCard") == 0
+    assert hand.first_of("JustSayNoCard") is None
+
+    # copies recount rather than double up
+    hand.append(jsn)
+    clone = copy.deepcopy(hand)
+    assert isinstance(clone, Hand) and clone.counts == hand.counts
+    hand.clear()
+    assert not hand.counts and clone.count_of("MoneyCard[1]") == 1
+
+
+def test_draw_pile() -> None:
+    pile = DrawPile(DECK[:3])
+    assert list(pile) == DECK[:3] and len(pile) == 3
+    assert pile.deal() is DECK[0]
+    assert list(pile) == DECK[1:3]
+    pile.extend([extra := MoneyCard(1)])
+    assert len(pile) == 3
+
+    # a refill reuses the slots of known cards
+    pile.refill([DECK[0], extra], random.Random(1))
+    assert sorted(pile.order) == [0, 3] and pile.cursor == 0
+    assert {pile.deal(), pile.deal()} == {DECK[0], extra}
+    assert len(pile) == 0
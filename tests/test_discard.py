@@ -0,0 +1,68 @@
+from monodeal.deck import (
+    DealBreakerCard,
+    DoubleTheRentCard,
+    JustSayNoCard,
+    MoneyCard,
+    PropertyCard,
+    PropertyColour,
+    RentCard,
+    WildPropertyCard,
+)
+from monodeal.discard import choose_discards
+from monodeal.game import Player
+
+
+def test_keeps_action_cards_over_small_money() -> None:
+    p = Player("test")
+    jsn = JustSayNoCard()
+    dbc = DealBreakerCard()
+    m1a, m1b, m5 = MoneyCard(1), MoneyCard(1), MoneyCard(5)
+    p.hand = [jsn, dbc, m1a, m5, m1b]
+
+    assert sorted(map(id, p.get_discards(2))) == sorted(map(id, [m1a, m1b]))
+    assert p.hand == [jsn, dbc, m5]
+
+
+def test_keeps_card_that_completes_a_set() -> None:
+    p = Player("test")
+    g1 = PropertyCard(PropertyColour.GREEN, "G1", 4)
+    g2 = PropertyCard(PropertyColour.GREEN, "G2", 4)
+    g3 = PropertyCard(PropertyColour.GREEN, "G3", 4)
+    b1 = PropertyCard(PropertyColour.BROWN, "B1", 1)
+    p.add_property(PropertyColour.GREEN, g1)
+    p.add_property(PropertyColour.GREEN, g2)
+    m3 = MoneyCard(3)
+
+    # a lone brown is worth less than the green that completes the set
+    assert choose_discards([g3, b1, m3], 1, p.propertysets) == [b1]
+    assert choose_discards([g3, b1, m3], 2, p.propertysets) == [b1, m3]
+
+
+def test_completion_counted_once_per_colour() -> None:
+    # either brown completes the set, so the second is only worth its cash
+    p = Player("test")
+    brown = PropertyColour.BROWN
+    p.add_property(brown, PropertyCard(brown, "Old Kent Road", 1))
+    okr = PropertyCard(brown, "Whitechapel Road", 1)
+    wild = WildPropertyCard(brown | PropertyColour.PALEBLUE, 1)
+    m5 = MoneyCard(5)
+    assert choose_discards([okr, wild, m5], 1, p.propertysets) == [wild]
+    assert choose_discards([wild, m5], 1, p.propertysets) == [m5]
+
+
+def test_double_rent_needs_rent_card() -> None:
+    p = Player("test")
+    dtr = DoubleTheRentCard()
+    rent = RentCard(PropertyColour.GREEN | PropertyColour.DARKBLUE, 1)
+    m2 = MoneyCard(2)
+    assert choose_discards([dtr, m2], 1, p.propertysets) == [dtr]
+    p.add_property(PropertyColour.GREEN, PropertyCard(PropertyColour.GREEN, "G", 4))
+    assert choose_discards([dtr, rent, m2, MoneyCard(1)], 1, p.propertysets) != [dtr]
+
+
+def test_discard_counts() -> None:
+    hand = [MoneyCard(v) for v in (1, 2, 3, 4, 5, 10, 1, 2, 3)]
+    assert choose_discards(hand, 0, {}) == []
+    assert len(choose_discards(hand, 2, {})) == 2
+    assert choose_discards(hand, 9, {}) == hand
+    assert sorted(c.cash for c in choose_discards(hand, 3, {})) == [1, 1, 2]
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from monodeal import Variations
+from monodeal.actions import SkipAction, generate_actions
+from monodeal.deck import KIND_INDEX, MoneyCard, PropertyCard, PropertyColour
+from monodeal.game import Game, Player
+
+np = pytest.importorskip("numpy")
+encode = pytest.importorskip("monodeal.encode")
+
+
+def test_observation_layout() -> None:
+    a = Player("A")
+    b = Player("B")
+    g = Game([a, b])
+    a.deal_card(MoneyCard(1))
+    a.deal_card(MoneyCard(1))
+    b.add_money(MoneyCard(5))
+    b.add_property(PropertyColour.BROWN, PropertyCard(PropertyColour.BROWN, "x", 1))
+    b.add_property(PropertyColour.BROWN, PropertyCard(PropertyColour.BROWN, "y", 1))
+
+    out = encode.new_observation()
+    encode.encode_observation(g, a, 2, out)
+    assert out[encode.HAND_OFFSET + KIND_INDEX["MoneyCard[1]"]] == 2
+    assert out[encode.SEAT_OFFSET + 1] == 2  # own hand size
+
+    # opponent is the second seat
+    base = encode.SEAT_OFFSET + encode.SEAT_SIZE
+    brown = base + 2 + 4 * encode.COLOUR_INDEX[PropertyColour.BROWN]
+    assert out[base] == 5
+    assert list(out[brown : brown + 4]) == [2, 1, 0, 0]
+    assert out[encode.GLOBAL_OFFSET + 2] == 2
+
+    # buffer is fully overwritten on reuse
+    encode.encode_observation(g, b, 3, out)
+    assert out[encode.HAND_OFFSET + KIND_INDEX["MoneyCard[1]"]] == 0
+    assert out[encode.SEAT_OFFSET] == 5
+
+
+def test_action_mask_covers_generated_actions() -> None:
+    out = encode.new_observation()
+    mask = encode.new_action_mask()
+    rng = random.Random(5)
+    for seed in range(5):
+        players = [Player(n) for n in "ABC"]
+        g = Game(
+            players=list(players),
+            random=random.Random(seed),
+            variations=Variations.FORCE_UNPLACED_PROPERTY_AS_CASH
+            | Variations.ALLOW_QUAD_RENT,
+        )
+        g.start()
+        winner = None
+        while winner is None:
+            p = g.current_player()
+            actions = generate_actions(g, p, g.actions_left)
+            actions.append(SkipAction(p))
+            encode.encode_observation(g, p, g.actions_left, out)
+            indices = encode.encode_actions(g, actions, mask)
+            assert mask.sum() == len(set(indices))
+            choice = rng.choice(indices)
+            action = encode.decode_action(actions, indices, choice)
+            assert encode.ACTION_INDEX[encode.action_key(g, action)] == choice
+            winner = g.step(action)
@@ -0,0 +1,114 @@
+import random
+
+from monodeal.actions import PlayPropertyAction
+from monodeal.deck import DECK, Card, PropertyCard, PropertyColour
+from monodeal.endgame import (
+    LOSS,
+    UNKNOWN,
+    WIN,
+    EndgamePlayer,
+    EndgameSolver,
+    determinize,
+)
+from monodeal.game import Game, Player
+
+PC = PropertyColour
+
+
+def take(pool: list[Card], kind: str) -> Card:
+    card = next(c for c in pool if c.kind == kind)
+    pool.remove(card)
+    return card
+
+
+def place(pool: list[Card], p: Player, colour: PropertyColour, n: int) -> None:
+    for _ in range(n):
+        card = take(pool, f"PropertyCard[{colour.name}]")
+        assert isinstance(card, PropertyCard)
+        p.add_property(colour, card)
+
+
+def endgame(winner_to_move: bool) -> tuple[Game, EndgamePlayer, Player]:
+    # the player with BROWN, UTILITY and one DARKBLUE holds the other DARKBLUE
+    pool = list(DECK)
+    a, b = EndgamePlayer("A"), Player("B")
+    strong, weak = (a, b) if winner_to_move else (b, a)
+    place(pool, strong, PC.BROWN, 2)
+    place(pool, strong, PC.UTILITY, 2)
+    place(pool, strong, PC.DARKBLUE, 1)
+    strong.hand = [take(pool, "PropertyCard[DARKBLUE]")]
+    weak.hand = [take(pool, "MoneyCard[1]")]
+
+    g = Game([a, b])
+    g.draw.extend(take(pool, "MoneyCard[2]") for _ in range(4))
+    g.discarded.extend(pool)
+    g.actions_left = 3
+    return g, a, b
+
+
+def test_finds_winning_move() -> None:
+    g, a, _ = endgame(winner_to_move=True)
+    result = EndgameSolver(max_depth=4).solve(g)
+    values = {type(act).__name__: v for act, v in result.values}
+    assert values["PlayPropertyAction"] == WIN
+    assert isinstance(result.best(), PlayPropertyAction)
+    assert isinstance(a.get_action(g, 3), PlayPropertyAction)
+    # the search works on copies, the real game is untouched
+    assert len(a.hand) == 1
+    assert not a.has_won()
+
+
+def test_proves_forced_loss() -> None:
+    g, _, _ = endgame(winner_to_move=False)
+    result = EndgameSolver(max_depth=5).solve(g)
+    assert [v for _, v in result.values] == [LOSS] * len(result.values)
+    assert result.depth <= 5
+
+
+def test_node_budget() -> None:
+    g, _, _ = endgame(winner_to_move=False)
+    result = EndgameSolver(max_nodes=3, max_depth=5).solve(g)
+    assert result.nodes <= 3 + len(result.values)
+    assert UNKNOWN in [v for _, v in result.values]
+
+
+def lucky_draw() -> tuple[Game, EndgamePlayer, Player]:
+    # A wins only if it draws the last DARKBLUE, which is the third card down
+    pool = list(DECK)
+    a, b = EndgamePlayer("A"), Player("B")
+    place(pool, a, PC.BROWN, 2)
+    place(pool, a, PC.UTILITY, 2)
+    place(pool, a, PC.DARKBLUE, 1)
+    a.hand = [take(pool, "MoneyCard[1]")]
+    b.hand = [take(pool, "MoneyCard[1]")]
+
+    g = Game([a, b], seed=1)
+    draws = ["MoneyCard[2]", "MoneyCard[2]", "PropertyCard[DARKBLUE]", "MoneyCard[2]"]
+    g.draw.extend(take(pool, kind) for kind in draws)
+    g.discarded.extend(pool)
+    g.actions_left = 3
+    g.recount_unseen()
+    return g, a, b
+
+
+def test_determinize_deals_only_unseen_cards() -> None:
+    g, a, b = lucky_draw()
+    draw, hand = list(g.draw), list(b.hand)
+    kinds = sorted(c.kind for c in [*draw, *hand])
+    for seed in range(5):
+        d = determinize(g, a, random.Random(seed))
+        da, db = d.players
+        assert [c.kind for c in da.hand] == [c.kind for c in a.hand]
+        assert len(d.draw) == len(draw) and len(db.hand) == len(hand)
+        assert sorted(c.kind for c in [*d.draw, *db.hand]) == kinds
+        assert d.unseen_cards(da).total == len(kinds)
+    # the real game is untouched
+    assert list(g.draw) == draw and list(b.hand) == hand
+
+
+def test_player_does_not_peek() -> None:
+    g, a, _ = lucky_draw()
+    # the real draw order wins whatever A does
+    assert {v for _, v in EndgameSolver().solve(g).values} == {WIN}
+    # but not every deal of the cards A has not seen does
+    assert WIN not in {v for _, v in a.solve(g)}
@@ -0,0 +1,48 @@
+from typing import Any
+
+import pytest
+
+np = pytest.importorskip("numpy")
+env_module = pytest.importorskip("monodeal.env")
+encode = pytest.importorskip("monodeal.encode")
+
+
+def first_legal(masks: Any) -> Any:
+    return masks.argmax(axis=1)
+
+
+def test_vector_env_auto_reset() -> None:
+    env = env_module.VectorEnv(4, num_players=3, seed=1)
+    obs, masks = env.reset()
+    assert obs.shape == (4, encode.OBS_SIZE)
+    assert masks.shape == (4, encode.ACTION_SIZE)
+    assert masks.any(axis=1).all()
+
+    finished = 0
+    rng = np.random.default_rng(0)
+    for _ in range(2000):
+        choices = [rng.choice(np.flatnonzero(m)) for m in masks]
+        obs, masks, rewards, dones, infos = env.step(choices)
+        for r, d, info in zip(rewards, dones, infos):
+            if d:
+                finished += 1
+                assert r in (1, -1)
+                assert (r == 1) == (info["winner"] == "learner")
+            else:
+                assert r == 0
+        # auto reset always leaves a legal action for every environment
+        assert masks.any(axis=1).all()
+        if finished >= 4:
+            break
+    assert finished >= 4
+
+
+def test_vector_env_is_reproducible() -> None:
+    a = env_module.VectorEnv(2, seed=7)
+    b = env_module.VectorEnv(2, seed=7)
+    obs_a, masks_a = a.reset()
+    obs_b, masks_b = b.reset()
+    for _ in range(20):
+        assert (obs_a == obs_b).all()
+        obs_a, masks_a, *_ = a.step(first_legal(masks_a))
+        obs_b, masks_b, *_ = b.step(first_legal(masks_b))
@@ -0,0 +1,42 @@
+import math
+
+from monodeal import Variations
+from monodeal.deck import PROPERTY_DECK, MoneyCard, PropertyColour
+from monodeal.evaluate import Evaluator, features, recount_features
+from monodeal.game import Game, Player, RandomPlayer, quiet
+
+
+def test_running_features_match_recount() -> None:
+    variations = (
+        Variations.FORCE_UNPLACED_PROPERTY_AS_CASH
+        | Variations.SEPARATE_PROPERTY_SETS
+        | Variations.MOVABLE_BUILDINGS
+        | Variations.FORFEIT_BUILDINGS
+    )
+    incremental, full = Evaluator(), Evaluator(full=True)
+    for seed in range(3):
+        players: list[Player] = [RandomPlayer(n) for n in "ABC"]
+        g = Game(players, variations=variations, seed=seed)
+        with quiet():
+            g.start()
+            while g.step(g.current_player().get_action(g, g.actions_left)) is None:
+                for p in players:
+                    assert features(p) == recount_features(p)
+                    assert math.isclose(incremental(g, p), full(g, p))
+
+
+def test_evaluator() -> None:
+    a, b = Player("A"), Player("B")
+    g = Game([a, b])
+    brown = [c for c in PROPERTY_DECK if c.colour == PropertyColour.BROWN]
+    a.add_property(PropertyColour.BROWN, brown[0])
+    b.add_money(MoneyCard(2))
+    assert features(a).near_complete == 1
+    assert features(a).rent == 1
+
+    e = Evaluator(complete=10, near_complete=3, rent=1, bank=1, actions=0)
+    assert e(g, a) == 3 + 1 - 2
+    a.add_property(PropertyColour.BROWN, brown[1])
+    assert features(a).complete == 1 and features(a).near_complete == 0
+    assert e(g, a) == 10 + 2 - 2
+    assert e(g, b) == -e(g, a)
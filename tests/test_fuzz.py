@@ -0,0 +1,91 @@
+import pytest
+
+from monodeal import Variations
+from monodeal.fuzz import (
+    Case,
+    InvariantError,
+    check_invariants,
+    fuzz,
+    random_case,
+    replay,
+    shrink,
+)
+from monodeal.game import Game, Player, quiet
+from monodeal.payment import PaymentSchedule
+
+
+def test_random_games_hold_invariants() -> None:
+    assert [s for s in range(8) if random_case(s) is not None] == []
+    assert fuzz(4, seed=8) == []
+
+
+def test_check_invariants_catches_corruption() -> None:
+    g = Game(
+        [Player("A"), Player("B")],
+        variations=Variations.FORCE_UNPLACED_PROPERTY_AS_CASH,
+        seed=0,
+    )
+    with quiet():
+        g.start()
+    check_invariants(g)
+
+    card = g.players[1].hand[0]
+    g.players[0].hand.append(card)
+    with pytest.raises(InvariantError, match="107 cards, not 106"):
+        check_invariants(g, deep=False)
+    g.players[0].hand.remove(card)
+
+    # a card in two places is only caught by the deep checks while the count holds
+    a = g.players[0]
+    own = a.hand[0]
+    a.hand.remove(own)
+    a.hand.append(card)
+    check_invariants(g, deep=False)
+    with pytest.raises(InvariantError, match="in Player A hand and Player B hand"):
+        check_invariants(g)
+    a.hand.remove(card)
+    a.hand.append(own)
+
+    g.players[1].bank_value += 1
+    with pytest.raises(InvariantError, match="Player B bank value"):
+        check_invariants(g)
+    g.players[1].bank_value -= 1
+
+    # a stale payment schedule is only caught by the deep checks
+    p = g.players[0]
+    money = next(c for c in p.hand if c.cash)
+    p._payments = PaymentSchedule([money], [], p.propertysets)
+    check_invariants(g, deep=False)
+    with pytest.raises(InvariantError, match="Player A payments"):
+        check_invariants(g)
+
+
+def test_stranding_wildcard_move() -> None:
+    # found by the fuzzer: moving a wild off a set with a house left the house
+    # on an incomplete set
+    case = Case(
+        16,
+        Variations(95),
+        2,
+        [0, 0, 1, 0, 3, 3, 1, 2, 0, 3, 0, 1, 0, 0, 4, 4, 1, 1, 1, 11264, 45584, 2]
+        + [2, 4, 1, 8, 2, 2, 0, 3, 3, 0, 1, 2, 7, 2, 0, 2, 0, 4, 2, 0, 1, 1, 2]
+        + [1, 2, 0, 0, 0, 0],
+    )
+    assert replay(case) is None
+
+
+def test_shrink(monkeypatch: pytest.MonkeyPatch) -> None:
+    # a failure at the third turn of any game shrinks to the fewest choices
+    # reaching it, on the smallest seed
+    def late(g: Game, winner: Player | None) -> None:
+        if g.turns >= 3:
+            raise InvariantError("late")
+
+    monkeypatch.setattr("monodeal.fuzz.check_winner", late)
+    case = Case(5, Variations.FORCE_UNPLACED_PROPERTY_AS_CASH, 2, [7] * 40)
+    assert replay(case) is not None
+    shrunk = shrink(case)
+    assert shrunk.seed == 0
+    assert len(shrunk.choices) < 40
+    assert replay(shrunk) is not None
+    assert set(shrunk.choices) == {0}
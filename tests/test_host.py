@@ -0,0 +1,88 @@
+import asyncio
+import json
+import random
+import socket
+
+from monodeal import Action, Variations
+from monodeal.actions import DepositAction
+from monodeal.game import Game
+from monodeal.host import AsyncPlayer, StreamPlayer, run_tables
+
+
+def make_game(players: list[AsyncPlayer], seed: int) -> Game:
+    return Game(
+        players=list(players),
+        random=random.Random(seed),
+        variations=Variations.FORCE_UNPLACED_PROPERTY_AS_CASH,
+    )
+
+
+def test_many_tables() -> None:
+    games = [make_game([AsyncPlayer("A"), AsyncPlayer("B")], i) for i in range(50)]
+    winners = asyncio.run(run_tables(games))
+    assert len(winners) == 50
+    for g, w in zip(games, winners):
+        assert w in g.players
+        assert w.has_won()
+
+
+class SlowPlayer(AsyncPlayer):
+    async def decide_action(self, game: Game, actions_left: int) -> Action:
+        await asyncio.sleep(10)
+        raise AssertionError("should have timed out")
+
+
+def test_timeout_uses_fallback() -> None:
+    games = [make_game([SlowPlayer("A", timeout=0.001), AsyncPlayer("B")], 1)]
+    winners = asyncio.run(run_tables(games))
+    assert winners[0].has_won()
+
+
+class CheatingPlayer(AsyncPlayer):
+    async def decide_action(self, game: Game, actions_left: int) -> Action:
+        # bank a card from an opponent's hand
+        op = game.get_opposition(self)[0]
+        return DepositAction(player=self, card=op.hand[0])
+
+
+def test_illegal_action_uses_fallback() -> None:
+    games = [make_game([CheatingPlayer("A"), AsyncPlayer("B")], 1)]
+    winners = asyncio.run(run_tables(games))
+    assert winners[0].has_won()
+
+
+async def first_choice_bot(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    # remote end: always pick the first action, pay with every payable card
+    while line := await reader.readline():
+        msg = json.loads(line)
+        if msg["type"] == "action":
+            choice: object = 0
+        else:
+            choice = list(range(len(msg["cards"])))
+        writer.write(
+            (json.dumps({"seq": msg["seq"], "choice": choice}) + "\n").encode()
+        )
+        await writer.drain()
+    writer.close()
+
+
+async def play_over_socket() -> tuple[Game, StreamPlayer]:
+    host_sock, bot_sock = socket.socketpair()
+    reader, writer = await asyncio.open_connection(sock=host_sock)
+    bot_reader, bot_writer = await asyncio.open_connection(sock=bot_sock)
+    bot = asyncio.create_task(first_choice_bot(bot_reader, bot_writer))
+
+    remote = StreamPlayer("R", reader, writer, timeout=5)
+    g = make_game([remote, AsyncPlayer("L")], 3)
+    await run_tables([g])
+    writer.close()
+    await bot
+    return g, remote
+
+
+def test_stream_player() -> None:
+    g, remote = asyncio.run(play_over_socket())
+    assert remote.seq > 0
+    assert any(p.has_won() for p in g.players)
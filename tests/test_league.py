@@ -0,0 +1,69 @@
+import io
+import math
+import random
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from monodeal.compare import Strategy
+from monodeal.game import Player, RandomPlayer
+from monodeal.league import League, expected, run_league, write_leaderboard
+
+STRATEGIES: dict[str, Strategy] = {
+    "heuristic": Player,
+    "random": RandomPlayer,
+    "other": RandomPlayer,
+}
+
+
+def test_record() -> None:
+    league = League(["a", "b", "c"])
+    league.record(["a", "b"], "a")
+    assert league.ratings["a"].rating > 1500 > league.ratings["b"].rating
+    assert math.isclose(league.ratings["a"].rating + league.ratings["b"].rating, 3000)
+
+    # a three seat win is worth the same K, shared between the two losers
+    league.record(["a", "b", "c"], "c")
+    assert sum(r.rating for r in league.ratings.values()) == 4500
+    assert [r.games for r in league.ratings.values()] == [2, 2, 1]
+    assert expected(1600, 1600) == 0.5
+
+
+def test_pick_prefers_informative_matches() -> None:
+    league = League(["new", "close", "far"])
+    for name, rating in ("close", 1520.0), ("far", 1900.0):
+        league.ratings[name].rating = rating
+        league.ratings[name].games = 10
+    seats = league.pick(2, random.Random(0))
+    assert sorted(seats) == ["close", "new"]
+    assert len(league.pick(5, random.Random(0))) == 3
+
+
+def test_pick_spreads_a_batch() -> None:
+    # picks made before any result is in do not repeat one match-up
+    league = League([f"s{i}" for i in range(50)])
+    rng = random.Random(0)
+    picks = [frozenset(league.pick(2, rng)) for _ in range(16)]
+    assert len(set(picks)) == 16
+    assert max(league.pending.values()) <= 2 * 2
+    assert sum(league.pending.values()) == 64
+
+
+def run(executor: Executor | None) -> League:
+    league = League(list(STRATEGIES))
+    run_league(league, STRATEGIES, 6, sizes=[2, 3], batch=4, executor=executor)
+    # two and three seat matches, each game once per seat rotation
+    assert sum(r.games for r in league.ratings.values()) == 3 * 2 * 2 + 3 * 3 * 3
+    assert sum(r.wins for r in league.ratings.values()) == 3 * 2 + 3 * 3
+    assert not +league.pending and not +league.pending_pairs
+    return league
+
+
+def test_run_league() -> None:
+    league = run(None)
+    with ProcessPoolExecutor(2) as executor:
+        run(executor)
+
+    out = io.StringIO()
+    write_leaderboard(league, out)
+    lines = out.getvalue().splitlines()
+    assert lines[0].split() == ["strategy", "rating", "games", "win_rate"]
+    assert sorted(line.split()[0] for line in lines[1:]) == sorted(STRATEGIES)
@@ -0,0 +1,97 @@
+from pathlib import Path
+
+import pytest
+
+from monodeal import Variations
+from monodeal.endgame import position_key
+from monodeal.game import Game, Player, RandomPlayer, quiet
+from monodeal.notation import format_position, parse_position
+
+
+def midgame(steps: int) -> Game:
+    g = Game(
+        [Player("A"), RandomPlayer("B"), Player("C")],
+        variations=Variations.FORCE_UNPLACED_PROPERTY_AS_CASH
+        | Variations.SEPARATE_PROPERTY_SETS,
+        seed=5,
+    )
+    with quiet():
+        g.start()
+        for _ in range(steps):
+            p = g.current_player()
+            assert g.step(p.get_action(g, g.actions_left)) is None
+    return g
+
+
+def test_round_trip() -> None:
+    for steps in (0, 10, 40):
+        g = midgame(steps)
+        text = format_position(g)
+        loaded = parse_position(text)
+        assert format_position(loaded) == text
+        assert position_key(loaded) == position_key(g)
+        assert [p.name for p in loaded.players] == ["A", "B", "C"]
+        assert loaded.variations == g.variations
+
+    # the loaded position plays on
+    with quiet():
+        loaded.audit()
+        p = loaded.current_player()
+        loaded.step(p.get_action(loaded, loaded.actions_left))
+
+
+def test_sets_and_wilds() -> None:
+    text = "- 1.2.3 - - A/-/-/-/GR:GR,GR,GR,hs;GR:WGRDB B/no,x2/10/ht/RD:RD,W*;RD:RD"
+    g = parse_position(text, players=[Player("X"), Player("Y")])
+    assert format_position(g) == text.replace("A/", "X/").replace("B/", "Y/")
+    x, y = g.players
+    assert g.current == 1 and g.actions_left == 2 and g.turns == 3
+    assert len(x.propertysets.complete) == 1
+    assert len(x.propertysets.sets(next(iter(x.propertysets)))) == 2
+    assert y.hand.count_of("JustSayNoCard") == 1
+    assert len(y.unallocated_buildings) == 1
+
+
+def test_rejects_bad_positions() -> None:
+    with pytest.raises(ValueError):
+        parse_position("- 0.3.0 zz - A/-/-/-/-")
+    with pytest.raises(ValueError):
+        parse_position("- 0.3.0 - - A/-/-/-/GR:hs")
+    with pytest.raises(ValueError):
+        parse_position("- 0.3.0 - - A/10,10/-/-/-")
+    with pytest.raises(ValueError):
+        parse_position("- 2.3.0 - - A/-/-/-/-")
+    # cards in a zone that can not hold them
+    with pytest.raises(ValueError, match="not a building"):
+        parse_position("- 0.3.0 - - A/-/-/1/-")
+    with pytest.raises(ValueError, match="property set"):
+        parse_position("- 0.3.0 - - A/-/-/-/BR:1")
+
+
+def test_crash_dump_loads(
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    g = midgame(10)
+    capsys.readouterr()
+    monkeypatch.setenv("MONODEAL_CRASH_DIR", str(tmp_path))
+    g.dump_state()
+    dumped = capsys.readouterr().out.splitlines()[-1]
+    assert format_position(parse_position(dumped)) == format_position(g)
+    (written,) = tmp_path.iterdir()
+    assert written.read_text().strip() == dumped
+
+
+def test_crash_dump_of_unwritable_names(capsys: pytest.CaptureFixture[str]) -> None:
+    # names the notation can not hold fall back to a readable dump
+    g = Game(
+        [Player("Ann Lee"), Player("B/2")],
+        variations=Variations.FORCE_UNPLACED_PROPERTY_AS_CASH,
+        seed=1,
+    )
+    with quiet():
+        g.start()
+    g.dump_state()
+    out = capsys.readouterr().out
+    assert "Player Ann Lee" in out and "    hand: [" in out
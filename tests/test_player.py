@@ -1,11 +1,14 @@
+from monodeal import Variations
 from monodeal.deck import (
     PROPERTY_DECK,
+    JustSayNoCard,
     MoneyCard,
     PropertyCard,
     PropertyColour,
     WildPropertyCard,
 )
-from monodeal.game import Player
+from monodeal.game import Game, Player, RandomPlayer, cash_value, quiet
+from monodeal.propertyset import PropertySet
 
 
 def test_haswon() -> None:
@@ -22,6 +25,26 @@ def test_haswon() -> None:
     assert p.has_won()
 
 
+def test_haswon_counts_colours() -> None:
+    # two complete brown sets and a dark blue one are only two colours
+    p = Player("test")
+    brown, darkblue = PropertyColour.BROWN, PropertyColour.DARKBLUE
+    for _ in range(2):
+        stolen = PropertySet(brown)
+        for name in ("Old Kent Road", "Whitechapel Road"):
+            stolen.add_property(PropertyCard(brown, name, 1))
+        p.keep_property_set(stolen)
+    for name in ("Park Lane", "Mayfair"):
+        p.add_property(darkblue, PropertyCard(darkblue, name, 4))
+    assert len(p.propertysets.complete) == 3
+    assert not p.has_won()
+
+    green = PropertyColour.GREEN
+    for name in ("Regent Street", "Oxford Street", "Bond Street"):
+        p.add_property(green, PropertyCard(green, name, 4))
+    assert p.has_won()
+
+
 def test_money_5_1() -> None:
     p = Player("test")
     p.add_money(mc5 := MoneyCard(5))
@@ -157,3 +180,70 @@ def test_money_WPC() -> None:
     p.add_property(PropertyColour.BROWN, pc2)
     cards = p.choose_how_to_pay(5)
     assert cards == [pc2]
+
+
+def test_liquidity_index() -> None:
+    # the running totals agree with the cards, through payments, deal breakers,
+    # forfeits and the rest of a game
+    variations = (
+        Variations.FORCE_UNPLACED_PROPERTY_AS_CASH
+        | Variations.SEPARATE_PROPERTY_SETS
+        | Variations.FORFEIT_BUILDINGS_TO_BANK
+    )
+    for seed in range(3):
+        players: list[Player] = [RandomPlayer(n) for n in "ABC"]
+        g = Game(players, variations=variations, seed=seed)
+        with quiet():
+            g.start()
+            while g.step(g.current_player().get_action(g, g.actions_left)) is None:
+                for p in players:
+                    assert p.get_money() == cash_value(p.cash)
+                    assert p.get_property_as_cash() == cash_value(
+                        [*p.cards_to_ps, *p.unallocated_buildings]
+                    )
+
+
+def test_rank_targets() -> None:
+    a, b, c = Player("A"), Player("B"), Player("C")
+    g = Game([a, b, c])
+    b.add_money(MoneyCard(2))
+    c.add_money(MoneyCard(1))
+    c.add_property(PropertyColour.GREEN, PROPERTY_DECK[-3])
+    assert g.rank_targets(a, 3) == [(c, 3), (b, 2)]
+
+    # a charge worth stopping is not collected from a player who can stop it
+    c.deal_card(JustSayNoCard())
+    assert g.rank_targets(a, 5) == [(b, 2), (c, 0)]
+    a.deal_card(JustSayNoCard())
+    assert g.rank_targets(a, 5) == [(c, 5), (b, 2)]
+
+
+def test_payment_schedule() -> None:
+    p = Player("test")
+    p.add_money(mc3 := MoneyCard(3))
+    p.add_money(mc1 := MoneyCard(1))
+    pc1 = PropertyCard(PropertyColour.RED, "Red Property1", 3)
+    p.add_property(pc1.colour, pc1)
+    greens = [PropertyCard(PropertyColour.GREEN, f"Green {i}", 4) for i in range(3)]
+    for pc in greens:
+        p.add_property(pc.colour, pc)
+
+    schedule = p.payment_schedule()
+    assert schedule.total == 19
+    assert p.payment_schedule() is schedule
+    # what each amount costs: complete sets and rent lost, and cash handed over
+    pain = [(s.complete_lost, s.rent_lost, s.paid) for s in schedule.payments]
+    assert pain[:5] == [(0, 0, 0), (0, 0, 1), (0, 0, 3), (0, 0, 3), (0, 0, 4)]
+    assert pain[7] == (0, 2, 7)
+    assert pain[8] == (1, 3, 8)
+    assert schedule[8].cards == (mc3, mc1, greens[0])
+    assert schedule[50] == schedule[19]
+    assert set(schedule[19].cards) == {mc3, mc1, pc1, *greens}
+
+    # every amount is covered, or everything handed over
+    assert all(s.paid >= min(a, 19) for a, s in enumerate(schedule.payments))
+
+    # kept until the holdings change
+    p.remove(mc1)
+    assert p.payment_schedule() is not schedule
+    assert p.payment_schedule().total == 18
@@ -9,7 +9,7 @@ from monodeal.deck import (
     PropertyColour,
     WildPropertyCard,
 )
-from monodeal.propertyset import PropertySet
+from monodeal.propertyset import PropertySet, PropertySets
 
 
 def test_property_set() -> None:
@@ -104,3 +104,28 @@ def test_property_set_rainbow_wildcard_not_complete() -> None:
     p.remove(wpc1)
     p.add_property(WildPropertyCard(PropertyColour.BROWN | PropertyColour.PALEBLUE, 1))
     assert p.is_complete()
+
+
+def test_property_sets_index() -> None:
+    sets = PropertySets()
+    green = PropertyColour.GREEN
+    a, b = PropertySet(green), PropertySet(green)
+    sets.add(a)
+    sets.add(b)
+    assert sets[green] is a and list(sets.sets(green)) == [a, b]
+    assert list(sets.incomplete) == [a, b] and not sets.complete
+
+    card = PropertyCard(green, "Oxford Street", 4)
+    assert sets.target(green, card) is a
+    for name in ("Oxford Street", "Regent Street", "Bond Street"):
+        a.add_property(PropertyCard(green, name, 4))
+    sets.update(a)
+    assert list(sets.complete) == [a]
+    # new cards join the set that is not yet complete, a house the one that is
+    assert sets.target(green, card) is b
+    assert sets.target(green, HouseCard()) is a
+
+    sets.remove(a)
+    assert sets[green] is b and not sets.complete
+    sets.remove(b)
+    assert green not in sets and sets.target(green, card) is None
@@ -0,0 +1,33 @@
+from monodeal.game import Game, Player, RandomPlayer, quiet
+from monodeal.rng import GameStreams, stream
+
+
+def play(seed: int, index: int) -> tuple[str, int, list[str]]:
+    a, b = Player("A"), RandomPlayer("B")
+    g = Game([a, b], seed=seed, index=index)
+    with quiet():
+        winner = g.play()
+    return winner.name, g.turns, [c.kind for c in a.hand]
+
+
+def test_game_replays_from_seed_and_index() -> None:
+    # any game of a run can be rebuilt from (seed, index) alone
+    run = [play(7, i) for i in range(5)]
+    assert play(7, 3) == run[3]
+    assert len({str(r) for r in run}) > 1
+
+
+def test_streams_are_independent() -> None:
+    s = GameStreams.for_game(7, 3)
+    assert s.shuffle.random() != s.decisions.random()
+    assert (
+        stream(7, 3, "shuffle").random() == GameStreams.for_game(7, 3).shuffle.random()
+    )
+
+    fork = s.fork()
+    assert [fork.decisions.random() for _ in range(3)] == [
+        s.decisions.random() for _ in range(3)
+    ]
+
+    # unseeded games no longer share one default generator
+    assert Game().random is not Game().random
@@ -0,0 +1,124 @@
+import random
+from collections.abc import Iterable, Mapping, Sequence
+
+import pytest
+
+from monodeal import Variations
+from monodeal.actions import SkipAction
+from monodeal.deck import DECK, HouseCard, PropertyCard, PropertyColour
+from monodeal.game import Game, Player, deck_out_score, quiet
+from monodeal.sweep import (
+    SweepRow,
+    format_table,
+    main,
+    sweep,
+    variation_grid,
+    variation_name,
+)
+
+PC = PropertyColour
+
+
+def _break_up_brown(variations: Variations) -> tuple[Player, Game, HouseCard]:
+    p = Player("A")
+    brown = [PropertyCard(PC.BROWN, n, 1) for n in ("Old Kent Road", "Whitechapel")]
+    for c in brown:
+        p.add_property(PC.BROWN, c)
+    p.add_property(PC.BROWN, house := HouseCard())
+    g = Game([p], variations=variations)
+    p.remove(brown[0])
+    with quiet():
+        g.forfeit_buildings(p)
+    return p, g, house
+
+
+def test_forfeit_buildings() -> None:
+    p, g, house = _break_up_brown(Variations(0))
+    assert p.get_property_sets()[PC.BROWN].house is house
+
+    p, g, house = _break_up_brown(Variations.FORFEIT_BUILDINGS)
+    assert p.get_property_sets()[PC.BROWN].house is None
+    assert list(g.discarded) == [house]
+
+    p, g, house = _break_up_brown(Variations.FORFEIT_BUILDINGS_TO_BANK)
+    assert p.get_property_sets()[PC.BROWN].house is None
+    assert p.cash == [house]
+
+
+def test_deck_out_ends_game() -> None:
+    for variations in (Variations(0), Variations.DECK_OUT_ENDS_GAME):
+        a, b = Player("A"), Player("B")
+        g = Game([a, b], random=random.Random(1), variations=variations)
+        with quiet():
+            g.start()
+            g.discarded.extend(g.draw)
+            g.draw.clear()
+            winner = None
+            for _ in range(3):
+                winner = g.step(SkipAction(a))
+        if variations:
+            assert g.decked_out
+            assert winner is max(g.players, key=deck_out_score)
+        else:
+            # the discard pile was reshuffled for B's two cards
+            assert winner is None and len(g.draw) == len(DECK) - 14
+
+
+def test_variation_grid() -> None:
+    grid = variation_grid(
+        [Variations.ALLOW_QUAD_RENT, Variations.MOVABLE_BUILDINGS],
+        Variations.FORCE_UNPLACED_PROPERTY_AS_CASH,
+    )
+    assert len(grid) == 4
+    assert all(Variations.FORCE_UNPLACED_PROPERTY_AS_CASH in v for v in grid)
+    assert variation_name(Variations(0)) == "-"
+    assert variation_name(grid[3]) == (
+        "ALLOW_QUAD_RENT|FORCE_UNPLACED_PROPERTY_AS_CASH|MOVABLE_BUILDINGS"
+    )
+
+
+def test_sweep_table() -> None:
+    grid = variation_grid(
+        [Variations.DECK_OUT_ENDS_GAME], Variations.FORCE_UNPLACED_PROPERTY_AS_CASH
+    )
+    rows = sweep(grid, {"h": Player}, range(3))
+    assert len(rows) == 2
+    for row in rows:
+        assert (row.a, row.b, row.games) == ("h", "h", 6)
+        # self-play on seat-swapped deals
+        assert 0 < row.mean_turns <= row.longest
+    table = format_table(rows).splitlines()
+    assert table[0].split() == [
+        "variations",
+        "a",
+        "b",
+        "games",
+        "win_rate",
+        "mean_turns",
+        "longest",
+    ]
+    assert len(table) == 3
+
+
+def test_main_base_replaces_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    grids: list[list[Variations]] = []
+
+    def fake_sweep(
+        grid: Sequence[Variations],
+        strategies: Mapping[str, object],
+        seeds: Iterable[int],
+        executor: object = None,
+    ) -> list[SweepRow]:
+        grids.append(list(grid))
+        return []
+
+    monkeypatch.setattr("monodeal.sweep.sweep", fake_sweep)
+    with quiet():
+        main([])
+        main(["--base", "ALLOW_QUAD_RENT", "--base", "MOVABLE_BUILDINGS"])
+        main([])
+    assert grids == [
+        [Variations.FORCE_UNPLACED_PROPERTY_AS_CASH],
+        [Variations.ALLOW_QUAD_RENT | Variations.MOVABLE_BUILDINGS],
+        [Variations.FORCE_UNPLACED_PROPERTY_AS_CASH],
+    ]
@@ -0,0 +1,52 @@
+import math
+
+from monodeal import Variations
+from monodeal.deck import DECK, PropertyColour
+from monodeal.game import Game, RandomPlayer, quiet
+from monodeal.unseen import UnseenCards, at_least
+
+
+def test_at_least() -> None:
+    # two aces among two cards from a 52 card deck
+    assert math.isclose(at_least(52, 4, 2, 2), 6 / 1326)
+    assert math.isclose(at_least(52, 4, 2, 1), 1 - comb_ratio(48, 52, 2))
+    assert at_least(10, 3, 2, 0) == 1.0
+    assert at_least(10, 3, 2, 3) == 0.0
+    # drawing more cards than remain takes them all
+    assert at_least(3, 2, 5, 2) == 1.0
+
+
+def comb_ratio(a: int, b: int, n: int) -> float:
+    return math.comb(a, n) / math.comb(b, n)
+
+
+def test_colour_classes() -> None:
+    u = UnseenCards(DECK)
+    assert u.total == 106
+    # three GREEN properties, the GREEN|DARKBLUE, STATION|GREEN and two rainbows
+    assert u.count(PropertyColour.GREEN) == 7
+    assert u.count("JustSayNoCard") == 3
+    assert u.chance(PropertyColour.GREEN, k=1, draws=0) == 0.0
+
+
+def test_tracker_matches_recount() -> None:
+    # kept up to date through deals, plays, payments, discards and reshuffles
+    # seed 1 reshuffles the discard pile, seed 2 has a Just Say No chain
+    for seed in range(3):
+        g = Game(
+            [RandomPlayer("A"), RandomPlayer("B"), RandomPlayer("C")],
+            variations=Variations.FORCE_UNPLACED_PROPERTY_AS_CASH,
+            seed=seed,
+        )
+        with quiet():
+            g.start()
+            for _ in range(300):
+                p = g.current_player()
+                if g.step(p.get_action(g, g.actions_left)) is not None:
+                    break
+                counts = [dict(+u.counts) for u in g.unseen]
+                totals = [u.total for u in g.unseen]
+                g.recount_unseen()
+                assert counts == [dict(+u.counts) for u in g.unseen]
+                assert totals == [u.total for u in g.unseen]
+        assert g.unseen_cards(g.current_player()) is g.unseen[g.current]
@@ -0,0 +1,104 @@
+from monodeal.actions import MovePropertyAction, generate_actions
+from monodeal.deck import (
+    HouseCard,
+    PropertyCard,
+    PropertyColour,
+    WildPropertyCard,
+)
+from monodeal.game import Game, Player
+from monodeal.propertyset import PropertySet
+from monodeal.wildcards import best_wildcard_layout, wildcard_moves
+
+PC = PropertyColour
+
+
+def test_move_wildcard_to_complete_set() -> None:
+    p = Player("P1")
+    g = Game([p])
+    wild = WildPropertyCard(PC.PALEBLUE | PC.BROWN, 1)
+    p.add_property(PC.PALEBLUE, PropertyCard(PC.PALEBLUE, "Euston Road", 1))
+    p.add_property(PC.PALEBLUE, wild)
+    p.add_property(PC.BROWN, PropertyCard(PC.BROWN, "Old Kent Road", 1))
+
+    assert wildcard_moves(p.propertysets) == [(wild, PC.BROWN)]
+
+    actions = generate_actions(g, p, 3)
+    assert actions == [MovePropertyAction(player=p, card=wild, colour=PC.BROWN)]
+    assert actions[0].action_count() == 0
+    actions[0].apply(g)
+    assert p.propertysets[PC.BROWN].is_complete()
+    assert wildcard_moves(p.propertysets) == []
+    assert generate_actions(g, p, 3) == []
+
+
+def test_wildcards_revisited_together() -> None:
+    # two wildcards placed one at a time: each alone would leave a set short
+    p = Player("P1")
+    w1 = WildPropertyCard(PC.MAGENTA | PC.ORANGE, 2)
+    w2 = WildPropertyCard(PC.MAGENTA | PC.ORANGE, 2)
+    p.add_property(PC.ORANGE, PropertyCard(PC.ORANGE, "Vine Street", 2))
+    p.add_property(PC.MAGENTA, PropertyCard(PC.MAGENTA, "Whitehall", 2))
+    p.add_property(PC.MAGENTA, w1)
+    p.add_property(PC.ORANGE, w2)
+
+    layout = best_wildcard_layout(p.propertysets)
+    assert sorted(c.name or "" for c in layout.values()) == ["ORANGE", "ORANGE"]
+    # the wildcard already on ORANGE stays put
+    assert wildcard_moves(p.propertysets) == [(w1, PC.ORANGE)]
+
+
+def test_house_keeps_set_complete() -> None:
+    p = Player("P1")
+    wild = WildPropertyCard(PC.PALEBLUE | PC.BROWN, 1)
+    p.add_property(PC.BROWN, PropertyCard(PC.BROWN, "Old Kent Road", 1))
+    p.add_property(PC.BROWN, wild)
+    p.add_property(PC.BROWN, HouseCard())
+    p.add_property(PC.PALEBLUE, PropertyCard(PC.PALEBLUE, "Euston Road", 1))
+    p.add_property(PC.PALEBLUE, PropertyCard(PC.PALEBLUE, "Pentonville Road", 1))
+
+    # moving would complete PALEBLUE (rent 3) but strand the house (rent 2+3)
+    assert wildcard_moves(p.propertysets) == []
+
+
+def test_rainbow_wildcards_do_not_complete_alone() -> None:
+    p = Player("P1")
+    r1 = WildPropertyCard(PC.ALL, 0)
+    r2 = WildPropertyCard(PC.ALL, 0)
+    p.add_property(PC.UTILITY, r1)
+    p.add_property(PC.BROWN, r2)
+    p.add_property(PC.GREEN, PropertyCard(PC.GREEN, "Bond Street", 4))
+
+    layout = best_wildcard_layout(p.propertysets)
+    assert layout == {r1: PC.GREEN, r2: PC.GREEN}
+    assert p.propertysets[PC.GREEN].rent_value() == 2
+
+
+def test_wildcards_in_a_second_set() -> None:
+    # a stolen set kept apart from the first of its colour
+    p = Player("P1")
+    p.add_property(PC.BROWN, PropertyCard(PC.BROWN, "Old Kent Road", 1))
+    p.add_property(PC.BROWN, PropertyCard(PC.BROWN, "Whitechapel Road", 1))
+    stolen = PropertySet(PC.BROWN)
+    stolen.add_property(wild := WildPropertyCard(PC.PALEBLUE | PC.BROWN, 1))
+    p.keep_property_set(stolen)
+    p.add_property(PC.PALEBLUE, PropertyCard(PC.PALEBLUE, "Euston Road", 1))
+    p.add_property(PC.PALEBLUE, PropertyCard(PC.PALEBLUE, "Pentonville Road", 1))
+
+    assert wildcard_moves(p.propertysets) == [(wild, PC.PALEBLUE)]
+    p.remove(wild)
+    p.add_property(PC.PALEBLUE, wild)
+    assert len(p.propertysets.complete) == 2
+    assert wildcard_moves(p.propertysets) == []
+
+
+def test_moves_cached_until_sets_change() -> None:
+    p = Player("P1")
+    wild = WildPropertyCard(PC.PALEBLUE | PC.BROWN, 1)
+    p.add_property(PC.PALEBLUE, PropertyCard(PC.PALEBLUE, "Euston Road", 1))
+    p.add_property(PC.PALEBLUE, wild)
+    moves = p.wildcard_moves()
+    assert moves == [] and p.wildcard_moves() is moves
+    p.add_property(PC.BROWN, PropertyCard(PC.BROWN, "Old Kent Road", 1))
+    assert p.wildcard_moves() == [(wild, PC.BROWN)]
+    p.remove(wild)
+    assert p.wildcard_moves() == []
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+
+import pytest
+
+from monodeal.fuzz import random_case
+from monodeal.workers import import_times, main, process_pool
+
+from .worker_probe import loaded
+
+
+def test_pool_workers_start_warm() -> None:
+    # the probe imports nothing of the engine, so a worker only has it loaded
+    # if it started with it
+    with process_pool(2) as executor:
+        assert all(executor.map(loaded, ["monodeal.game"] * 4))
+        assert not any(executor.map(loaded, ["monodeal.env"] * 4))
+        assert list(executor.map(random_case, range(2))) == [None, None]
+
+
+def test_job_modules_import_lightly() -> None:
+    # command line and process pool modules are imported by main() only
+    heavy = ["argparse", "concurrent", "multiprocessing", "statistics", "numpy"]
+    jobs = ", ".join(f"monodeal.{m}" for m in ("book", "fuzz", "league", "sweep"))
+    out = subprocess.run(
+        [sys.executable, "-c", f"import sys, {jobs}; print(*sys.modules)"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {m.split(".")[0] for m in out.stdout.split()}
+    assert modules.isdisjoint(heavy)
+
+
+def test_import_times() -> None:
+    # timed against their budgets by python -m monodeal.workers, not here
+    times = import_times("monodeal.game", runs=1)
+    assert {"monodeal", "monodeal.deck", "monodeal.actions"} <= set(times)
+    assert times["monodeal.game"] >= times["monodeal.actions"] > 0
+
+
+def test_import_budget_only_reports(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    # timings vary between machines, so only --strict fails, on twice the budget
+    monkeypatch.setattr("monodeal.workers.import_time", lambda module: 0.07)
+    with pytest.raises(SystemExit) as info:
+        main(["monodeal.game"])
+    assert info.value.code == 0
+    assert "over" in capsys.readouterr().out
+    with pytest.raises(SystemExit) as info:
+        main(["--strict", "monodeal.game", "monodeal.fuzz"])
+    assert info.value.code == 0
+    monkeypatch.setattr("monodeal.workers.import_time", lambda module: 0.2)
+    with pytest.raises(SystemExit) as info:
+        main(["--strict", "monodeal.game"])
+    assert info.value.code == 1
@@ -0,0 +1,8 @@
+import sys
+
+# Jobs for process pool tests, kept apart from the test modules so that
+# unpickling one in a worker imports nothing of the engine.
+
+
+def loaded(module: str) -> bool:
+    return module in sys.modules